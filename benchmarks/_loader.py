@@ -0,0 +1,32 @@
+"""
+Import ``misskaty.helper`` modules without running ``misskaty/__init__.py``,
+which builds the bot clients and needs a full configuration.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_helper(name: str, **config):
+    """Import ``misskaty.helper.<name>``.
+
+    Keyword arguments become the attributes of ``misskaty.vars`` for helpers
+    that read the bot configuration.
+    """
+    if config and "misskaty.vars" not in sys.modules:
+        module = types.ModuleType("misskaty.vars")
+        module.__dict__.update(config)
+        sys.modules["misskaty.vars"] = module
+    for package, path in (
+        ("misskaty", os.path.join(ROOT, "misskaty")),
+        ("misskaty.helper", os.path.join(ROOT, "misskaty", "helper")),
+    ):
+        if package not in sys.modules:
+            module = types.ModuleType(package)
+            module.__path__ = [path]
+            sys.modules[package] = module
+    return importlib.import_module(f"misskaty.helper.{name}")
@@ -0,0 +1,203 @@
+"""
+Micro-benchmarks of ``misskaty.helper.sqlite_helper.Cache``.
+
+Fills a cache with N keys of a realistic payload, then times get, set, add,
+get_many, set_many, incr and ttl against it. Every combination of key
+count, storage mode (in-memory / file), pragma set and thread count is one
+run. Results are printed as JSON (ops/s, p50 and p99 latency in
+microseconds), so runs can be stored and compared to catch regressions.
+
+Usage:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --keys 1000 1000000 --threads 1 8 -o cache.json
+
+1e6 keys of the scraper payload take about 1 GB of disk.
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+
+from _loader import load_helper
+
+Cache = load_helper("sqlite_helper").Cache
+
+# Value shapes stored by the bot's caches
+PAYLOADS = {
+    # web_scraper SCRAP_DICT: one page of results plus the query
+    "scraper": [
+        [
+            {
+                "judul": f"Some Movie Title ({2000 + i}) WEB-DL 1080p",
+                "link": f"https://example.com/movie/{i}/some-movie-title-{2000 + i}",
+                "quality": "WEB-DL 1080p",
+                "genre": "Action, Adventure, Sci-Fi",
+            }
+            for i in range(6)
+        ],
+        "avengers",
+    ],
+    # imdb_search LIST_CARI: the search query under a random key
+    "imdb": "the lord of the rings the return of the king",
+    # web_scraper DETAIL_DICT: telegraph url of a kusonime page and when it was made
+    "kuso": ["https://telegra.ph/Kusonime-Some-Anime-Title-Batch-01-01", 1700000000.0],
+}
+
+PRAGMAS = {
+    "default": dict(Cache.DEFAULT_PRAGMA),
+    "durable": {
+        **Cache.DEFAULT_PRAGMA,
+        "synchronous": "normal",
+        "mmap_size": 0,
+    },
+    "rollback": {
+        **Cache.DEFAULT_PRAGMA,
+        "journal_mode": "delete",
+        "auto_vacuum": "none",
+    },
+}
+
+OPERATIONS = ("get", "set", "add", "get_many", "set_many", "incr", "ttl")
+MANY = 20
+FILL_CHUNK = 500
+
+
+def make_cache(path: str, mode: str, pragma: str, name: str):
+    cls = type("BenchCache", (Cache,), {"DEFAULT_PRAGMA": PRAGMAS[pragma]})
+    return cls(
+        filename=name,
+        path=path,
+        in_memory=mode == "memory",
+        sweep_interval=None,
+    )
+
+
+def fill(cache, keys: int, payload):
+    for start in range(0, keys, FILL_CHUNK):
+        cache.set_many(
+            {f"k{i}": payload for i in range(start, min(start + FILL_CHUNK, keys))},
+            timeout=-1,
+        )
+    cache.set_many({f"n{i}": 0 for i in range(min(keys, 1000))}, timeout=-1)
+
+
+def operation(cache, name: str, keys: int, payload, seq):
+    """Return a zero-argument callable running one `name` call per invocation."""
+    key = lambda: f"k{next(seq) * 7919 % keys}"  # noqa: E731
+    if name == "get":
+        return lambda: cache.get(key())
+    if name == "set":
+        return lambda: cache.set(key(), payload)
+    if name == "add":
+        # Half hit existing keys, half insert new ones
+        return lambda: cache.add(
+            key() if next(seq) % 2 else f"new{next(seq)}", payload
+        )
+    if name == "get_many":
+        return lambda: cache.get_many([key() for _ in range(MANY)])
+    if name == "set_many":
+        return lambda: cache.set_many({key(): payload for _ in range(MANY)})
+    if name == "incr":
+        return lambda: cache.incr(f"n{next(seq) % min(keys, 1000)}")
+    if name == "ttl":
+        return lambda: cache.ttl(key())
+    raise ValueError(name)
+
+
+def percentile(samples, pct: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def measure(cache, name: str, keys: int, payload, ops: int, threads: int) -> dict:
+    seq = count()
+    errors = 0
+
+    def worker(n):
+        nonlocal errors
+        run = operation(cache, name, keys, payload, seq)
+        samples = []
+        for _ in range(n):
+            start = time.perf_counter()
+            try:
+                run()
+            except sqlite3.OperationalError:
+                # Shared in-memory caches lock whole tables between threads
+                errors += 1
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    per_thread = max(1, ops // threads)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        samples = [s for part in pool.map(worker, [per_thread] * threads) for s in part]
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return {
+        "ops": len(samples),
+        "ops_per_sec": round(len(samples) / elapsed, 1),
+        "p50_us": round(percentile(samples, 0.50) * 1e6, 2),
+        "p99_us": round(percentile(samples, 0.99) * 1e6, 2),
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--keys", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--ops", type=int, default=5000, help="calls per operation")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--modes", nargs="+", default=["memory", "file"])
+    parser.add_argument("--pragmas", nargs="+", default=list(PRAGMAS))
+    parser.add_argument("--payloads", nargs="+", default=["scraper", "imdb"])
+    parser.add_argument("--operations", nargs="+", default=list(OPERATIONS))
+    parser.add_argument("-o", "--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "ops": args.ops,
+        "runs": [],
+    }
+    for keys in args.keys:
+        for mode in args.modes:
+            for pragma in args.pragmas:
+                for payload_name in args.payloads:
+                    payload = PAYLOADS[payload_name]
+                    path = tempfile.mkdtemp(prefix="misskaty_bench_")
+                    try:
+                        cache = make_cache(path, mode, pragma, f"{payload_name}.db")
+                        fill(cache, keys, payload)
+                        for threads in args.threads:
+                            for name in args.operations:
+                                result = measure(
+                                    cache, name, keys, payload, args.ops, threads
+                                )
+                                run = {
+                                    "op": name,
+                                    "keys": keys,
+                                    "mode": mode,
+                                    "pragma": pragma,
+                                    "payload": payload_name,
+                                    "threads": threads,
+                                    **result,
+                                }
+                                report["runs"].append(run)
+                                print(json.dumps(run), flush=True)
+                        cache.close()
+                    finally:
+                        shutil.rmtree(path, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
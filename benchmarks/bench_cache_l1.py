@@ -0,0 +1,82 @@
+"""
+Repeated-access latency of the SQLite cache with and without the in-process L1.
+
+Stores one scraper-shaped result list (``[split_arr(data, 6), kueri]``) per
+key and reads it back the way pagination callbacks do: the same key many
+times in a row. Without L1 every read is a SQLite lookup plus unpickle.
+
+Usage:
+    python benchmarks/bench_cache_l1.py
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+
+from _loader import load_helper
+
+Cache = load_helper("sqlite_helper").Cache
+
+KEYS = 50
+READS = 200
+ITEMS = (6, 60, 600)
+
+
+def payload(items):
+    data = [
+        {
+            "judul": f"Some Movie Title ({1990 + i % 30}) WEB-DL 1080p",
+            "link": f"https://example.com/movie/{i}/some-movie-title",
+            "type": "Movie" if i % 2 else "Series",
+            "genre": "Action, Adventure, Sci-Fi",
+        }
+        for i in range(items)
+    ]
+    return [[data[i : i + 6] for i in range(0, len(data), 6)], "query"]
+
+
+def bench_sync(cache, items):
+    value = payload(items)
+    for key in range(KEYS):
+        cache.set(key, value)
+    samples = []
+    for key in range(KEYS):
+        for _ in range(READS):
+            start = time.perf_counter()
+            cache.get(key)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+async def bench_async(cache, items):
+    value = payload(items)
+    for key in range(KEYS):
+        await cache.aset(key, value)
+    samples = []
+    for key in range(KEYS):
+        for _ in range(READS):
+            start = time.perf_counter()
+            await cache.aget(key)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def main():
+    path = tempfile.mkdtemp(prefix="misskaty_bench_")
+    print(f"{'items':>6} {'mode':>6} {'L2 only (us)':>13} {'L1 + L2 (us)':>13}")
+    for items in ITEMS:
+        plain = Cache(filename=f"plain{items}.db", path=path, in_memory=False)
+        tiered = Cache(
+            filename=f"tiered{items}.db", path=path, in_memory=False, l1_entries=512
+        )
+        old, new = bench_sync(plain, items), bench_sync(tiered, items)
+        print(f"{items:>6} {'sync':>6} {old:>13.1f} {new:>13.1f}")
+        old = asyncio.run(bench_async(plain, items))
+        new = asyncio.run(bench_async(tiered, items))
+        print(f"{items:>6} {'async':>6} {old:>13.1f} {new:>13.1f}")
+        print(f"{'':>6} L1 {tiered.stats()['l1']}")
+
+
+if __name__ == "__main__":
+    main()
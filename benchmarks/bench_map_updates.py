@@ -0,0 +1,62 @@
+"""
+Write latency of map-shaped documents: whole-map rewrite vs dotted path.
+
+Grows a single chat document to 10k entries and times one extra write at
+each size with both strategies. Dotted ``$set`` should stay flat while the
+whole-map rewrite grows with the document.
+
+Usage:
+    DATABASE_URI=mongodb://localhost:27017 python benchmarks/bench_map_updates.py
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from async_pymongo import AsyncClient
+
+SIZES = (10, 100, 1000, 5000, 10000)
+ROUNDS = 20
+PAYLOAD = {"type": "text", "data": "x" * 64, "file_id": None}
+
+
+async def whole_map(coll, chat_id, key):
+    doc = await coll.find_one({"chat_id": chat_id})
+    data = doc["filters"] if doc else {}
+    data[key] = PAYLOAD
+    await coll.update_one({"chat_id": chat_id}, {"$set": {"filters": data}}, upsert=True)
+
+
+async def dotted(coll, chat_id, key):
+    await coll.update_one(
+        {"chat_id": chat_id}, {"$set": {f"filters.{key}": PAYLOAD}}, upsert=True
+    )
+
+
+async def timed(func, coll, chat_id, size):
+    samples = []
+    for i in range(ROUNDS):
+        start = time.perf_counter()
+        await func(coll, chat_id, f"bench_{size}_{i}")
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def main():
+    client = AsyncClient(os.environ.get("DATABASE_URI", "mongodb://localhost:27017"))
+    coll = client["misskaty_bench"]["map_updates"]
+    await coll.drop()
+    print(f"{'entries':>8} {'whole map (ms)':>15} {'dotted (ms)':>12}")
+    for chat_id, size in enumerate(SIZES, start=1):
+        seed = {f"key{i}": PAYLOAD for i in range(size)}
+        await coll.insert_one({"chat_id": -chat_id, "filters": seed})
+        await coll.insert_one({"chat_id": chat_id, "filters": seed})
+        old = await timed(whole_map, coll, -chat_id, size)
+        new = await timed(dotted, coll, chat_id, size)
+        print(f"{size:>8} {old:>15.2f} {new:>12.2f}")
+    await coll.drop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,233 @@
+"""
+Benchmark of the scraper site and IMDb page parsers.
+
+Parses HTML fixtures with every installed backend (bs4, lxml, selectolax)
+and prints the time per page, then times ``parse_html`` round trips through
+the process pool against parsing inline. Without ``--fixtures`` the pages
+are generated to look like the sites' markup; with it, every
+``<site>*.html`` file in the directory is parsed with that site's spec from
+``scraper_sites.SITES`` (e.g. a saved ``gomov-search.html``), and
+``imdb*.html`` with the IMDb title parser.
+
+Usage:
+    python benchmarks/bench_parse.py
+    python benchmarks/bench_parse.py --fixtures ~/pages --items 200 -o parse.json
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import platform
+import time
+
+from _loader import load_helper
+
+html_parser = load_helper("html_parser", HTML_PARSER="bs4", PARSE_WORKERS=2)
+page_parsers = load_helper("page_parsers")
+SITES = load_helper("scraper_sites").SITES
+
+BACKENDS = {
+    "bs4": ("bs4", "lxml"),
+    "lxml": ("lxml.html", "cssselect"),
+    "selectolax": ("selectolax",),
+}
+
+
+def installed(backend: str) -> bool:
+    try:
+        for module in BACKENDS[backend]:
+            __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _filler(n: int) -> str:
+    # Sidebars, menus and scripts that make up most of a real page
+    return "".join(
+        f"<div class='widget'><ul>{''.join(f'<li><a href=/tag/{i}-{j}>Tag {j}</a></li>' for j in range(10))}</ul>"
+        f"<script>var x{i} = {{'a': {i}}};</script></div>"
+        for i in range(n)
+    )
+
+
+def _page(body: str, items: int) -> bytes:
+    return (
+        f"<html><head><title>Search results</title></head><body>"
+        f"<nav>{_filler(items // 4)}</nav><main>{body}</main>"
+        f"<aside>{_filler(items // 2)}</aside></body></html>"
+    ).encode()
+
+
+def _listing(site: str, body: str, items: int):
+    spec = SITES[site]
+    return (
+        site,
+        page_parsers.parse_listing,
+        (spec.item, spec.fields, spec.not_found),
+        _page("".join(body.format(i=i) for i in range(items)), items),
+    )
+
+
+def fixtures(items: int):
+    """Generated pages, as (name, parser, extra args, html)."""
+    yield _listing(
+        "kuso",
+        "<article><h2 class='episodeye'><a href='https://kuso/{i}'>Anime {i} Batch</a></h2></article>",
+        items,
+    )
+    yield _listing(
+        "movieku",
+        "<div class='bx'><a href='https://movieku/{i}' title='Movie {i}'><img src=x></a>"
+        "<span class='overlay'> WEB-DL </span></div>",
+        items,
+    )
+    yield _listing(
+        "gomov",
+        "<article><header class='entry-header'><h2 class='entry-title'>"
+        "<a href='https://gmr/{i}'>Movie {i} (2023)</a></h2>"
+        "<div class='gmr-movie-on'>Action, Drama</div></header></article>",
+        items,
+    )
+    yield _listing(
+        "lendrive",
+        "<div class='bsx'><a href='https://lendrive/{i}' title='Anime {i}'>"
+        "<span class='typez TV'>TV</span><span class='epx'>Ongoing</span></a></div>",
+        items,
+    )
+    yield _listing(
+        "melong",
+        "<div class='box'><a href='https://melong/{i}' title='Movie {i}'>"
+        "<span class='quality'>HD</span></a></div>",
+        items,
+    )
+    yield _listing(
+        "samehadaku",
+        "<div class='animposx'><a href='https://same/{i}' title='Anime {i}'>"
+        "<span class='type TV'>TV</span><span class='score'> 8.{i} </span></a></div>",
+        items,
+    )
+    link = "ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
+    ld_json = json.dumps(
+        {
+            "@type": "Movie",
+            "name": "Some Movie",
+            "genre": ["Action", "Drama"],
+            "actor": [{"name": f"Actor {i}", "url": f"/name/nm{i}"} for i in range(30)],
+            "description": "A long plot summary. " * 20,
+        }
+    )
+    yield "imdb", page_parsers.parse_imdb_title, (), (
+        "<html><head><title>Some Movie (2023) - IMDb</title>"
+        f"<script type='application/ld+json'>{ld_json}</script></head><body>"
+        f"{_filler(items)}<ul>"
+        "<li data-testid='title-techspec_runtime'><div class='ipc-metadata-list-item__content-container'>2h 10m</div></li>"
+        f"<li data-testid='title-details-releasedate'><a class='{link}' href='/releaseinfo'>May 1, 2023</a></li>"
+        f"<li data-testid='title-details-origin'><a class='{link}'>United States</a><a class='{link}'>Japan</a></li>"
+        f"<li data-testid='title-details-languages'><a class='{link}'>English</a></li>"
+        "<li data-testid='award_information'><a class='ipc-metadata-list-item__list-content-item'>3 wins</a></li>"
+        f"</ul>{_filler(items)}</body></html>"
+    ).encode()
+
+
+def fixture_files(directory: str):
+    for path in sorted(glob.glob(os.path.join(directory, "*.html"))):
+        name = os.path.basename(path).split("-")[0].split(".")[0]
+        with open(path, "rb") as f:
+            html = f.read()
+        if name == "imdb":
+            yield name, page_parsers.parse_imdb_title, (), html
+        elif (spec := SITES.get(name)) is not None and spec.item:
+            yield name, page_parsers.parse_listing, (spec.item, spec.fields, spec.not_found), html
+
+
+def per_page(func, html: bytes, args, runs: int) -> float:
+    func(html, *args)
+    start = time.perf_counter()
+    for _ in range(runs):
+        func(html, *args)
+    return (time.perf_counter() - start) / runs
+
+
+async def pool_round_trips(pages, concurrency: int, workers: int) -> dict:
+    """Parse `pages` `concurrency` at a time and track how late the loop wakes up."""
+    pool = html_parser.ParsePool(workers)
+    pool.start()
+    lags = []
+
+    async def heartbeat():
+        while True:
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - before - 0.005)
+
+    beat = asyncio.create_task(heartbeat())
+    # Let the warm-up tasks finish before timing
+    await asyncio.gather(*(pool.run(*pages[0]) for _ in range(max(workers, 1))))
+    lags.clear()
+    start = time.perf_counter()
+    for i in range(0, len(pages), concurrency):
+        await asyncio.gather(*(pool.run(*page) for page in pages[i : i + concurrency]))
+    elapsed = time.perf_counter() - start
+    beat.cancel()
+    pool.shutdown()
+    lags.sort()
+    return {
+        "workers": workers,
+        "pages": len(pages),
+        "pages_per_sec": round(len(pages) / elapsed, 1),
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", help="directory of saved <site>*.html pages")
+    parser.add_argument("--items", type=int, default=60, help="results per generated page")
+    parser.add_argument("--runs", type=int, default=30, help="parses per measurement")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("-o", "--output", help="also write the JSON report here")
+    args = parser.parse_args()
+
+    pages = list(fixture_files(args.fixtures) if args.fixtures else fixtures(args.items))
+    report = {
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "runs": [],
+        "pool": [],
+    }
+    for backend in args.backends:
+        if not installed(backend):
+            print(json.dumps({"backend": backend, "skipped": "not installed"}))
+            continue
+        html_parser.HTML_PARSER = backend
+        for name, func, extra, html in pages:
+            run = {
+                "site": name,
+                "backend": backend,
+                "kb": round(len(html) / 1024, 1),
+                "ms_per_page": round(
+                    per_page(func, html, extra, args.runs) * 1000,
+                    3,
+                ),
+            }
+            report["runs"].append(run)
+            print(json.dumps(run), flush=True)
+
+    html_parser.HTML_PARSER = "bs4"
+    jobs = [(func, html, *extra) for _, func, extra, html in pages] * args.runs
+    for workers in args.workers:
+        run = asyncio.run(pool_round_trips(jobs, args.concurrency, workers))
+        report["pool"].append(run)
+        print(json.dumps(run), flush=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,62 @@
 
 from async_pymongo import AsyncClient
 
-from misskaty.vars import DATABASE_NAME, DATABASE_URI
+from database.pool import PoolStats
+from misskaty.core.metrics import mongo_metrics
+from misskaty.vars import (
+    DATABASE_NAME,
+    DATABASE_URI,
+    MONGO_COMPRESSORS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_READ_PREFERENCE,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+)
 
-mongo = AsyncClient(DATABASE_URI)
+pool_stats = PoolStats()
+
+
+def _client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "readPreference": MONGO_READ_PREFERENCE,
+        "event_listeners": [pool_stats, mongo_metrics],
+    }
+    if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if MONGO_COMPRESSORS:
+        options["compressors"] = MONGO_COMPRESSORS
+    return options
+
+
+# The only Mongo client of the process. Everything that needs Mongo (database
+# modules, Pyrogram storages, APScheduler jobstore) shares this pool.
+mongo = AsyncClient(DATABASE_URI, **_client_options())
 dbname = mongo[DATABASE_NAME]
+
+
+def get_sync_client():
+    """Blocking pymongo client behind ``mongo``, for libraries that need one."""
+    return mongo.dispatch
+
+
+# Map-shaped documents (filters, notes, warns, karma) are updated with dotted
+# paths, so user supplied keys must not contain "." or start with "$".
+def encode_key(key: str) -> str:
+    key = key.replace("%", "%25").replace(".", "%2E")
+    return f"%24{key[1:]}" if key.startswith("$") else key
+
+
+def decode_key(key: str) -> str:
+    return key.replace("%24", "$").replace("%2E", ".").replace("%25", "%")
+
+
+def decode_map(data: dict) -> dict:
+    return {decode_key(k): v for k, v in data.items()} if data else {}
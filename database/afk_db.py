@@ -9,55 +9,75 @@
 #
 
 from database import dbname
+from database.chat_config import get_chat_setting, update_chat_config
 
 usersdb = dbname["users"]
 cleandb = dbname["cleanmode"]
-cleanmode = {}
+
+# Resident copy of the AFK collection, filled once by load_afk_users() on startup
+afk_users = {}
+afk_stats = {"lookups_avoided": 0}
+AFK_LOADED = False
 
 
 async def is_cleanmode_on(chat_id: int) -> bool:
-    mode = cleanmode.get(chat_id)
-    if not mode:
-        user = await cleandb.find_one({"chat_id": chat_id})
-        if not user:
-            cleanmode[chat_id] = True
-            return True
-        cleanmode[chat_id] = False
-        return False
-    return mode
+    return await get_chat_setting(chat_id, "cleanmode")
 
 
 async def cleanmode_on(chat_id: int):
-    cleanmode[chat_id] = True
     user = await cleandb.find_one({"chat_id": chat_id})
     if user:
-        return await cleandb.delete_one({"chat_id": chat_id})
+        await cleandb.delete_one({"chat_id": chat_id})
+    update_chat_config(chat_id, cleanmode=True)
 
 
 async def cleanmode_off(chat_id: int):
-    cleanmode[chat_id] = False
     user = await cleandb.find_one({"chat_id": chat_id})
     if not user:
-        return await cleandb.insert_one({"chat_id": chat_id})
+        await cleandb.insert_one({"chat_id": chat_id})
+    update_chat_config(chat_id, cleanmode=False)
 
 
 async def is_afk(user_id: int) -> bool:
+    if AFK_LOADED:
+        afk_stats["lookups_avoided"] += 1
+        reason = afk_users.get(user_id)
+        return (True, reason) if reason is not None else (False, {})
     user = await usersdb.find_one({"user_id": user_id})
     return (True, user["reason"]) if user else (False, {})
 
 
+def any_afk() -> bool:
+    """False only when the registry is loaded and nobody is AFK."""
+    if not AFK_LOADED or afk_users:
+        return True
+    afk_stats["lookups_avoided"] += 1
+    return False
+
+
 async def add_afk(user_id: int, mode):
     await usersdb.update_one(
         {"user_id": user_id}, {"$set": {"reason": mode}}, upsert=True
     )
+    afk_users[user_id] = mode
 
 
 async def remove_afk(user_id: int):
-    user = await usersdb.find_one({"user_id": user_id})
-    if user:
-        return await usersdb.delete_one({"user_id": user_id})
+    if AFK_LOADED and user_id not in afk_users:
+        return
+    afk_users.pop(user_id, None)
+    return await usersdb.delete_one({"user_id": user_id})
+
+
+async def get_afk_users():
+    async for user in usersdb.find({"user_id": {"$gt": 0}}):
+        yield user
 
 
-async def get_afk_users() -> list:
-    users = usersdb.find({"user_id": {"$gt": 0}})
-    return list(await users.to_list(length=1000000000)) if users else []
+async def load_afk_users() -> int:
+    global AFK_LOADED
+    afk_users.clear()
+    async for user in get_afk_users():
+        afk_users[user["user_id"]] = user["reason"]
+    AFK_LOADED = True
+    return len(afk_users)
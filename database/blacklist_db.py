@@ -1,6 +1,7 @@
-from typing import List
+from typing import Dict, List
 
 from database import dbname
+from misskaty.helper.trigger_index import TriggerIndex, TriggerIndexCache
 
 blacklist_filtersdb = dbname["blacklistFilters"]
 
@@ -10,26 +11,33 @@ async def get_blacklisted_words(chat_id: int) -> List[str]:
     return [] if not _filters else _filters["filters"]
 
 
+async def _get_blacklist(chat_id: int) -> Dict[str, str]:
+    return {w: w for w in await get_blacklisted_words(chat_id)}
+
+
+blacklist_index = TriggerIndexCache(_get_blacklist)
+
+
+async def get_blacklist_index(chat_id: int) -> TriggerIndex:
+    return await blacklist_index.get(chat_id)
+
+
 async def save_blacklist_filter(chat_id: int, word: str):
     word = word.lower().strip()
-    _filters = await get_blacklisted_words(chat_id)
-    _filters.append(word)
     await blacklist_filtersdb.update_one(
         {"chat_id": chat_id},
-        {"$set": {"filters": _filters}},
+        {"$addToSet": {"filters": word}},
         upsert=True,
     )
+    blacklist_index.invalidate(chat_id)
 
 
 async def delete_blacklist_filter(chat_id: int, word: str) -> bool:
-    filtersd = await get_blacklisted_words(chat_id)
     word = word.lower().strip()
-    if word in filtersd:
-        filtersd.remove(word)
-        await blacklist_filtersdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"filters": filtersd}},
-            upsert=True,
-        )
+    res = await blacklist_filtersdb.update_one(
+        {"chat_id": chat_id}, {"$pull": {"filters": word}}
+    )
+    if res.modified_count:
+        blacklist_index.invalidate(chat_id)
         return True
     return False
@@ -0,0 +1,141 @@
+"""
+Per-chat settings snapshot shared by the group message hot path.
+
+Every toggle that used to be looked up separately on each message (karma,
+sangmata, cleanmode, welcome and chat language) is loaded with a single
+aggregation and kept in a bounded LRU with TTL. Setters in the owning
+database modules update the snapshot write-through.
+"""
+
+import asyncio
+from copy import deepcopy
+from functools import partial
+from typing import Any, Dict, Tuple
+
+from cachetools import TTLCache
+
+from database import dbname
+
+CHAT_CONFIG_MAXSIZE = 5000
+CHAT_CONFIG_TTL = 10 * 60
+
+DEFAULT_CONFIG = {
+    "karma": True,
+    "sangmata": False,
+    "cleanmode": True,
+    "welcome": False,
+    "lang": {},
+}
+
+_configs = TTLCache(maxsize=CHAT_CONFIG_MAXSIZE, ttl=CHAT_CONFIG_TTL)
+_loading: Dict[int, asyncio.Task] = {}
+_stats = {"hits": 0, "misses": 0, "loads": 0, "writes": 0}
+
+
+def _pipeline(chat_id: int) -> list:
+    def toggle(coll: str, field: str, name: str) -> dict:
+        return {
+            "$unionWith": {
+                "coll": coll,
+                "pipeline": [
+                    {"$match": {field: chat_id}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "k": {"$literal": name}}},
+                ],
+            }
+        }
+
+    return [
+        {"$match": {"chat_id": chat_id}},
+        {"$limit": 1},
+        {"$project": {"_id": 0, "k": {"$literal": "lang"}, "v": "$lang"}},
+        toggle("karma", "chat_id_toggle", "karma_off"),
+        toggle("sangmata", "chat_id_toggle", "sangmata_on"),
+        toggle("cleanmode", "chat_id", "cleanmode_off"),
+        toggle("greetings", "chat_id", "welcome_on"),
+    ]
+
+
+async def _load(chat_id: int) -> dict:
+    # Own copy of every nested default, callers may mutate "lang"
+    config = deepcopy(DEFAULT_CONFIG)
+    async for doc in dbname["locale"].aggregate(_pipeline(chat_id)):
+        key = doc["k"]
+        if key == "lang":
+            config["lang"] = doc.get("v") or {}
+        elif key == "karma_off":
+            config["karma"] = False
+        elif key == "sangmata_on":
+            config["sangmata"] = True
+        elif key == "cleanmode_off":
+            config["cleanmode"] = False
+        elif key == "welcome_on":
+            config["welcome"] = True
+    _stats["loads"] += 1
+    return config
+
+
+async def _load_snapshot(chat_id: int) -> Tuple[dict, bool]:
+    """Load a chat and store it in the snapshot, unless a setter ran meanwhile.
+
+    Setters drop the chat's load from ``_loading``, what it read may predate
+    their write. Returns the config and whether it was stored.
+    """
+    config = await _load(chat_id)
+    if _loading.get(chat_id) is not asyncio.current_task():
+        return config, False
+    _configs[chat_id] = config
+    return config, True
+
+
+def _loaded(chat_id: int, task: asyncio.Task):
+    if _loading.get(chat_id) is task:
+        del _loading[chat_id]
+
+
+async def get_chat_config(chat_id: int) -> dict:
+    config = _configs.get(chat_id)
+    if config is not None:
+        _stats["hits"] += 1
+        return config
+    _stats["misses"] += 1
+    while True:
+        # Collapse concurrent misses for the same chat into one query
+        task = _loading.get(chat_id)
+        if task is None:
+            task = _loading[chat_id] = asyncio.ensure_future(_load_snapshot(chat_id))
+            task.add_done_callback(partial(_loaded, chat_id))
+        config, stored = await asyncio.shield(task)
+        if stored:
+            return config
+
+
+async def get_chat_setting(chat_id: int, key: str) -> Any:
+    return (await get_chat_config(chat_id))[key]
+
+
+def update_chat_config(chat_id: int, **values):
+    """Write-through hook for setters. Only touches chats already in the snapshot."""
+    # A load in flight may have read the old value, don't let it be stored
+    _loading.pop(chat_id, None)
+    config = _configs.get(chat_id)
+    if config is None:
+        return
+    config.update(values)
+    _configs[chat_id] = config
+    _stats["writes"] += 1
+
+
+def invalidate_chat_config(chat_id: int):
+    _loading.pop(chat_id, None)
+    _configs.pop(chat_id, None)
+
+
+def chat_config_stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "size": len(_configs),
+        "maxsize": CHAT_CONFIG_MAXSIZE,
+        "hit_rate": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+    }
@@ -1,49 +1,60 @@
 from typing import Dict, List, Union
 
-from database import dbname
+from database import dbname, decode_map, encode_key
+from misskaty.helper.trigger_index import TriggerIndex, TriggerIndexCache
 
 filtersdb = dbname["filters"]
 
 
 async def _get_filters(chat_id: int) -> Dict[str, int]:
     _filters = await filtersdb.find_one({"chat_id": chat_id})
-    return _filters["filters"] if _filters else {}
+    return decode_map(_filters["filters"]) if _filters else {}
+
+
+# Compiled matcher with filter payloads, rebuilt after any change in the chat
+filters_index = TriggerIndexCache(_get_filters)
 
 
 async def delete_filter(chat_id: int, name: str) -> bool:
-    filtersd = await _get_filters(chat_id)
-    name = name.lower().strip()
-    if name in filtersd:
-        del filtersd[name]
-        await filtersdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"filters": filtersd}},
-            upsert=True,
-        )
+    path = f"filters.{encode_key(name.lower().strip())}"
+    res = await filtersdb.update_one(
+        {"chat_id": chat_id, path: {"$exists": True}},
+        {"$unset": {path: ""}},
+    )
+    if res.modified_count:
+        filters_index.invalidate(chat_id)
         return True
     return False
 
 
 async def deleteall_filters(chat_id: int):
+    filters_index.invalidate(chat_id)
     return await filtersdb.delete_one({"chat_id": chat_id})
 
 
 async def get_filter(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    return _filters[name] if name in _filters else False
+    key = encode_key(name.lower().strip())
+    _filters = await filtersdb.find_one(
+        {"chat_id": chat_id}, {"_id": 0, f"filters.{key}": 1}
+    )
+    if _filters and key in _filters.get("filters", {}):
+        return _filters["filters"][key]
+    return False
 
 
 async def get_filters_names(chat_id: int) -> List[str]:
     return list(await _get_filters(chat_id))
 
 
+async def get_filters_index(chat_id: int) -> TriggerIndex:
+    return await filters_index.get(chat_id)
+
+
 async def save_filter(chat_id: int, name: str, _filter: dict):
     name = name.lower().strip()
-    _filters = await _get_filters(chat_id)
-    _filters[name] = _filter
     await filtersdb.update_one(
         {"chat_id": chat_id},
-        {"$set": {"filters": _filters}},
+        {"$set": {f"filters.{encode_key(name)}": _filter}},
         upsert=True,
     )
+    filters_index.invalidate(chat_id)
@@ -1,18 +1,21 @@
 from database import dbname
+from database.chat_config import get_chat_setting, update_chat_config
 
 greetingdb = dbname["greetings"]
 
 
 async def is_welcome(chat_id: int) -> bool:
-    return bool(await greetingdb.find_one({"chat_id": chat_id}))
+    return await get_chat_setting(chat_id, "welcome")
 
 
 async def toggle_welcome(chat_id: int):
-    if await is_welcome(chat_id):
+    if await greetingdb.find_one({"chat_id": chat_id}):
         await greetingdb.delete_one({"chat_id": chat_id})
+        update_chat_config(chat_id, welcome=False)
         return False
     else:
         await greetingdb.insert_one({"chat_id": chat_id})
+        update_chat_config(chat_id, welcome=True)
         return True
 
 
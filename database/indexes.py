@@ -0,0 +1,144 @@
+"""
+Index bootstrapper for the collections queried by the database modules.
+
+Missing indexes are created in the background at startup. With
+``INDEX_DIAGNOSTICS`` set, every known query shape is run through
+``explain`` and the ones still planned as a collection scan are logged.
+"""
+
+import asyncio
+from logging import getLogger
+from typing import Dict, List, Tuple
+
+from pymongo import ASCENDING
+
+from database import dbname
+from misskaty.vars import INDEX_DIAGNOSTICS
+
+LOGGER = getLogger("MissKaty")
+
+# collection -> list of (field, options)
+INDEXES: Dict[str, List[Tuple[str, dict]]] = {
+    "users": [("user_id", {})],
+    "cleanmode": [("chat_id", {})],
+    "imdb": [("user_id", {})],
+    "sangmata": [("user_id", {}), ("chat_id_toggle", {"sparse": True})],
+    "gban": [("user_id", {})],
+    "federation": [
+        ("fed_id", {}),
+        ("owner_id", {}),
+        ("chat_ids.chat_id", {}),
+        ("banned_users.user_id", {}),
+    ],
+    "filters": [("chat_id", {})],
+    "notes": [("chat_id", {})],
+    "warn": [("chat_id", {})],
+    "karma": [("chat_id", {}), ("chat_id_toggle", {"sparse": True})],
+    "blacklistFilters": [("chat_id", {})],
+    "locale": [("chat_id", {})],
+    "greetings": [("chat_id", {})],
+    "userlist": [("id", {}), ("ban_status.is_banned", {})],
+    "groups": [("id", {}), ("chat_status.is_disabled", {})],
+}
+
+# Representative filters of the hot queries, checked in diagnostic mode
+QUERY_SHAPES: List[Tuple[str, dict]] = [
+    ("users", {"user_id": 0}),
+    ("cleanmode", {"chat_id": 0}),
+    ("imdb", {"user_id": 0}),
+    ("sangmata", {"user_id": 0}),
+    ("sangmata", {"chat_id_toggle": 0}),
+    ("gban", {"user_id": 0}),
+    ("federation", {"fed_id": "0"}),
+    ("federation", {"owner_id": 0}),
+    ("federation", {"chat_ids.chat_id": 0}),
+    ("federation", {"fed_id": "0", "banned_users.user_id": 0}),
+    ("filters", {"chat_id": 0}),
+    ("notes", {"chat_id": 0}),
+    ("warn", {"chat_id": 0}),
+    ("karma", {"chat_id": 0}),
+    ("karma", {"chat_id_toggle": 0}),
+    ("blacklistFilters", {"chat_id": 0}),
+    ("locale", {"chat_id": 0}),
+    ("greetings", {"chat_id": 0}),
+    ("userlist", {"id": 0}),
+    ("userlist", {"ban_status.is_banned": True}),
+    ("groups", {"id": 0}),
+    ("groups", {"chat_status.is_disabled": True}),
+]
+
+
+def _index_name(field: str) -> str:
+    return f"{field}_1"
+
+
+async def ensure_indexes() -> int:
+    """Create declared indexes that don't exist yet. Returns how many were created."""
+    created = 0
+    for coll, indexes in INDEXES.items():
+        try:
+            existing = await dbname[coll].index_information()
+        except Exception as err:
+            LOGGER.warning(f"Can't read indexes of {coll}: {err}")
+            continue
+        for field, options in indexes:
+            name = _index_name(field)
+            if name in existing:
+                continue
+            try:
+                await dbname[coll].create_index(
+                    [(field, ASCENDING)], name=name, background=True, **options
+                )
+                created += 1
+                LOGGER.info("[INFO]: CREATED INDEX %s ON %s", name, coll)
+            except Exception as err:
+                LOGGER.error(f"Failed creating index {name} on {coll}: {err}")
+    return created
+
+
+def _has_collscan(plan: dict) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages") or []
+    if "inputStage" in plan:
+        children = [plan["inputStage"], *children]
+    if "queryPlan" in plan:
+        children = [plan["queryPlan"], *children]
+    return any(_has_collscan(child) for child in children)
+
+
+async def explain_queries() -> List[Tuple[str, dict]]:
+    """Return the query shapes whose winning plan is still a collection scan."""
+    scans = []
+    for coll, query in QUERY_SHAPES:
+        try:
+            result = await dbname.command(
+                {"explain": {"find": coll, "filter": query}, "verbosity": "queryPlanner"}
+            )
+        except Exception as err:
+            LOGGER.warning(f"Explain failed on {coll} {query}: {err}")
+            continue
+        if _has_collscan(result["queryPlanner"]["winningPlan"]):
+            scans.append((coll, query))
+            LOGGER.warning(f"COLLSCAN on {coll}: {query}")
+    return scans
+
+
+async def _bootstrap():
+    try:
+        created = await ensure_indexes()
+        LOGGER.info("[INFO]: INDEX BOOTSTRAP DONE, %s CREATED", created)
+        if INDEX_DIAGNOSTICS:
+            scans = await explain_queries()
+            LOGGER.info(
+                "[INFO]: INDEX DIAGNOSTICS, %s OF %s QUERIES USE COLLSCAN",
+                len(scans),
+                len(QUERY_SHAPES),
+            )
+    except Exception as err:
+        LOGGER.error(f"Index bootstrap failed: {err}")
+
+
+def bootstrap_indexes() -> asyncio.Task:
+    """Run the index bootstrap without blocking startup."""
+    return asyncio.create_task(_bootstrap())
@@ -1,6 +1,9 @@
 from typing import Dict, Union
 
-from database import dbname
+from pymongo import ReturnDocument
+
+from database import dbname, decode_map, encode_key
+from database.chat_config import get_chat_setting, update_chat_config
 from misskaty.helper.functions import int_to_alpha
 
 karmadb = dbname["karma"]
@@ -20,48 +23,67 @@ async def get_karmas_count() -> dict:
 
 async def user_global_karma(user_id) -> int:
     total_karma = 0
-    async for chat in karmadb.find({"chat_id": {"$lt": 0}}):
-        karma = await get_karma(chat["chat_id"], await int_to_alpha(user_id))
-        if karma and (int(karma["karma"]) > 0):
+    path = f"karma.{encode_key(await int_to_alpha(user_id))}"
+    async for chat in karmadb.find(
+        {"chat_id": {"$lt": 0}, path: {"$exists": True}}, {"_id": 0, path: 1}
+    ):
+        karma = next(iter(chat["karma"].values()))
+        if int(karma["karma"]) > 0:
             total_karma += int(karma["karma"])
     return total_karma
 
 
 async def get_karmas(chat_id: int) -> Dict[str, int]:
     karma = await karmadb.find_one({"chat_id": chat_id})
-    return karma["karma"] if karma else {}
+    return decode_map(karma["karma"]) if karma else {}
 
 
 async def get_karma(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    if name in karmas:
-        return karmas[name]
+    key = encode_key(name.lower().strip())
+    karma = await karmadb.find_one({"chat_id": chat_id}, {"_id": 0, f"karma.{key}": 1})
+    if karma:
+        return karma.get("karma", {}).get(key)
 
 
 async def update_karma(chat_id: int, name: str, karma: dict):
     name = name.lower().strip()
-    karmas = await get_karmas(chat_id)
-    karmas[name] = karma
     await karmadb.update_one(
-        {"chat_id": chat_id}, {"$set": {"karma": karmas}}, upsert=True
+        {"chat_id": chat_id},
+        {"$set": {f"karma.{encode_key(name)}": karma}},
+        upsert=True,
+    )
+
+
+async def inc_karma(chat_id: int, name: str, amount: int = 1) -> int:
+    """Atomically add amount to a user's karma and return the new total."""
+    path = f"karma.{encode_key(name.lower().strip())}"
+    doc = await karmadb.find_one_and_update(
+        {"chat_id": chat_id},
+        {"$inc": {f"{path}.karma": amount}},
+        projection={"_id": 0, path: 1},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
     )
+    return next(iter(doc["karma"].values()))["karma"]
 
 
 async def is_karma_on(chat_id: int) -> bool:
-    chat = await karmadb.find_one({"chat_id_toggle": chat_id})
-    return not chat
+    return await get_chat_setting(chat_id, "karma")
 
 
 async def karma_on(chat_id: int):
     is_karma = await is_karma_on(chat_id)
     if is_karma:
         return
-    return await karmadb.delete_one({"chat_id_toggle": chat_id})
+    res = await karmadb.delete_one({"chat_id_toggle": chat_id})
+    update_chat_config(chat_id, karma=True)
+    return res
 
 
 async def karma_off(chat_id: int):
     is_karma = await is_karma_on(chat_id)
     if not is_karma:
         return
-    return await karmadb.insert_one({"chat_id_toggle": chat_id})
+    res = await karmadb.insert_one({"chat_id_toggle": chat_id})
+    update_chat_config(chat_id, karma=False)
+    return res
@@ -3,6 +3,7 @@ from typing import Iterable
 from pyrogram.enums import ChatType
 
 from database import dbname
+from database.chat_config import get_chat_setting, update_chat_config
 
 localesdb = dbname["locale"]  # DB for localization
 
@@ -15,8 +16,8 @@ async def set_db_lang(chat_id: int, chat_type: str, lang_code: str):
         {"$set": {"lang": lang_code, "chat_type": chat_type.value}},
         upsert=True,
     )
+    update_chat_config(chat_id, lang=lang_code)
 
 
 async def get_db_lang(chat_id: int) -> str:
-    ul = await localesdb.find_one({"chat_id": chat_id})
-    return ul["lang"] if ul else {}
+    return await get_chat_setting(chat_id, "lang")
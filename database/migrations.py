@@ -0,0 +1,61 @@
+"""
+One-time data migrations, applied at startup and recorded in the
+``migrations`` collection so each one only runs once per database.
+"""
+
+from logging import getLogger
+
+from database import dbname, encode_key
+
+LOGGER = getLogger("MissKaty")
+
+migrationsdb = dbname["migrations"]
+
+# (collection, map field) of documents updated with dotted paths
+MAP_FIELDS = (
+    ("filters", "filters"),
+    ("notes", "notes"),
+    ("warn", "warns"),
+    ("karma", "karma"),
+)
+
+
+async def _encode_map_keys():
+    """Escape map keys written by the old whole-map ``$set`` so they are
+    addressable as dotted paths, and drop duplicate blacklist words that
+    were appended before ``$addToSet`` was used."""
+    changed = 0
+    for coll, field in MAP_FIELDS:
+        async for doc in dbname[coll].find({field: {"$exists": True}}):
+            data = doc[field] or {}
+            if all(encode_key(key) == key for key in data):
+                continue
+            await dbname[coll].update_one(
+                {"_id": doc["_id"]},
+                {"$set": {field: {encode_key(k): v for k, v in data.items()}}},
+            )
+            changed += 1
+    async for doc in dbname["blacklistFilters"].find({"filters": {"$exists": True}}):
+        words = list(dict.fromkeys(doc["filters"]))
+        if len(words) != len(doc["filters"]):
+            await dbname["blacklistFilters"].update_one(
+                {"_id": doc["_id"]}, {"$set": {"filters": words}}
+            )
+            changed += 1
+    return changed
+
+
+MIGRATIONS = (("0001_encode_map_keys", _encode_map_keys),)
+
+
+async def run_migrations() -> int:
+    done = {doc["_id"] async for doc in migrationsdb.find({}, {"_id": 1})}
+    applied = 0
+    for name, func in MIGRATIONS:
+        if name in done:
+            continue
+        changed = await func()
+        await migrationsdb.insert_one({"_id": name, "changed": changed})
+        LOGGER.info("[INFO]: APPLIED MIGRATION %s (%s DOCUMENTS)", name, changed)
+        applied += 1
+    return applied
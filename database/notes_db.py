@@ -1,33 +1,30 @@
 from typing import Dict, List, Union
 
-from database import dbname
+from database import dbname, decode_map, encode_key
 
 notesdb = dbname["notes"]
 
 
 async def _get_notes(chat_id: int) -> Dict[str, int]:
     _notes = await notesdb.find_one({"chat_id": chat_id})
-    return _notes["notes"] if _notes else {}
+    return decode_map(_notes["notes"]) if _notes else {}
 
 
 async def delete_note(chat_id: int, name: str) -> bool:
-    notesd = await _get_notes(chat_id)
-    name = name.lower().strip()
-    if name in notesd:
-        del notesd[name]
-        await notesdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"notes": notesd}},
-            upsert=True,
-        )
-        return True
-    return False
+    path = f"notes.{encode_key(name.lower().strip())}"
+    res = await notesdb.update_one(
+        {"chat_id": chat_id, path: {"$exists": True}},
+        {"$unset": {path: ""}},
+    )
+    return bool(res.modified_count)
 
 
 async def get_note(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    return _notes[name] if name in _notes else False
+    key = encode_key(name.lower().strip())
+    _notes = await notesdb.find_one({"chat_id": chat_id}, {"_id": 0, f"notes.{key}": 1})
+    if _notes and key in _notes.get("notes", {}):
+        return _notes["notes"][key]
+    return False
 
 
 async def get_note_names(chat_id: int) -> List[str]:
@@ -36,11 +33,10 @@ async def get_note_names(chat_id: int) -> List[str]:
 
 async def save_note(chat_id: int, name: str, note: dict):
     name = name.lower().strip()
-    _notes = await _get_notes(chat_id)
-    _notes[name] = note
-
     await notesdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"notes": _notes}}, upsert=True
+        {"chat_id": chat_id},
+        {"$set": {f"notes.{encode_key(name)}": note}},
+        upsert=True,
     )
 
 
@@ -0,0 +1,110 @@
+"""
+Connection pool monitoring for the shared Mongo client.
+
+pymongo calls the listener from whichever thread runs the operation
+(async_pymongo runs them in the default executor), so counters are kept
+under a lock and check-out wait time is measured per thread.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+from pymongo import monitoring
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._servers = defaultdict(
+            lambda: {
+                "open": 0,
+                "checked_out": 0,
+                "waiting": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "cleared": 0,
+                "wait_ms_total": 0.0,
+                "wait_ms_max": 0.0,
+            }
+        )
+
+    def _server(self, event) -> dict:
+        host, port = event.address
+        return self._servers[f"{host}:{port}"]
+
+    def _wait_ms(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return (time.perf_counter() - started) * 1000 if started else 0.0
+
+    def pool_created(self, event):
+        with self._lock:
+            self._server(event)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._server(event)["cleared"] += 1
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._servers.pop(f"{event.address[0]}:{event.address[1]}", None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._server(event)["open"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._server(event)["open"] -= 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+        with self._lock:
+            self._server(event)["waiting"] += 1
+
+    def connection_check_out_failed(self, event):
+        self._wait_ms()
+        with self._lock:
+            server = self._server(event)
+            server["waiting"] -= 1
+            server["checkout_failures"] += 1
+
+    def connection_checked_out(self, event):
+        wait = self._wait_ms()
+        with self._lock:
+            server = self._server(event)
+            server["waiting"] -= 1
+            server["checked_out"] += 1
+            server["checkouts"] += 1
+            server["wait_ms_total"] += wait
+            server["wait_ms_max"] = max(server["wait_ms_max"], wait)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._server(event)["checked_out"] -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            servers = {}
+            for address, server in self._servers.items():
+                checkouts = server["checkouts"]
+                servers[address] = {
+                    **{k: v for k, v in server.items() if k != "wait_ms_total"},
+                    "wait_ms_max": round(server["wait_ms_max"], 3),
+                    "wait_ms_avg": round(server["wait_ms_total"] / checkouts, 3)
+                    if checkouts
+                    else 0.0,
+                }
+        return {
+            "checked_out": sum(s["checked_out"] for s in servers.values()),
+            "waiting": sum(s["waiting"] for s in servers.values()),
+            "servers": servers,
+        }
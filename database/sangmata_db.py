@@ -1,42 +1,102 @@
+import asyncio
+from logging import getLogger
+
+from cachetools import LRUCache
+from pymongo import UpdateOne
+
 from database import dbname
+from database.chat_config import get_chat_setting, update_chat_config
+
+LOGGER = getLogger("MissKaty")
 
 matadb = dbname["sangmata"]
 
+# Write-behind settings for identity upserts
+FLUSH_INTERVAL = 0.5  # seconds
+FLUSH_MAX_ITEMS = 200
+FLUSH_RETRY = 5  # seconds after a failed flush
 
-# Get Data User
-async def cek_userdata(user_id: int) -> bool:
-    user = await matadb.find_one({"user_id": user_id})
-    return bool(user)
+# user_id -> hash of (username, first_name, last_name) already stored in DB
+_identities = LRUCache(maxsize=100000)
+# user_id -> pending $set document, coalesced per user
+_pending = {}
+_flush_task = None
+# One batch in flight at a time, so writes of a user land in order
+_flush_lock = asyncio.Lock()
 
 
-async def get_userdata(user_id: int) -> bool:
+# Get Data User
+async def get_userdata(user_id: int):
+    if user := _pending.get(user_id):
+        return user["username"], user["first_name"], user["last_name"]
     user = await matadb.find_one({"user_id": user_id})
+    if not user:
+        return None
     return user["username"], user["first_name"], user["last_name"]
 
 
+def is_identity_unchanged(user_id: int, username, first_name, last_name) -> bool:
+    return _identities.get(user_id) == hash((username, first_name, last_name))
+
+
+def remember_identity(user_id: int, username, first_name, last_name):
+    _identities[user_id] = hash((username, first_name, last_name))
+
+
 async def add_userdata(user_id: int, username, first_name, last_name):
-    await matadb.update_one(
-        {"user_id": user_id},
-        {
-            "$set": {
-                "username": username,
-                "first_name": first_name,
-                "last_name": last_name,
-            }
-        },
-        upsert=True,
-    )
+    """Queue an identity upsert. It is written by the next batched flush."""
+    global _flush_task
+    _pending[user_id] = {
+        "username": username,
+        "first_name": first_name,
+        "last_name": last_name,
+    }
+    remember_identity(user_id, username, first_name, last_name)
+    if len(_pending) >= FLUSH_MAX_ITEMS:
+        await flush_userdata()
+    elif _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_delayed_flush())
+
+
+async def _delayed_flush(delay: float = FLUSH_INTERVAL):
+    await asyncio.sleep(delay)
+    await flush_userdata()
+
+
+async def flush_userdata() -> int:
+    global _flush_task
+    async with _flush_lock:
+        if not _pending:
+            return 0
+        batch = dict(_pending)
+        _pending.clear()
+        try:
+            await matadb.bulk_write(
+                [
+                    UpdateOne({"user_id": user_id}, {"$set": data}, upsert=True)
+                    for user_id, data in batch.items()
+                ],
+                ordered=False,
+            )
+        except Exception as err:
+            LOGGER.error(f"Sangmata flush failed, requeue {len(batch)} users: {err}")
+            for user_id, data in batch.items():
+                _pending.setdefault(user_id, data)
+            _flush_task = asyncio.create_task(_delayed_flush(FLUSH_RETRY))
+            return 0
+        return len(batch)
 
 
 # Enable Mata MissKaty in Selected Chat
 async def is_sangmata_on(chat_id: int) -> bool:
-    chat = await matadb.find_one({"chat_id_toggle": chat_id})
-    return bool(chat)
+    return await get_chat_setting(chat_id, "sangmata")
 
 
 async def sangmata_on(chat_id: int) -> bool:
     await matadb.insert_one({"chat_id_toggle": chat_id})
+    update_chat_config(chat_id, sangmata=True)
 
 
 async def sangmata_off(chat_id: int):
     await matadb.delete_one({"chat_id_toggle": chat_id})
+    update_chat_config(chat_id, sangmata=False)
@@ -1,6 +1,6 @@
 from typing import Dict, Union
 
-from database import dbname
+from database import dbname, decode_map, encode_key
 
 warnsdb = dbname["warn"]
 
@@ -17,35 +17,29 @@ async def get_warns_count() -> dict:
 
 async def get_warns(chat_id: int) -> Dict[str, int]:
     warns = await warnsdb.find_one({"chat_id": chat_id})
-    return warns["warns"] if warns else {}
+    return decode_map(warns["warns"]) if warns else {}
 
 
 async def get_warn(chat_id: int, name: str) -> Union[bool, dict]:
-    name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    if name in warns:
-        return warns[name]
+    key = encode_key(name.lower().strip())
+    warns = await warnsdb.find_one({"chat_id": chat_id}, {"_id": 0, f"warns.{key}": 1})
+    if warns:
+        return warns.get("warns", {}).get(key)
 
 
 async def add_warn(chat_id: int, name: str, warn: dict):
     name = name.lower().strip()
-    warns = await get_warns(chat_id)
-    warns[name] = warn
-
     await warnsdb.update_one(
-        {"chat_id": chat_id}, {"$set": {"warns": warns}}, upsert=True
+        {"chat_id": chat_id},
+        {"$set": {f"warns.{encode_key(name)}": warn}},
+        upsert=True,
     )
 
 
 async def remove_warns(chat_id: int, name: str) -> bool:
-    warnsd = await get_warns(chat_id)
-    name = name.lower().strip()
-    if name in warnsd:
-        del warnsd[name]
-        await warnsdb.update_one(
-            {"chat_id": chat_id},
-            {"$set": {"warns": warnsd}},
-            upsert=True,
-        )
-        return True
-    return False
+    path = f"warns.{encode_key(name.lower().strip())}"
+    res = await warnsdb.update_one(
+        {"chat_id": chat_id, path: {"$exists": True}},
+        {"$unset": {path: ""}},
+    )
+    return bool(res.modified_count)
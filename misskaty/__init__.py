@@ -15,20 +15,22 @@ except RuntimeError:
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
 
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.mongodb import MongoDBJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from async_pymongo import AsyncClient
-from pymongo import MongoClient
 from pyrogram import Client, filters
 from web.webserver import api
 from misskaty.vars import *
+from database import get_sync_client, mongo
+from misskaty.core.metrics import install as install_metrics
+from misskaty.core.ratelimit import throttle
 
 # 2. Universal Decorator Patch (Must be defined BEFORE Client initialization)
 def on_cmd(self, command, group=0, *args, **kwargs):
     def decorator(func):
         valid_keys = ["prefixes", "case_sensitive"]
         cmd_kwargs = {k: v for k, v in kwargs.items() if k in valid_keys}
-        self.on_message(filters.command(command, **cmd_kwargs), group)(func)
+        self.on_message(filters.command(command, **cmd_kwargs) & throttle(), group)(func)
         return func
     return decorator
 
@@ -41,6 +43,7 @@ def on_cb(self, pattern, group=0, *args, **kwargs):
 # Injecting directly into Pyrogram Client Class
 Client.on_cmd = on_cmd
 Client.on_cb = on_cb
+install_metrics(Client, loop)
 
 # 3. Logging Setup
 basicConfig(
@@ -52,7 +55,7 @@ basicConfig(
 getLogger("pyrogram").setLevel(ERROR)
 
 # 4. Global Variables
-MOD_LOAD, MOD_NOLOAD, HELPABLE, cleanmode = [], ["subscene_dl"], {}, {}
+MOD_LOAD, MOD_NOLOAD, HELPABLE = [], ["subscene_dl"], {}
 botStartTime = time.time()
 misskaty_version = "v2.16.1"
 BOT_ID, BOT_NAME, BOT_USERNAME = 0, "", ""
@@ -65,13 +68,13 @@ app = Client(
     api_id=API_ID,
     api_hash=API_HASH,
     bot_token=BOT_TOKEN,
-    mongodb=dict(connection=AsyncClient(DATABASE_URI), remove_peers=True),
+    mongodb=dict(connection=mongo, remove_peers=True),
 )
 
 user = Client(
     "YasirUBot",
     session_string=USER_SESSION,
-    mongodb=dict(connection=AsyncClient(DATABASE_URI), remove_peers=False),
+    mongodb=dict(connection=mongo, remove_peers=False),
 )
 
 # 6. Background Web Server
@@ -97,5 +100,9 @@ loop.run_until_complete(start_everything())
 print(f"DONE! STARTED AS @{BOT_USERNAME}")
 
 # 8. Scheduler
-jobstores = {"default": MongoDBJobStore(client=MongoClient(DATABASE_URI), database=DATABASE_NAME, collection="nightmode")}
+# Jobs registered again on every start (e.g. scraper prefetch) go in "memory"
+jobstores = {
+    "default": MongoDBJobStore(client=get_sync_client(), database=DATABASE_NAME, collection="nightmode"),
+    "memory": MemoryJobStore(),
+}
 scheduler = AsyncIOScheduler(jobstores=jobstores, timezone=TZ)
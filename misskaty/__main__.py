@@ -16,6 +16,10 @@ from pyrogram import __version__, idle
 from pyrogram.raw.all import layer
 
 from database import dbname
+from database.afk_db import load_afk_users
+from database.indexes import bootstrap_indexes
+from database.migrations import run_migrations
+from database.sangmata_db import flush_userdata
 from misskaty import (
     BOT_NAME,
     BOT_USERNAME,
@@ -24,12 +28,16 @@ from misskaty import (
     app,
     get_event_loop,
     scheduler,
-    run_wsgi
+    run_wsgi,
+    user,
 )
+from misskaty.core.decorator.permissions import admins_in_chat
+from misskaty.core.deletion import deleter
+from misskaty.core.watchdog import watchdog
+from misskaty.helper.html_parser import parse_pool
 from misskaty.plugins import ALL_MODULES
 from misskaty.plugins.web_scraper import web
 from misskaty.vars import OWNER_ID, USER_SESSION
-from utils import auto_clean
 
 LOGGER = getLogger("MissKaty")
 
@@ -57,6 +65,15 @@ async def start_bot():
     LOGGER.info(bot_modules)
     LOGGER.info("+===============+===============+===============+===============+")
     LOGGER.info("[INFO]: BOT STARTED AS @%s!", BOT_USERNAME)
+    parse_pool.start()
+    watchdog.start()
+    await run_migrations()
+    bootstrap_indexes()
+    LOGGER.info("[INFO]: LOADED %s AFK USERS", await load_afk_users())
+    LOGGER.info(
+        "[INFO]: LOADED %s ADMIN LISTS",
+        await asyncio.to_thread(admins_in_chat.load_snapshot),
+    )
     try:
         LOGGER.info("[INFO]: SENDING ONLINE STATUS")
         if USER_SESSION:
@@ -86,8 +103,12 @@ async def start_bot():
             message_id=message_id,
             text="<b>Bot restarted successfully!</b>",
         )
-    asyncio.create_task(auto_clean())
+    clients = (app, user) if USER_SESSION else (app,)
+    LOGGER.info("[INFO]: RESTORED %s PENDING DELETIONS", await deleter.start(*clients))
     await idle()
+    # Persist identity changes still waiting in the write-behind queue
+    await flush_userdata()
+    parse_pool.shutdown()
 
 
 if __name__ == "__main__":
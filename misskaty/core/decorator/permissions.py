@@ -1,8 +1,11 @@
+import asyncio
 from functools import partial, wraps
+from logging import getLogger
 from time import time
 from traceback import format_exc as err
-from typing import Optional, Union
+from typing import Dict, List, Optional, Union
 
+from cachetools import LRUCache, TTLCache
 from pyrogram import Client, enums
 from pyrogram.errors import ChannelPrivate, ChatAdminRequired, ChatWriteForbidden
 from pyrogram.types import CallbackQuery, Message
@@ -18,11 +21,30 @@ from ...helper.localization import (
     langdict,
 )
 
+LOGGER = getLogger("MissKaty")
+
+# (chat_id, user_id) -> ChatMember, dropped on chat_member_updated
+member_cache = TTLCache(maxsize=20000, ttl=5 * 60)
+
+
+async def get_member(chat_id: int, user_id: int, client: Client = None):
+    """Cached ``get_chat_member``. Pass ``client.me.id`` for the bot's own status."""
+    key = (chat_id, user_id)
+    member = member_cache.get(key)
+    if member is None:
+        member = await (client or app).get_chat_member(chat_id, user_id)
+        member_cache[key] = member
+    return member
+
+
+def invalidate_member(chat_id: int, user_id: int):
+    member_cache.pop((chat_id, user_id), None)
+
 
 async def member_permissions(chat_id: int, user_id: int):
     perms = []
     try:
-        member = (await app.get_chat_member(chat_id, user_id)).privileges
+        member = (await get_member(chat_id, user_id)).privileges
         if member.can_post_messages:
             perms.append("can_post_messages")
         if member.can_edit_messages:
@@ -61,7 +83,7 @@ async def check_perms(
     if not message.from_user:
         return bool(message.sender_chat and message.sender_chat.id == message.chat.id)
     try:
-        user = await chat.get_member(message.from_user.id)
+        user = await get_member(chat.id, message.from_user.id)
     except ChatAdminRequired:
         return False
     if user.status == enums.ChatMemberStatus.OWNER:
@@ -93,32 +115,104 @@ async def check_perms(
     return False
 
 
-admins_in_chat = Cache(filename="admin_cache.db", path="cache", in_memory=False)
+class AdminCache:
+    """In-memory admin lists with single-flight refresh.
 
+    Concurrent lookups of an expired chat share one ``get_chat_members``
+    call. Entries close to expiry are refreshed in the background while the
+    cached list is still served, so active chats never wait. The SQLite
+    cache only keeps a snapshot to warm up after a restart.
+    """
 
-async def list_admins(chat_id: int):
-    if chat_id in admins_in_chat:
-        interval = time() - admins_in_chat[chat_id]["last_updated_at"]
-        if interval < 3600:
-            return admins_in_chat[chat_id]["data"]
+    def __init__(self, snapshot: Cache, ttl: int = 3600, refresh_ahead: int = 300):
+        self.snapshot = snapshot
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self._entries = LRUCache(maxsize=10000)
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "invalidations": 0}
 
-    try:
-        admins_in_chat.add(
-            chat_id,
-            {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            },
-            timeout=6 * 60 * 60,
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, chat_id: int) -> Optional[List[int]]:
+        entry = self._entries.get(chat_id)
+        if entry is not None:
+            age = time() - entry[0]
+            if age < self.ttl:
+                self.stats["hits"] += 1
+                if age >= self.ttl - self.refresh_ahead:
+                    self._refresh(chat_id)
+                return entry[1]
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._refresh(chat_id))
+
+    def _refresh(self, chat_id: int) -> asyncio.Task:
+        task = self._inflight.get(chat_id)
+        if task is None:
+            task = self._inflight[chat_id] = asyncio.ensure_future(self._fetch(chat_id))
+            task.add_done_callback(partial(self._done, chat_id))
+        return task
+
+    def _done(self, chat_id: int, task: asyncio.Task):
+        self._inflight.pop(chat_id, None)
+        # Nobody awaits a background refresh, keep its error out of the loop log
+        if not task.cancelled() and task.exception():
+            LOGGER.warning(f"Admin cache refresh failed for {chat_id}: {task.exception()}")
+
+    async def _fetch(self, chat_id: int) -> Optional[List[int]]:
+        try:
+            admins = [
+                member.user.id
+                async for member in app.get_chat_members(
+                    chat_id, filter=enums.ChatMembersFilter.ADMINISTRATORS
+                )
+            ]
+        except ChannelPrivate:
+            self._entries.pop(chat_id, None)
+            return None
+        self.stats["refreshes"] += 1
+        self.set(chat_id, admins)
+        return admins
+
+    def set(self, chat_id: int, admins: List[int]):
+        updated_at = time()
+        self._entries[chat_id] = (updated_at, admins)
+        asyncio.ensure_future(
+            self.snapshot.aset(
+                chat_id,
+                {"last_updated_at": updated_at, "data": admins},
+                timeout=6 * 60 * 60,
+            )
         )
-        return admins_in_chat[chat_id]["data"]
-    except ChannelPrivate:
-        return
+
+    def invalidate(self, chat_id: int):
+        """Drop a chat and refresh it in the background."""
+        self.stats["invalidations"] += 1
+        self._entries.pop(chat_id, None)
+        self._refresh(chat_id)
+
+    async def clear(self):
+        self._entries.clear()
+        await self.snapshot.aclear()
+
+    def load_snapshot(self) -> int:
+        """Warm start from the SQLite snapshot. Blocking, run it off the loop."""
+        for chat_id, entry in self.snapshot.get_all().items():
+            self._entries[chat_id] = (entry["last_updated_at"], entry["data"])
+        return len(self._entries)
+
+
+admins_in_chat = AdminCache(
+    Cache(filename="admin_cache.db", path="cache", in_memory=False)
+)
+
+
+async def list_admins(chat_id: int):
+    return await admins_in_chat.get(chat_id)
 
 
 async def authorised(func, subFunc2, client, message, *args, **kwargs):
@@ -0,0 +1,169 @@
+"""
+Central scheduler for deleting messages later.
+
+Pending deletions sit in one heap ordered by due time and are persisted in
+Mongo so they survive restarts. A single worker pops everything that is
+due, groups ids per (client, chat) and removes them with ``delete_messages``
+calls of up to 100 ids. A FloodWait only postpones the affected chat.
+"""
+
+import asyncio
+import heapq
+import time
+from collections import defaultdict
+from itertools import islice
+from logging import getLogger
+from typing import Dict, Iterable, List, Tuple
+
+from pyrogram import Client
+from pyrogram.errors import FloodWait
+
+from database import dbname
+
+LOGGER = getLogger("MissKaty")
+
+BATCH_SIZE = 100  # Telegram limit for delete_messages
+
+
+def _chunks(ids: List[int], size: int = BATCH_SIZE) -> Iterable[List[int]]:
+    it = iter(ids)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class DeletionService:
+    def __init__(self, collection):
+        self.collection = collection
+        self._heap: List[Tuple[float, str, int, int]] = []
+        self._clients: Dict[str, Client] = {}
+        self._backoff: Dict[Tuple[str, int], float] = {}
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self.stats = {"scheduled": 0, "deleted": 0, "calls": 0, "floodwaits": 0}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    async def start(self, *clients: Client) -> int:
+        """Register clients, restore persisted deletions and start the worker."""
+        for client in clients:
+            self._clients[client.name] = client
+        # schedule() may have queued and persisted some before start()
+        queued = {entry[1:] for entry in self._heap}
+        restored = 0
+        async for doc in self.collection.find({}):
+            if doc["client"] not in self._clients:
+                continue
+            if (doc["client"], doc["chat_id"], doc["message_id"]) in queued:
+                continue
+            heapq.heappush(
+                self._heap,
+                (doc["due"], doc["client"], doc["chat_id"], doc["message_id"]),
+            )
+            restored += 1
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return restored
+
+    async def schedule(
+        self, client: Client, chat_id: int, message_ids: Iterable[int], delay: float
+    ):
+        """Delete message_ids from chat_id after delay seconds."""
+        self._clients.setdefault(client.name, client)
+        due = time.time() + delay
+        docs = [
+            {"client": client.name, "chat_id": chat_id, "message_id": msg_id, "due": due}
+            for msg_id in message_ids
+        ]
+        if not docs:
+            return
+        await self.collection.insert_many(docs, ordered=False)
+        for doc in docs:
+            heapq.heappush(self._heap, (due, client.name, chat_id, doc["message_id"]))
+        self.stats["scheduled"] += len(docs)
+        # Only wake the worker when the new entry is now the earliest one
+        if self._heap[0][0] == due:
+            self._wakeup.set()
+
+    async def delete_now(self, client: Client, chat_id: int, message_ids: List[int]) -> int:
+        """Delete right away in concurrent batches of 100. Returns the count deleted."""
+        results = await asyncio.gather(
+            *(
+                self._delete_batch(client, chat_id, chunk)
+                for chunk in _chunks(message_ids)
+            )
+        )
+        return sum(len(chunk) for chunk, ok in results if ok)
+
+    async def _delete_batch(
+        self, client: Client, chat_id: int, ids: List[int]
+    ) -> Tuple[List[int], bool]:
+        while True:
+            try:
+                self.stats["calls"] += 1
+                await client.delete_messages(chat_id, ids, revoke=True)
+                self.stats["deleted"] += len(ids)
+                return ids, True
+            except FloodWait as e:
+                self.stats["floodwaits"] += 1
+                await asyncio.sleep(e.value)
+            except Exception as err:
+                LOGGER.debug(f"Can't delete {len(ids)} messages in {chat_id}: {err}")
+                return ids, False
+
+    def _pop_due(self, now: float) -> Dict[Tuple[str, int], List[int]]:
+        due = defaultdict(list)
+        while self._heap and self._heap[0][0] <= now:
+            _, client, chat_id, msg_id = heapq.heappop(self._heap)
+            due[(client, chat_id)].append(msg_id)
+        return due
+
+    async def _flush_chat(self, key: Tuple[str, int], ids: List[int]):
+        client_name, chat_id = key
+        resume_at = self._backoff.get(key, 0)
+        if resume_at > time.time():
+            for msg_id in ids:
+                heapq.heappush(self._heap, (resume_at, client_name, chat_id, msg_id))
+            return
+        self._backoff.pop(key, None)
+        client = self._clients[client_name]
+        for chunk in _chunks(ids):
+            try:
+                self.stats["calls"] += 1
+                await client.delete_messages(chat_id, chunk, revoke=True)
+                self.stats["deleted"] += len(chunk)
+            except FloodWait as e:
+                self.stats["floodwaits"] += 1
+                resume_at = self._backoff[key] = time.time() + e.value
+                rest = ids[ids.index(chunk[0]):]
+                for msg_id in rest:
+                    heapq.heappush(self._heap, (resume_at, client_name, chat_id, msg_id))
+                return
+            except Exception as err:
+                # Already gone or no permission, nothing left to retry
+                LOGGER.debug(f"Can't delete {len(chunk)} messages in {chat_id}: {err}")
+            await self.collection.delete_many(
+                {"client": client_name, "chat_id": chat_id, "message_id": {"$in": chunk}}
+            )
+
+    async def _run(self):
+        while True:
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            if timeout is None or timeout > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            batches = self._pop_due(time.time())
+            try:
+                await asyncio.gather(
+                    *(self._flush_chat(key, ids) for key, ids in batches.items())
+                )
+            except Exception as err:
+                LOGGER.error(f"Deletion worker error: {err}")
+
+
+deleter = DeletionService(dbname["pending_deletes"])
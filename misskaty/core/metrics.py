@@ -0,0 +1,300 @@
+"""
+Per-handler instrumentation rendered in the Prometheus text format.
+
+A handler invocation opens an ``Invocation`` in a context variable. Mongo
+commands (pymongo ``CommandListener``), outbound HTTP through
+``misskaty.helper.http.fetch`` and Telegram RPCs (``Client.invoke``) add to
+whatever invocation is current. async_pymongo runs commands in the default
+executor, so the loop gets an executor that copies the caller's context
+into the worker thread.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Dict, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+from pyrogram.handlers import DisconnectHandler
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+FIRST_REPLY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 10, 20, 60)
+# Telegram methods that put something in front of the user
+REPLY_RPCS = {
+    "SendMessage",
+    "SendMedia",
+    "SendMultiMedia",
+    "EditMessage",
+    "ForwardMessages",
+    "SetBotCallbackAnswer",
+    "SetInlineBotResults",
+}
+
+_lock = threading.Lock()
+
+
+def _fmt_labels(names: Sequence[str], values: Tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = defaultdict(float)
+
+    def inc(self, *labels, amount: float = 1):
+        with _lock:
+            self._values[labels] += amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_fmt_labels(self.labels, labels)} {value}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket (+Inf last), sum]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, *labels):
+        with _lock:
+            data = self._values.get(labels)
+            if data is None:
+                data = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            data[0][bisect_left(self.buckets, value)] += 1
+            data[1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} histogram"
+        names = (*self.labels, "le")
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_fmt_labels(names, (*labels, bound))} {cumulative}"
+            label_str = _fmt_labels(self.labels, labels)
+            yield f"{self.name}_sum{label_str} {total}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+
+HANDLER_LABELS = ("handler", "group")
+
+handler_seconds = Histogram(
+    "misskaty_handler_seconds", "Wall time of handler invocations.", HANDLER_LABELS
+)
+handler_first_reply_seconds = Histogram(
+    "misskaty_handler_first_reply_seconds",
+    "Time from handler start to its first message sent or edited.",
+    HANDLER_LABELS,
+    FIRST_REPLY_BUCKETS,
+)
+handler_exceptions = Counter(
+    "misskaty_handler_exceptions_total",
+    "Exceptions raised by handlers.",
+    (*HANDLER_LABELS, "exception"),
+)
+handler_mongo_calls = Counter(
+    "misskaty_handler_mongo_calls_total", "Mongo commands run by handlers.", HANDLER_LABELS
+)
+handler_mongo_seconds = Counter(
+    "misskaty_handler_mongo_seconds_total",
+    "Time spent in Mongo commands by handlers.",
+    HANDLER_LABELS,
+)
+handler_http_calls = Counter(
+    "misskaty_handler_http_calls_total",
+    "Outbound HTTP requests made by handlers.",
+    HANDLER_LABELS,
+)
+handler_rpc_calls = Counter(
+    "misskaty_handler_rpc_calls_total",
+    "Telegram RPCs made by handlers.",
+    HANDLER_LABELS,
+)
+mongo_command_seconds = Histogram(
+    "misskaty_mongo_command_seconds", "Mongo command latency.", ("command",)
+)
+mongo_command_failures = Counter(
+    "misskaty_mongo_command_failures_total", "Failed Mongo commands.", ("command",)
+)
+http_request_seconds = Histogram(
+    "misskaty_http_request_seconds",
+    "Outbound HTTP latency until response headers.",
+    ("host", "status"),
+)
+http_circuit_rejections = Counter(
+    "misskaty_http_circuit_rejections_total",
+    "Outbound HTTP requests failed fast because the host's circuit is open.",
+    ("host",),
+)
+rpc_calls = Counter("misskaty_rpc_calls_total", "Telegram RPCs by method.", ("method",))
+
+METRICS = (
+    handler_seconds,
+    handler_first_reply_seconds,
+    handler_exceptions,
+    handler_mongo_calls,
+    handler_mongo_seconds,
+    handler_http_calls,
+    handler_rpc_calls,
+    mongo_command_seconds,
+    mongo_command_failures,
+    http_request_seconds,
+    http_circuit_rejections,
+    rpc_calls,
+)
+
+
+class Invocation:
+    __slots__ = ("labels", "start", "replied")
+
+    def __init__(self, handler: str, group):
+        self.labels = (handler, str(group))
+        self.start = time.perf_counter()
+        self.replied = False
+
+
+current: contextvars.ContextVar[Optional[Invocation]] = contextvars.ContextVar(
+    "misskaty_invocation", default=None
+)
+
+
+def instrument(func, group="unknown", name: str = None):
+    """Wrap an update handler so each call is measured under handler/group labels.
+
+    :func:`install` wraps every registered handler. Nested instrumented
+    wrappers (a handler awaiting another one) only count once, the outermost
+    one wins.
+    """
+    name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if current.get() is not None:
+            return await func(*args, **kwargs)
+        inv = Invocation(name, group)
+        token = current.set(inv)
+        try:
+            return await func(*args, **kwargs)
+        except BaseException as err:
+            if not isinstance(err, asyncio.CancelledError):
+                handler_exceptions.inc(*inv.labels, type(err).__name__)
+            raise
+        finally:
+            current.reset(token)
+            handler_seconds.observe(time.perf_counter() - inv.start, *inv.labels)
+
+    return wrapper
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event):
+        pass
+
+    def _record(self, event):
+        seconds = event.duration_micros / 1e6
+        mongo_command_seconds.observe(seconds, event.command_name)
+        if inv := current.get():
+            handler_mongo_calls.inc(*inv.labels)
+            handler_mongo_seconds.inc(*inv.labels, amount=seconds)
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        mongo_command_failures.inc(event.command_name)
+        self._record(event)
+
+
+mongo_metrics = MongoCommandMetrics()
+
+
+async def _on_http_request(request):
+    request.extensions["misskaty_start"] = time.perf_counter()
+    if inv := current.get():
+        handler_http_calls.inc(*inv.labels)
+
+
+async def _on_http_response(response):
+    start = response.request.extensions.get("misskaty_start")
+    if start is not None:
+        http_request_seconds.observe(
+            time.perf_counter() - start, response.request.url.host, response.status_code
+        )
+
+
+HTTP_EVENT_HOOKS = {"request": [_on_http_request], "response": [_on_http_response]}
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """Default executor that runs jobs inside a copy of the caller's context."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def install(client_cls, loop: asyncio.AbstractEventLoop):
+    """Measure every handler, count Telegram RPCs of every client and propagate
+    context to executor jobs."""
+    loop.set_default_executor(ContextThreadPoolExecutor())
+    original_add_handler = client_cls.add_handler
+    original_invoke = client_cls.invoke
+
+    @wraps(original_add_handler)
+    def add_handler(self, handler, group: int = 0):
+        # Every decorator (on_message, on_cmd, use_chat_lang, ...) ends up
+        # here, so the group label is the one the handler really runs in
+        if not isinstance(handler, DisconnectHandler):
+            handler.callback = instrument(handler.callback, group)
+        return original_add_handler(self, handler, group)
+
+    @wraps(original_invoke)
+    async def invoke(self, query, *args, **kwargs):
+        method = type(query).__name__
+        rpc_calls.inc(method)
+        inv = current.get()
+        if inv is not None:
+            handler_rpc_calls.inc(*inv.labels)
+            if not inv.replied and method in REPLY_RPCS:
+                inv.replied = True
+                handler_first_reply_seconds.observe(
+                    time.perf_counter() - inv.start, *inv.labels
+                )
+        return await original_invoke(self, query, *args, **kwargs)
+
+    client_cls.add_handler = add_handler
+    client_cls.invoke = invoke
+
+
+def render() -> str:
+    with _lock:
+        lines = [line for metric in METRICS for line in metric.render()]
+    return "\n".join(lines) + "\n"
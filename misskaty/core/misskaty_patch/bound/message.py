@@ -20,6 +20,8 @@ from pyrogram.errors import (
 )
 from pyrogram.types import Message
 
+from misskaty.core.deletion import deleter
+
 LOGGER = getLogger("MissKaty")
 
 
@@ -37,7 +39,7 @@ async def reply_text(
         text (``str``):
             Text of the message to be sent.
         del_in (``int``):
-            Time in Seconds for delete that message.
+            Time in Seconds for delete that message. Deletion is queued, the message is returned right away.
         quote (``bool``, *optional*):
             If ``True``, the message will be sent as
             a reply to this message.
@@ -83,10 +85,9 @@ async def reply_text(
             )
         else:
             msg = await self.reply_text(text=text, *args, **kwargs)
-        if del_in == 0:
-            return msg
-        await asleep(del_in)
-        return bool(await msg.delete_msg())
+        if del_in and isinstance(msg, Message):
+            await deleter.schedule(msg._client, msg.chat.id, [msg.id], del_in)
+        return msg
     except FloodWait as e:
         LOGGER.warning(f"Got floodwait in {self.chat.id} for {e.value}'s.")
         await asleep(e.value)
@@ -109,7 +110,7 @@ async def edit_text(
         text (``str``):
             New text of the message.
         del_in (``int``):
-            Time in Seconds for delete that message.
+            Time in Seconds for delete that message. Deletion is queued, the message is returned right away.
         parse_mode (:obj:`enums.ParseMode`, *optional*):
             By default, texts are parsed using
             both Markdown and HTML styles.
@@ -130,10 +131,9 @@ async def edit_text(
     """
     try:
         msg = await self.edit_text(text, *args, **kwargs)
-        if del_in == 0:
-            return msg
-        await asleep(del_in)
-        return bool(await msg.delete_msg())
+        if del_in and isinstance(msg, Message):
+            await deleter.schedule(msg._client, msg.chat.id, [msg.id], del_in)
+        return msg
     except FloodWait as e:
         LOGGER.warning(f"Got floodwait in {self.chat.id} for {e.value}'s.")
         await asleep(e.value)
@@ -161,7 +161,7 @@ async def edit_or_send_as_file(
         text (``str``):
             New text of the message.
         del_in (``int``):
-            Time in Seconds for delete that message.
+            Time in Seconds for delete that message. Deletion is queued, the message is returned right away.
         log (``bool`` | ``str``, *optional*):
             If ``True``, the message will be forwarded
             to the log channel.
@@ -193,10 +193,9 @@ async def edit_or_send_as_file(
     text = html.escape(text.html) if as_raw else text
     try:
         msg = await edit_text(self, text=text, *args, **kwargs)
-        if del_in == 0:
-            return msg
-        await asleep(del_in)
-        return bool(await msg.delete_msg())
+        if del_in and isinstance(msg, Message):
+            await deleter.schedule(msg._client, msg.chat.id, [msg.id], del_in)
+        return msg
     except (MessageTooLong, OSError):
         return await reply_as_file(self, text=text, *args, **kwargs)
 
@@ -213,7 +212,7 @@ async def reply_or_send_as_file(
         text (``str``):
             Text of the message to be sent.
         del_in (``int``):
-            Time in Seconds for delete that message.
+            Time in Seconds for delete that message. Deletion is queued, the message is returned right away.
         quote (``bool``, *optional*):
             If ``True``, the message will be sent
             as a reply to this message.
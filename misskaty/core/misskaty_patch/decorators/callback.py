@@ -21,6 +21,8 @@ import typing
 import pyrogram
 from pyrogram.methods import Decorators
 
+from misskaty.core.decorator.permissions import get_member
+
 from ..utils import handle_error
 
 
@@ -76,9 +78,7 @@ def callback(
     def wrapper(func):
         async def decorator(client, CallbackQuery: pyrogram.types.CallbackQuery):
             if self_admin:
-                me = await client.get_chat_member(
-                    CallbackQuery.message.chat.id, (await client.get_me()).id
-                )
+                me = await get_member(CallbackQuery.message.chat.id, client.me.id, client)
                 if me.status not in (
                     pyrogram.enums.ChatMemberStatus.OWNER,
                     pyrogram.enums.ChatMemberStatus.ADMINISTRATOR,
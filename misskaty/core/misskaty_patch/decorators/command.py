@@ -1,9 +1,11 @@
+import functools
 import typing
 
 import pyrogram
 from pyrogram.methods import Decorators
 
 from misskaty.core import pyro_cooldown
+from misskaty.core.decorator.permissions import get_member
 from misskaty.vars import COMMAND_HANDLER
 
 from ..utils import handle_error
@@ -85,6 +87,7 @@ def command(
             ) & pyro_cooldown.wait(7)
 
     def wrapper(func):
+        @functools.wraps(func)
         async def decorator(client, message: pyrogram.types.Message):
             if is_disabled:
                 return await message.reply_text(
@@ -99,9 +102,7 @@ def command(
                     "This command can be used in supergroups only."
                 )
             if self_admin:
-                me = await client.get_chat_member(
-                    message.chat.id, (await client.get_me()).id
-                )
+                me = await get_member(message.chat.id, client.me.id, client)
                 if me.status not in (
                     pyrogram.enums.ChatMemberStatus.OWNER,
                     pyrogram.enums.ChatMemberStatus.ADMINISTRATOR,
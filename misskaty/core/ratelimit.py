@@ -0,0 +1,164 @@
+"""
+Token-bucket rate limiting for commands.
+
+Each check consumes one token from up to three buckets: the user's, the
+chat's and the command's global bucket. A bucket holds ``burst`` tokens and
+regains one every ``interval`` seconds. Buckets live in a bounded cache and
+expire once they would have refilled completely, so memory stays flat no
+matter how many users pass through.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from cachetools import TLRUCache
+from pyrogram import filters
+from pyrogram.errors import MessageDeleteForbidden
+
+from misskaty.vars import OWNER_ID, SUDO
+
+MAX_BUCKETS = 50000
+
+
+class Limit(NamedTuple):
+    burst: int
+    interval: float  # seconds to regain one token
+
+
+class Policy(NamedTuple):
+    user: Optional[Limit] = None
+    chat: Optional[Limit] = None
+    command: Optional[Limit] = None
+
+
+# Per-command policies, heavier for commands that spawn downloads or ffmpeg
+POLICIES: Dict[str, Policy] = {
+    "ytdown": Policy(user=Limit(1, 60), command=Limit(10, 6)),
+    "genss": Policy(user=Limit(1, 60), chat=Limit(3, 60), command=Limit(6, 10)),
+    "ai": Policy(user=Limit(1, 10), chat=Limit(5, 10)),
+    "ask": Policy(user=Limit(1, 10), chat=Limit(5, 10)),
+}
+
+
+class _Bucket:
+    __slots__ = ("tokens", "updated", "ttl", "warned")
+
+    def __init__(self, limit: Limit, now: float):
+        self.tokens = float(limit.burst)
+        self.updated = now
+        self.ttl = limit.burst * limit.interval
+        self.warned = False
+
+    def wait(self, limit: Limit, now: float) -> float:
+        """Refill, then return 0 if a token is free, else seconds until one is."""
+        self.tokens = min(
+            limit.burst, self.tokens + (now - self.updated) / limit.interval
+        )
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) * limit.interval
+
+    def take(self):
+        self.tokens -= 1
+        self.warned = False
+
+
+_buckets = TLRUCache(
+    maxsize=MAX_BUCKETS,
+    ttu=lambda _key, bucket, now: now + bucket.ttl,
+    timer=time.monotonic,
+)
+_stats = Counter()
+
+
+def check(
+    policy: Policy, user_id: int, chat_id: int, command: str
+) -> Tuple[float, Optional[_Bucket]]:
+    """Consume a token from every bucket the policy defines.
+
+    Nothing is consumed unless every bucket has a token. The user and chat
+    buckets are keyed by the limit, not the command, so commands sharing a
+    limit share the allowance. Returns ``(retry_after, bucket)``: 0 and None
+    when allowed, otherwise the wait in seconds and the bucket that refused.
+    """
+    now = time.monotonic()
+    ready = []
+    for scope, key, limit in (
+        ("user", user_id, policy.user),
+        ("chat", chat_id, policy.chat),
+        ("command", command, policy.command),
+    ):
+        if limit is None:
+            continue
+        bucket_key = (scope, key, limit)
+        bucket = _buckets.get(bucket_key)
+        if bucket is None:
+            bucket = _Bucket(limit, now)
+        retry_after = bucket.wait(limit, now)
+        # Reassign so the expiry moves with the last update
+        _buckets[bucket_key] = bucket
+        if retry_after:
+            _stats[f"throttled_{scope}"] += 1
+            return retry_after, bucket
+        ready.append(bucket)
+    for bucket in ready:
+        bucket.take()
+    _stats["allowed"] += 1
+    return 0.0, None
+
+
+async def _warn(msg, retry_after: float):
+    user = msg.from_user or msg.sender_chat
+    name = msg.from_user.mention if msg.from_user else msg.sender_chat.title
+    ids = await msg.reply_msg(
+        f"Sorry {name} [<code>{user.id}</code>], you must wait for {round(retry_after)}s before using this feature again.."
+    )
+    try:
+        await msg.delete_msg()
+    except MessageDeleteForbidden:
+        pass
+    await asyncio.sleep(retry_after)
+    await ids.edit_msg(
+        f"Alright {name} [<code>{user.id}</code>], your cooldown is over you can command again.",
+        del_in=3,
+    )
+
+
+def throttle(default: Optional[Policy] = None, command: Optional[str] = None):
+    """Filter enforcing ``POLICIES`` for the matched command, else ``default``.
+
+    Commands without a policy pass when no default is given. `command` names
+    the policy of messages that aren't commands, e.g. links matched by a
+    regex. Only the first refused message of a window gets a warning, the
+    rest are dropped silently.
+    """
+
+    async def func(flt, _, msg):
+        user = msg.from_user or msg.sender_chat
+        if not user or user.id in SUDO or user.id == OWNER_ID:
+            return True
+        command = (
+            msg.command[0].lower()
+            if getattr(msg, "command", None)
+            else flt.command or ""
+        )
+        policy = POLICIES.get(command, flt.default)
+        if policy is None:
+            return True
+        retry_after, bucket = check(policy, user.id, msg.chat.id, command)
+        if not retry_after:
+            return True
+        if not bucket.warned:
+            bucket.warned = True
+            _stats["warnings"] += 1
+            asyncio.create_task(_warn(msg, retry_after))
+        return False
+
+    return filters.create(func, default=default, command=command)
+
+
+def throttle_stats() -> dict:
+    return {**_stats, "buckets": len(_buckets), "max_buckets": MAX_BUCKETS}
@@ -0,0 +1,139 @@
+"""
+Event loop stall detector.
+
+A heartbeat coroutine stamps the loop every ``interval`` and measures how
+late it woke up (loop lag). A daemon thread watches the stamp; when the
+loop has not beaten for longer than ``threshold`` it grabs the loop
+thread's current stack with ``sys._current_frames`` and charges the stall
+to the innermost frame that belongs to the bot, so offenders aggregate by
+call site instead of by library internals.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from logging import getLogger
+from typing import Dict, Optional
+
+from misskaty.vars import LOOP_STALL_MS
+
+LOGGER = getLogger("MissKaty")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _is_own_frame(filename: str) -> bool:
+    return filename.startswith(_ROOT) and "site-packages" not in filename
+
+
+class _Site:
+    __slots__ = ("count", "total", "max", "stack")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.stack = ""
+
+
+class LoopWatchdog:
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self.sites: Dict[str, _Site] = {}
+        self.lag = {"samples": 0, "total": 0.0, "max": 0.0, "stalls": 0}
+        self._beat = time.monotonic()
+        self._captured: Optional[str] = None
+        self._loop_thread: Optional[int] = None
+        self._lock = threading.Lock()
+        self._task = None
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    async def _heartbeat(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - before - self.interval)
+            with self._lock:
+                self._beat = now
+                self.lag["samples"] += 1
+                self.lag["total"] += lag
+                self.lag["max"] = max(self.lag["max"], lag)
+                site, self._captured = self._captured, None
+                # None too when the stats were reset during the stall
+                entry = self.sites.get(site) if site is not None else None
+                if entry is not None:
+                    # The stall is over, charge its real length to the call site
+                    entry.total += lag
+                    entry.max = max(entry.max, lag)
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval / 2)
+            with self._lock:
+                stalled = time.monotonic() - self._beat
+                if stalled < self.threshold or self._captured is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame)
+                own = [f for f in stack if _is_own_frame(f.filename)]
+                culprit = (own or stack)[-1]
+                site = f"{os.path.relpath(culprit.filename, _ROOT)}:{culprit.lineno} in {culprit.name}"
+                entry = self.sites.get(site)
+                if entry is None:
+                    entry = self.sites[site] = _Site()
+                entry.count += 1
+                entry.stack = "".join(traceback.format_list(stack[-8:]))
+                self.lag["stalls"] += 1
+                self._captured = site
+            LOGGER.warning(f"Event loop blocked for {stalled:.2f}s at {site}")
+
+    def summary(self) -> dict:
+        with self._lock:
+            samples = self.lag["samples"]
+            return {
+                "threshold_ms": round(self.threshold * 1000),
+                "lag_avg_ms": round(self.lag["total"] / samples * 1000, 2) if samples else 0.0,
+                "lag_max_ms": round(self.lag["max"] * 1000, 2),
+                "stalls": self.lag["stalls"],
+                "offenders": {
+                    site: {
+                        "count": entry.count,
+                        "total_ms": round(entry.total * 1000),
+                        "max_ms": round(entry.max * 1000),
+                    }
+                    for site, entry in self._top(10)
+                },
+            }
+
+    def top(self, limit: int = 10):
+        with self._lock:
+            return self._top(limit)
+
+    def _top(self, limit: int):
+        # Callers hold the lock, the watcher thread inserts new sites
+        return sorted(self.sites.items(), key=lambda item: item[1].total, reverse=True)[
+            :limit
+        ]
+
+    def reset(self):
+        with self._lock:
+            self.sites.clear()
+            self._captured = None
+            self.lag = {"samples": 0, "total": 0.0, "max": 0.0, "stalls": 0}
+
+
+watchdog = LoopWatchdog(threshold=LOOP_STALL_MS / 1000)
@@ -0,0 +1,115 @@
+"""
+Value codecs for :class:`misskaty.helper.sqlite_helper.Cache`.
+
+A stored value is ``codec id + compression id + payload``. The codec is
+fixed per cache instance; compression is applied per value once the encoded
+payload reaches the instance threshold. msgpack, orjson, zstandard and lz4
+are optional, they are only imported when a cache asks for them.
+"""
+
+import json
+import pickle
+import zlib
+from typing import Any, Callable, Dict, NamedTuple
+
+__all__ = ["Codec", "Compressor", "get_codec", "get_compressor"]
+
+
+class Codec(NamedTuple):
+    name: str
+    id: bytes
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+class Compressor(NamedTuple):
+    name: str
+    id: bytes
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+def _pickle() -> Codec:
+    return Codec(
+        "pickle",
+        b"p",
+        lambda value: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+        pickle.loads,  # noqa: S301
+    )
+
+
+def _json() -> Codec:
+    return Codec(
+        "json",
+        b"j",
+        lambda value: json.dumps(value, separators=(",", ":")).encode(),
+        json.loads,
+    )
+
+
+def _orjson() -> Codec:
+    import orjson
+
+    return Codec("orjson", b"o", orjson.dumps, orjson.loads)
+
+
+def _msgpack() -> Codec:
+    import msgpack
+
+    return Codec(
+        "msgpack",
+        b"m",
+        msgpack.packb,
+        lambda data: msgpack.unpackb(data, strict_map_key=False),
+    )
+
+
+def _zlib() -> Compressor:
+    return Compressor("zlib", b"z", lambda data: zlib.compress(data, 6), zlib.decompress)
+
+
+def _zstd() -> Compressor:
+    import zstandard
+
+    # One-shot functions, (de)compressor objects aren't safe to share between
+    # the threads the cache encodes on
+    return Compressor(
+        "zstd", b"s", lambda data: zstandard.compress(data, 3), zstandard.decompress
+    )
+
+
+def _lz4() -> Compressor:
+    import lz4.frame
+
+    return Compressor("lz4", b"l", lz4.frame.compress, lz4.frame.decompress)
+
+
+CODECS: Dict[str, Callable[[], Codec]] = {
+    "pickle": _pickle,
+    "json": _json,
+    "orjson": _orjson,
+    "msgpack": _msgpack,
+}
+COMPRESSORS: Dict[str, Callable[[], Compressor]] = {
+    "zlib": _zlib,
+    "zstd": _zstd,
+    "lz4": _lz4,
+}
+# Stored compression id -> name, so rows stay readable after a config change
+COMPRESSOR_IDS = {b"z": "zlib", b"s": "zstd", b"l": "lz4"}
+
+
+def get_codec(name: str) -> Codec:
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown cache codec {name!r}, use one of {', '.join(CODECS)}")
+
+
+def get_compressor(name: str) -> Compressor:
+    try:
+        return COMPRESSORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown cache compression {name!r}, use one of {', '.join(COMPRESSORS)}"
+        )
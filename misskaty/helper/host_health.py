@@ -0,0 +1,287 @@
+"""
+Health of the hosts behind ``misskaty.helper.http.fetch``.
+
+Every host gets a circuit breaker and a cap on concurrent requests. After
+`failures` failed requests in a row (transport errors, timeouts or 5xx) the
+circuit opens and requests to the host fail at once with
+:class:`CircuitOpen` instead of waiting out the client timeout. Once the
+cooldown passed one probe request goes through: success closes the
+circuit, failure opens it again for twice as long, up to `max_cooldown`.
+Only the probe decides, late answers of requests sent before the circuit
+opened are just counted.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from statistics import median
+from typing import Any, Dict, Optional
+
+import httpx
+
+from misskaty.core.metrics import http_circuit_rejections
+
+__all__ = ["CircuitOpen", "GuardedTransport", "HostHealth", "host_of"]
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+class CircuitOpen(httpx.TransportError):
+    """The host failed too often lately, the request was not sent."""
+
+
+def host_of(url: str) -> str:
+    """Host of a URL, also for bare domains like ``pahe.ink``."""
+    return httpx.URL(url if "://" in url else f"https://{url}").host
+
+
+class _Host:
+    __slots__ = (
+        "state",
+        "streak",
+        "cooldown",
+        "opened_at",
+        "probing",
+        "slots",
+        "outcomes",
+        "active",
+        "waiting",
+    )
+
+    def __init__(self, connections: int, window: int, cooldown: float):
+        self.state = CLOSED
+        # Failed requests in a row
+        self.streak = 0
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.probing = False
+        self.slots = asyncio.Semaphore(connections)
+        self.active = 0
+        # Requests waiting for a slot
+        self.waiting = 0
+        # (ok, seconds until response headers) of the latest requests
+        self.outcomes = deque(maxlen=window)
+
+
+class _Call:
+    __slots__ = ("ok",)
+
+    def __init__(self):
+        self.ok = True
+
+
+class HostHealth:
+    def __init__(
+        self,
+        failures: int = 3,
+        cooldown: float = 30,
+        max_cooldown: float = 600,
+        connections: int = 8,
+        window: int = 50,
+        max_hosts: int = 512,
+    ):
+        """
+        :param failures: Failed requests in a row that open the circuit.
+        :param cooldown: Seconds the circuit stays open before the first probe.
+        :param max_cooldown: Upper bound of the cooldown after failed probes.
+        :param connections: Concurrent requests per host, others wait for a slot.
+        :param window: Latest requests the success rate and latency are taken from.
+        :param max_hosts: Hosts kept, the least recently used idle ones are dropped.
+        """
+        self.failures = failures
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.connections = connections
+        self.window = window
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, _Host]" = OrderedDict()
+
+    def _get(self, host: str) -> _Host:
+        if (state := self._hosts.get(host)) is not None:
+            self._hosts.move_to_end(host)
+            return state
+        state = self._hosts[host] = _Host(self.connections, self.window, self.base_cooldown)
+        if len(self._hosts) > self.max_hosts:
+            self._evict(len(self._hosts) - self.max_hosts)
+        return state
+
+    def _evict(self, count: int):
+        # Hosts with requests waiting or in flight keep their slots
+        idle = [
+            host
+            for host, state in self._hosts.items()
+            if not (state.active or state.waiting or state.probing)
+        ]
+        for host in idle[:count]:
+            del self._hosts[host]
+
+    def _admit(self, host: str, state: _Host) -> bool:
+        """Raise CircuitOpen unless a request may go out, True for the probe."""
+        if state.state == CLOSED:
+            return False
+        if state.state == OPEN and time.monotonic() - state.opened_at >= state.cooldown:
+            state.state = HALF_OPEN
+        if state.state == HALF_OPEN and not state.probing:
+            state.probing = True
+            return True
+        http_circuit_rejections.inc(host)
+        retry = max(state.cooldown - (time.monotonic() - state.opened_at), 0)
+        raise CircuitOpen(f"{host} is failing, retrying in {retry:.0f}s")
+
+    async def acquire(self, host: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a request slot of `host`, True if the request is the probe.
+
+        Raises CircuitOpen while the circuit is open and asyncio.TimeoutError
+        when no slot frees up within `timeout`.
+        """
+        state = self._get(host)
+        probe = self._admit(host, state)
+        state.waiting += 1
+        try:
+            await asyncio.wait_for(state.slots.acquire(), timeout)
+        except BaseException:
+            if probe:
+                state.probing = False
+            raise
+        finally:
+            state.waiting -= 1
+        state.active += 1
+        return probe
+
+    def release(self, host: str):
+        state = self._get(host)
+        state.active -= 1
+        state.slots.release()
+
+    def record(self, host: str, ok: Optional[bool], seconds: float = 0.0, probe: bool = False):
+        """Outcome of a request, None if it was cancelled before it had one.
+
+        `probe` is what :meth:`acquire` returned for the request.
+        """
+        state = self._get(host)
+        if ok is None:
+            if probe:
+                state.probing = False
+            return
+        state.outcomes.append((ok, seconds))
+        if ok:
+            state.streak = 0
+            if probe:
+                state.state = CLOSED
+                state.probing = False
+                state.cooldown = self.base_cooldown
+            return
+        state.streak += 1
+        if probe:
+            state.cooldown = min(state.cooldown * 2, self.max_cooldown)
+            self._open(state)
+        elif state.state == CLOSED and state.streak >= self.failures:
+            self._open(state)
+
+    @staticmethod
+    def _open(state: _Host):
+        state.state = OPEN
+        state.probing = False
+        state.opened_at = time.monotonic()
+
+    @asynccontextmanager
+    async def track(self, host: str, timeout: Optional[float] = None):
+        """Guard a request made outside of httpx, e.g. with cloudscraper.
+
+        Exceptions count as failures, set ``ok`` of the yielded call to False
+        for a bad response.
+        """
+        probe = await self.acquire(host, timeout)
+        call = _Call()
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception:
+            call.ok = False
+            raise
+        except BaseException:
+            call.ok = None
+            raise
+        finally:
+            self.record(host, call.ok, time.perf_counter() - start, probe)
+            self.release(host)
+
+    def snapshot(self, host: str) -> Dict[str, Any]:
+        state = self._hosts.get(host)
+        if state is None or not state.outcomes:
+            return {"state": state.state if state else CLOSED, "requests": 0}
+        latencies = [seconds for ok, seconds in state.outcomes if ok]
+        return {
+            "state": state.state,
+            "requests": len(state.outcomes),
+            "success_rate": round(len(latencies) / len(state.outcomes), 4),
+            "latency_ms": round(median(latencies) * 1000) if latencies else None,
+            "failure_streak": state.streak,
+            "active": state.active,
+        }
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: self.snapshot(host) for host in sorted(self._hosts)}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that gives the host's slot back once it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """Transport that sends requests through the circuit and slots of their host."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, health: HostHealth):
+        self.transport = transport
+        self.health = health
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        try:
+            probe = await self.health.acquire(
+                host, request.extensions.get("timeout", {}).get("pool")
+            )
+        except CircuitOpen as exc:
+            exc.request = request
+            raise
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout(
+                f"No free request slot for {host}", request=request
+            ) from None
+        ok = None
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+            ok = response.status_code < 500
+        except BaseException as exc:
+            ok = False if isinstance(exc, Exception) else None
+            self.health.release(host)
+            raise
+        finally:
+            self.health.record(host, ok, time.perf_counter() - start, probe)
+        if response.is_closed:
+            # Body already loaded, nothing left to hold the slot for
+            self.health.release(host)
+            return response
+        response.stream = _ReleasingStream(response.stream, lambda: self.health.release(host))
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
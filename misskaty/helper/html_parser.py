@@ -0,0 +1,166 @@
+"""
+HTML parsing off the event loop.
+
+Page parsers in :mod:`misskaty.helper.page_parsers` take the raw response
+bytes and return plain lists and dicts, so they can run in a process pool:
+a large page no longer blocks every other update while BeautifulSoup walks
+it. Parsers written against :func:`document` use CSS selectors and work
+with any backend: ``bs4`` (BeautifulSoup + lxml), ``lxml`` (lxml.html +
+cssselect) or ``selectolax``, picked with the ``HTML_PARSER`` variable.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import runpy
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from logging import getLogger
+from typing import Any, Callable, List, Optional
+
+from misskaty.vars import HTML_PARSER, PARSE_WORKERS
+
+LOGGER = getLogger("MissKaty")
+
+_WORKER_START = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parse_worker.py")
+
+__all__ = ["Node", "document", "parse_html", "parse_pool"]
+
+
+@lru_cache(maxsize=256)
+def _lxml_selector(selector: str):
+    # cssselect translates to XPath on every call, parsers reuse a few selectors
+    from lxml.cssselect import CSSSelector
+
+    return CSSSelector(selector)
+
+
+class Node:
+    """Backend independent element: CSS queries, text and attributes."""
+
+    __slots__ = ("_el", "_backend")
+
+    def __init__(self, el, backend: str):
+        self._el = el
+        self._backend = backend
+
+    def css(self, selector: str) -> List["Node"]:
+        if self._backend == "bs4":
+            found = self._el.select(selector)
+        elif self._backend == "lxml":
+            found = _lxml_selector(selector)(self._el)
+        else:
+            found = self._el.css(selector)
+        return [Node(el, self._backend) for el in found]
+
+    def css_first(self, selector: str) -> Optional["Node"]:
+        if self._backend == "bs4":
+            el = self._el.select_one(selector)
+        elif self._backend == "lxml":
+            el = next(iter(_lxml_selector(selector)(self._el)), None)
+        else:
+            el = self._el.css_first(selector)
+        return None if el is None else Node(el, self._backend)
+
+    def text(self, strip: bool = False) -> str:
+        if self._backend == "bs4":
+            text = self._el.get_text()
+        elif self._backend == "lxml":
+            text = self._el.text_content()
+        else:
+            text = self._el.text(deep=True)
+        return text.strip() if strip else text
+
+    def attr(self, name: str, default: Any = None) -> Any:
+        if self._backend == "selectolax":
+            value = self._el.attributes.get(name)
+            return default if value is None else value
+        return self._el.get(name, default)
+
+
+def document(html: bytes, backend: Optional[str] = None) -> Node:
+    """Parse a whole page with the configured backend."""
+    backend = backend or HTML_PARSER
+    if backend == "bs4":
+        from bs4 import BeautifulSoup
+
+        return Node(BeautifulSoup(html, "lxml"), backend)
+    if backend == "lxml":
+        import lxml.html
+
+        return Node(lxml.html.fromstring(html), backend)
+    if backend == "selectolax":
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:
+            # selectolax < 0.3.13 only ships the Modest backend
+            from selectolax.parser import HTMLParser
+
+        return Node(HTMLParser(html), backend)
+    raise ValueError(f"Unknown HTML parser backend {backend!r}")
+
+
+def _warm_up(backend: str) -> bool:
+    # Import the parser stack in the worker before the first page arrives
+    document(b"<html><body><p class='x'>warm</p></body></html>", backend).css("p.x")
+    return True
+
+
+class ParsePool:
+    """Process pool for page parsers, started with warm workers at boot.
+
+    With ``PARSE_WORKERS=0`` parsers run in the default thread pool instead,
+    which keeps them off the loop but shares the GIL with the bot.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        if self._executor is not None or self.workers <= 0:
+            return
+        # Forking the bot itself would copy locks held by its threads (Mongo,
+        # cache writers, web server) into the workers. A forkserver starts
+        # clean, and without preloading it doesn't import the bot's __main__.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([])
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=runpy.run_path,
+            initargs=(_WORKER_START, {"VARS": {"HTML_PARSER": HTML_PARSER, "PARSE_WORKERS": 0}}),
+        )
+        for _ in range(self.workers):
+            self._executor.submit(_warm_up, HTML_PARSER)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        if executor is None:
+            return await loop.run_in_executor(None, partial(func, *args))
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault in a parser), start a fresh pool.
+            # Every call in flight fails with it, only the first one restarts
+            # so the retries of the others aren't cancelled.
+            if self._executor is executor:
+                LOGGER.warning("HTML parse pool broke, restarting it")
+                self.shutdown()
+                self.start()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+
+parse_pool = ParsePool(PARSE_WORKERS)
+
+
+async def parse_html(func: Callable[..., Any], html: bytes, *args) -> Any:
+    """Run ``func(html, *args)`` in the parse pool and return its plain result."""
+    return await parse_pool.run(func, html, *args)
@@ -1,14 +1,23 @@
 from asyncio import gather
-from httpx import AsyncClient, Timeout
+from httpx import AsyncClient, AsyncHTTPTransport, Timeout
+
+from misskaty.core.metrics import HTTP_EVENT_HOOKS
+from misskaty.helper.host_health import GuardedTransport, HostHealth
+from misskaty.vars import HOST_MAX_CONNECTIONS
+
+# Circuit breaker and concurrency cap per host of every request through fetch
+host_health = HostHealth(connections=HOST_MAX_CONNECTIONS)
 
 # HTTPx Async Client
 fetch = AsyncClient(
     verify=False,
+    transport=GuardedTransport(AsyncHTTPTransport(verify=False), host_health),
     headers={
         "Accept-Language": "en-US,en;q=0.9,id-ID;q=0.8,id;q=0.7",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36 Edge/107.0.1418.42",
     },
     timeout=Timeout(20),
+    event_hooks=HTTP_EVENT_HOOKS,
 )
 
 
@@ -0,0 +1,67 @@
+"""
+Search results of several scraper sites merged into one list.
+
+Sites title the same release differently ("Dune Part Two (2024) WEB-DL
+1080p", "Dune: Part Two 2024"), so results are grouped by the title without
+release tags and punctuation, plus the year when the title has one.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+__all__ = ["MetaResults", "title_key"]
+
+_YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+_TAGS = re.compile(
+    r"\[[^\]]*\]|\([^)]*\)|\b(?:web-?dl|web-?rip|blu-?ray|br-?rip|hd-?rip|hdtv|hdcam"
+    r"|\d{3,4}p|x26[45]|hevc|sub(?:title)? indo|batch|complete|eps?(?:isode)? ?\d+)\b",
+    re.IGNORECASE,
+)
+
+
+def title_key(title: str) -> Tuple[str, str]:
+    """Normalized ``(title, year)`` of a result title, year is "" if it has none."""
+    years = _YEAR.findall(title)
+    name = _TAGS.sub(" ", _YEAR.sub(" ", title.casefold()))
+    return " ".join(re.sub(r"[\W_]+", " ", name).split()), years[0] if years else ""
+
+
+class MetaResults:
+    """Results of the sites answered so far, deduplicated by :func:`title_key`."""
+
+    def __init__(self, total: int):
+        self.total = total
+        # Site titles in the order they answered
+        self.answered: List[str] = []
+        self.failed: List[str] = []
+        self.hits = 0
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    @property
+    def done(self) -> int:
+        return len(self.answered) + len(self.failed)
+
+    def add(self, site: str, results: Optional[List[Dict[str, Any]]]):
+        """Merge the results of `site`, None when it failed or timed out."""
+        if results is None:
+            self.failed.append(site)
+            return
+        self.answered.append(site)
+        if results:
+            self.hits += 1
+        for item in results:
+            title = item.get("judul") or item.get("title")
+            link = item.get("link") or item.get("url")
+            if not title or not link:
+                continue
+            key = title_key(title)
+            if not key[0]:
+                continue
+            entry = self.entries.setdefault(
+                key, {"title": title.strip(), "year": key[1], "links": {}}
+            )
+            entry["links"].setdefault(site, link)
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        # Titles found on more sites first, ties keep the order sites answered in
+        return sorted(self.entries.values(), key=lambda e: -len(e["links"]))[:limit]
@@ -0,0 +1,314 @@
+"""
+Page parsers run by :func:`misskaty.helper.html_parser.parse_html`.
+
+Every parser is a module level function taking the raw page bytes and
+returning plain lists, dicts and strings, so it can be sent to a worker
+process and its result pickled back.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from bs4 import BeautifulSoup
+
+from .html_parser import document
+
+__all__ = [
+    "Field",
+    "parse_dutamovie",
+    "parse_gomov",
+    "parse_google_search",
+    "parse_imdb_title",
+    "parse_kusonime",
+    "parse_lendrive",
+    "parse_listing",
+    "parse_melong",
+    "parse_movieku",
+    "parse_nodrakor",
+    "parse_nunadrama",
+    "parse_pusatfilm",
+    "parse_savefilm21",
+]
+
+_IMDB_LINK = ".ipc-metadata-list-item__list-content-item.ipc-metadata-list-item__list-content-item--link"
+_KUSO_INFO = "#venkonten > div.vezone > div.venser > div.venutama > div.lexot > div.info > p:nth-child({})"
+
+
+def _text(node, default: Any = None, strip: bool = False) -> Any:
+    return default if node is None else node.text(strip)
+
+
+class Field(NamedTuple):
+    """One value of a search result, relative to the result's element.
+
+    ``selector`` None reads the element itself and ``attr`` None its text.
+    Empty values fall back to ``default``; a field left None drops the result.
+    """
+
+    selector: Optional[str] = None
+    attr: Optional[str] = None
+    default: Any = None
+    strip: bool = False
+
+
+def parse_listing(
+    html: bytes, item: str, fields: Dict[str, Field], not_found: Optional[str] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """Search results of a page as dicts with the keys of ``fields``.
+
+    None when the first result contains the site's ``not_found`` text.
+    """
+    nodes = document(html).css(item)
+    if not_found and (not nodes or not_found in nodes[0].text()):
+        return None
+    result = []
+    for node in nodes:
+        row = {}
+        for name, field in fields.items():
+            el = node if field.selector is None else node.css_first(field.selector)
+            if el is None:
+                value = None
+            elif field.attr is None:
+                value = el.text(field.strip)
+            else:
+                value = el.attr(field.attr)
+            if not value:
+                value = field.default
+            if value is None:
+                break
+            row[name] = value
+        else:
+            result.append(row)
+    return result
+
+
+def parse_google_search(html: bytes) -> List[Dict[str, str]]:
+    result = []
+    for item in document(html).css(".tF2Cxc"):
+        link = item.css_first(".yuRUbf a")
+        title = item.css_first(".DKV0Md")
+        if link is None or title is None:
+            continue
+        result.append(
+            {
+                "link": link.attr("href"),
+                "title": title.text(),
+                "snippet": _text(item.css_first(".VwiC3b.yXK7lf.lVm3ye.r025kc.hJNv6b"))
+                or "-",
+            }
+        )
+    return result
+
+
+def parse_imdb_title(html: bytes) -> Dict[str, Any]:
+    """Fields of an IMDb title page used by the IMDb detail callbacks.
+
+    ``ld_json`` is the page's JSON-LD metadata, the rest are scraped from the
+    page itself and are None (or empty lists) when the page doesn't have them.
+    """
+    page = document(html)
+    script = page.css_first('script[type="application/ld+json"]')
+    release = page.css_first(f'li[data-testid="title-details-releasedate"] {_IMDB_LINK}')
+    return {
+        "ld_json": json.loads(script.text()) if script is not None else {},
+        "title": _text(page.css_first("title"), ""),
+        "runtime": _text(
+            page.css_first(
+                'li[data-testid="title-techspec_runtime"] .ipc-metadata-list-item__content-container'
+            )
+        ),
+        "release": None
+        if release is None
+        else {"text": release.text(), "href": release.attr("href")},
+        "origins": [
+            item.text()
+            for item in page.css(f'li[data-testid="title-details-origin"] {_IMDB_LINK}')
+        ],
+        "languages": [
+            item.text()
+            for item in page.css(
+                f'li[data-testid="title-details-languages"] {_IMDB_LINK}'
+            )
+        ],
+        "awards": _text(
+            page.css_first(
+                'li[data-testid="award_information"] .ipc-metadata-list-item__list-content-item'
+            )
+        ),
+    }
+
+
+def _kuso_info(page, child: int) -> str:
+    node = page.css_first(_KUSO_INFO.format(child))
+    if node is None:
+        raise ValueError(f"No info line {child}")
+    return node.text().split(":").pop().strip()
+
+
+def _kuso_links(block, title: str) -> Dict[str, Any]:
+    links = []
+    for quality in block.css("div.smokeurl") + block.css("div.smokeurlrh"):
+        links.append(
+            {
+                "quality": _text(quality.css_first("strong")),
+                "link_download": [
+                    {"client": a.text(), "url": a.attr("href")} for a in quality.css("a")
+                ],
+            }
+        )
+    return {"name": title, "links": links}
+
+
+def parse_kusonime(html: bytes) -> Dict[str, Any]:
+    """Info and download links of a Kusonime post for the telegraph template.
+
+    Raises when the page has no thumbnail or download box. Missing info
+    lines give the placeholders the template always showed for them.
+    """
+    page = document(html)
+    thumb = page.css_first("div.post-thumb img").attr("src")
+    try:
+        title = page.css_first("h1.jdlz").text()
+        season, tipe, status_anime, ep, score, duration, rilis = (
+            _kuso_info(page, child) for child in (3, 5, 6, 7, 8, 9, 10)
+        )
+    except (AttributeError, ValueError):
+        title, season, tipe, status_anime, ep, score, duration, rilis = (
+            "None",
+            "None",
+            "None",
+            "None",
+            0,
+            0,
+            0,
+            "None",
+        )
+    genre = []
+    for line in page.css(_KUSO_INFO.format(2)):
+        genre = line.text().split(":").pop().strip().split(", ")
+    box = page.css_first("div.dlbodz")
+    data = [
+        _kuso_links(block, title)
+        for block in box.css("div.smokeddlrh") + box.css("div.smokeddl")
+    ]
+    return {
+        "title": title,
+        "thumb": thumb,
+        "genre": genre,
+        "genre_string": ", ".join(genre),
+        "status_anime": status_anime,
+        "season": season,
+        "tipe": tipe,
+        "ep": ep,
+        "score": score,
+        "duration": duration,
+        "rilis": rilis,
+        "data": data,
+    }
+
+
+# Download links of detail pages, shown by the extract buttons of the
+# scraper results. These walk the page with BeautifulSoup whatever the
+# configured backend, they render raw tags and search by text.
+
+
+def _soup(html: bytes) -> BeautifulSoup:
+    return BeautifulSoup(html, "lxml")
+
+
+def _button_links(soup: BeautifulSoup) -> str:
+    return "".join(
+        f"{i.text}\n{i['href']}\n\n" for i in soup.find_all(class_="button button-shadow")
+    )
+
+
+def parse_savefilm21(html: bytes) -> str:
+    return _button_links(_soup(html))
+
+
+def parse_nunadrama(html: bytes) -> str:
+    download_section = _soup(html).find("div", class_="dzdesu")
+    title = download_section.find("h2").text.strip()
+    links = download_section.find_all("a", href=True)
+    download_links = {a.text.strip(): a["href"] for a in links}
+    res = f"<b>Judul</b>: {title}\n\n<b>Link Download:</b>\n"
+    for label, url in download_links.items():
+        res += f"{label}: <a href='{url}'>{url}</a>\n"
+    return res
+
+
+def parse_pusatfilm(html: bytes) -> str:
+    ddl = _soup(html).find("li", {"pull-right"}).find("a").get("href")
+    return f"<b>Link Download:</b> {ddl}"
+
+
+def parse_dutamovie(html: bytes) -> str:
+    download_section = _soup(html).find("div", id="gmr-id-download")
+    title = download_section.find("h3", class_="title-download").text.strip()
+    links = download_section.find_all("a", href=True)
+    download_links = {a["title"]: a["href"] for a in links}
+    res = f"<b>Judul</b>: {title}\n\n<b>Link Download:</b>\n"
+    for label, url in download_links.items():
+        res += f"{label}: {url}\n\n"
+    return res
+
+
+def parse_nodrakor(html: bytes, series: bool = False) -> str:
+    """Download buttons of a movie, the raw paragraphs of a series post."""
+    soup = _soup(html)
+    if series:
+        result = soup.find("div", {"entry-content entry-content-single"}).find_all("p")
+        return "".join(f"{i}\n" for i in result)
+    return _button_links(soup)
+
+
+def parse_movieku(html: bytes) -> Dict[str, List[str]]:
+    """Links of a Movieku post as ``{section title: ["1080p <a>..</a>, ..", ..]}``."""
+    data = {}
+    valid_resolutions = {"1080p", "720p", "480p", "360p"}
+    current_title = None
+    for element in _soup(html).find_all(["h3", "p"]):
+        if element.name == "h3" and "smokettl" in element.get("class", []):
+            current_title = element.text.strip()
+            data.setdefault(current_title, [])
+        elif element.name == "p" and current_title:
+            strong_tag = element.find("strong")
+            if strong_tag and (resolution := strong_tag.text.strip()) in valid_resolutions:
+                links = ", ".join(
+                    f'<a href="{a["href"]}">{a.text.strip()}</a>' for a in element.find_all("a")
+                )
+                data[current_title].append(f"{resolution} {links}")
+    return data
+
+
+def parse_melong(html: bytes) -> str:
+    rep = ""
+    for ep in _soup(html).find_all(string=re.compile(r"(?i)episode\s+\d+|LINK DOWNLOAD")):
+        hardsub = ep.find_previous("div")
+        softsub = ep.find_next("div")
+        rep += f"{hardsub}\n{softsub}"
+    return rep
+
+
+def parse_gomov(html: bytes) -> str:
+    soup = _soup(html)
+    entry = soup.find(class_="gmr-download-wrap clearfix")
+    hasil = soup.find(class_="title-download").text
+    for i in entry.find(class_="list-inline gmr-download-list clearfix"):
+        title = i.find("a").text
+        ddl = i.find("a")["href"]
+        hasil += f"\n{title}\n{ddl}\n"
+    return hasil
+
+
+def parse_lendrive(html: bytes) -> str:
+    kl = ""
+    for i in _soup(html).find_all("div", class_="soraurlx"):
+        if not i.find("a"):
+            continue
+        kl += f"{i.find('strong')}:\n"
+        kl += "".join(
+            f"[ <a href='{a.get('href')}'>{a.text}</a> ]\n" for a in i.find_all("a")
+        )
+    return kl
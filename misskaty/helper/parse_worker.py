@@ -0,0 +1,32 @@
+"""
+Start of a parse pool worker, run with ``runpy.run_path`` before its first job.
+
+Workers come from a forkserver, so they don't inherit the bot's threads, but
+importing ``misskaty`` there would start the bot clients all over again.
+``misskaty`` and ``misskaty.helper`` are registered as bare packages instead
+and ``misskaty.vars`` gets the parser settings of the bot (``VARS``, set by
+the pool), which is all :mod:`misskaty.helper.page_parsers` needs.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+_HELPER = os.path.dirname(os.path.abspath(__file__))
+
+for _name, _path in (
+    ("misskaty", os.path.dirname(_HELPER)),
+    ("misskaty.helper", _HELPER),
+):
+    if _name not in sys.modules:
+        _package = types.ModuleType(_name)
+        _package.__path__ = [_path]
+        sys.modules[_name] = _package
+
+if "misskaty.vars" not in sys.modules:
+    _vars = types.ModuleType("misskaty.vars")
+    _vars.__dict__.update(globals()["VARS"])
+    sys.modules["misskaty.vars"] = _vars
+
+importlib.import_module("misskaty.helper.page_parsers")
@@ -0,0 +1,214 @@
+"""
+Search sites of the web scraper plugin.
+
+A site is configuration only: where to search, how to pick results out of
+the page and how to print one result. The plugin's shared pipeline does the
+fetching, off-loop parsing, result sharing, pagination and the command and
+page callback handlers for every site in :data:`SITES`.
+"""
+
+import re
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+from .page_parsers import Field
+
+__all__ = ["SITES", "Field", "SiteSpec"]
+
+
+class SiteSpec(NamedTuple):
+    # Key of the shared search results
+    name: str
+    # Site name shown in the result header
+    title: str
+    # Bot commands searching the site, the first one is shown in the header
+    commands: Tuple[str, ...]
+    # URL with a query, formatted with the `web` domain dict and `kueri`
+    search: str
+    # Line of one result: a template formatted with the result's fields, its
+    # number `n` and localized labels `t`, or a callable(n, result, t)
+    line: Union[str, Callable[[int, dict, object], str]]
+    # Pagination callbacks are page_<page>#<number>#<message id>#<user id>
+    page: str
+    # URL without a query, `search` with an empty query if None
+    listing: Optional[str] = None
+    # CSS selector of one result on the page, None for the JSON API
+    item: Optional[str] = None
+    fields: Dict[str, Field] = {}
+    # Text of the first result when the site found nothing
+    not_found: Optional[str] = None
+    # Callback prefix of the result buttons, no buttons if None
+    extract: Optional[str] = None
+    # Results get a button only if this returns True for them
+    extract_if: Optional[Callable[[dict], bool]] = None
+    # Locale key of a note below the results
+    footer: Optional[str] = None
+    per_page: int = 6
+    # "httpx" or "cloudscraper" for sites behind Cloudflare
+    client: str = "httpx"
+
+
+def _ddl_line(n: int, item: dict, t) -> str:
+    line = f"<b>{n}. <a href='{item['link']}'>{item['judul']}</a></b>\n<b>{t['cat_text']}:</b> <code>{item['kategori']}</code>\n"
+    if re.search(r"Complete|Ongoing", item["kategori"]):
+        return f"{line}\n"
+    return f"{line}<b><a href='{item['dl']}'>{t['dl_text']}</a></b>\n\n"
+
+
+_GMR_FIELDS = {
+    "judul": Field(".entry-title a"),
+    "link": Field(".entry-title a", "href"),
+    "genre": Field(".gmr-movie-on", default="N/A"),
+}
+_GMR_LINE = "<b>{n}. <a href='{link}'>{judul}</a></b>\n<b>Genre:</b> <code>{genre}</code>\n\n"
+
+
+def _not_series(item: dict) -> bool:
+    # Series pages list episodes, the extractors only read movie pages
+    return not re.search(r"Series", item["genre"])
+
+
+# Keyword arguments of GMR sites whose extractor can't read series pages
+_MOVIES_ONLY = {"extract_if": _not_series, "footer": "unsupport_dl_btn"}
+
+
+def _gmr(name: str, title: str, page: str, extract: str, **kwargs) -> SiteSpec:
+    """Sites on the GMR WordPress theme, which only differ by domain."""
+    kwargs.setdefault("commands", (name,))
+    kwargs.setdefault("not_found", "Nothing Found")
+    return SiteSpec(
+        name=name,
+        title=title,
+        search=f"{{web[{name}]}}/?s={{kueri}}",
+        line=_GMR_LINE,
+        page=page,
+        item=".entry-header",
+        fields=_GMR_FIELDS,
+        extract=extract,
+        **kwargs,
+    )
+
+
+SITES: Dict[str, SiteSpec] = {
+    spec.name: spec
+    for spec in (
+        SiteSpec(
+            name="terbit21",
+            title="Terbit21",
+            commands=("terbit21",),
+            search="{web[yasirapi]}/terbit21?q={kueri}",
+            listing="{web[yasirapi]}/terbit21",
+            line=_ddl_line,
+            page="terbit21",
+        ),
+        SiteSpec(
+            name="lk21",
+            title="Layarkaca21",
+            commands=("lk21",),
+            search="{web[yasirapi]}/lk21?q={kueri}",
+            listing="{web[yasirapi]}/lk21",
+            line=_ddl_line,
+            page="lk21",
+        ),
+        SiteSpec(
+            name="pahe",
+            title="Pahe",
+            commands=("pahe",),
+            search="{web[yasirapi]}/pahe?q={kueri}&domain={web[pahe]}",
+            listing="{web[yasirapi]}/pahe?domain={web[pahe]}",
+            line="<b>{n}. <a href='{link}'>{judul}</a></b>\n\n",
+            page="pahe",
+        ),
+        SiteSpec(
+            name="kuso",
+            title="Kusonime",
+            commands=("kusonime",),
+            search="{web[kusonime]}/?s={kueri}",
+            line="<b>{n}</b>. {title}\n{link}\n\n",
+            page="kuso",
+            item="h2.episodeye",
+            fields={"title": Field("a"), "link": Field("a", "href")},
+            extract="kusoextract",
+            per_page=10,
+        ),
+        SiteSpec(
+            name="movieku",
+            title="Movieku",
+            commands=("movieku",),
+            search="{web[movieku]}/?s={kueri}",
+            line="<b>{n}. <a href='{link}'>{judul}</a></b>\n<b>{t[quality]}/Status:</b> {type}\n\n",
+            page="movieku",
+            item=".bx",
+            fields={
+                "judul": Field("a", "title"),
+                "link": Field("a", "href"),
+                "type": Field(".overlay", default="~", strip=True),
+            },
+            extract="moviekuextract",
+        ),
+        _gmr("nodrakor", "NoDrakor", "nodrakor", "nodrakorextract"),
+        _gmr(
+            "savefilm21", "Savefilm21", "sf21", "sf21extract", not_found="Tidak Ditemukan"
+        ),
+        _gmr("nunadrama", "NunaDrama", "nuna", "nunaextract", **_MOVIES_ONLY),
+        _gmr("pusatfilm", "PusatFilm21", "pf", "pfextract", **_MOVIES_ONLY),
+        _gmr("dutamovie", "DutaMovie", "duta", "dutaextract", **_MOVIES_ONLY),
+        _gmr(
+            "gomov",
+            "GoMov",
+            "gomov",
+            "gomovextract",
+            commands=("gomov", "klikxxi"),
+            **_MOVIES_ONLY,
+        ),
+        SiteSpec(
+            name="lendrive",
+            title="Lendrive",
+            commands=("lendrive",),
+            search="{web[lendrive]}/?s={kueri}",
+            listing="{web[lendrive]}",
+            line="<b>{n}. <a href='{link}'>{judul}</a></b>\n<b>{t[quality]}:</b> {quality}\n<b>Status:</b> {status}\n\n",
+            page="lendrive",
+            item=".bsx",
+            fields={
+                "judul": Field("a", "title"),
+                "link": Field("a", "href"),
+                "quality": Field(".typez.TV, .typez.BD", default="N/A"),
+                "status": Field(".epx", default="Not Provided by BOT"),
+            },
+            extract="lendriveextract",
+        ),
+        SiteSpec(
+            name="melong",
+            title="Melongmovie",
+            commands=("melongmovie",),
+            search="{web[melongmovie]}/?s={kueri}",
+            line="<b>{n}. <a href='{link}'>{judul}</a></b>\n<b>{t[quality]}:</b> {quality}\n\n",
+            page="melong",
+            item=".box",
+            fields={
+                "judul": Field("a", "title"),
+                "link": Field("a", "href"),
+                "quality": Field("a .quality", default="N/A"),
+            },
+            extract="melongextract",
+        ),
+        SiteSpec(
+            name="samehadaku",
+            title="Samehadaku",
+            commands=("samehadaku",),
+            search="{web[samehadaku]}/?s={kueri}",
+            listing="{web[samehadaku]}",
+            line="<b>{n}. <a href='{url}'>{title}</a></b>\n<b>Status:</b> {sta}\n<b>Rating:</b> {rate}\n\n",
+            page="same",
+            item=".animposx",
+            fields={
+                "url": Field("a", "href"),
+                "title": Field("a", "title"),
+                "sta": Field(".type.TV", default="Ongoing"),
+                "rate": Field(".score", default="-", strip=True),
+            },
+            per_page=10,
+            client="cloudscraper",
+        ),
+    )
+}
@@ -0,0 +1,294 @@
+import asyncio
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .sqlite_helper import Cache
+
+__all__ = ["DetailPages", "SearchResults"]
+
+
+class SearchResults:
+    """Scraper results shared by every user, keyed by (site, normalized query).
+
+    Every fetch is stored under its own version key, and the shared key
+    points at the latest version. A message stores ``[version key, query]``,
+    so the pagination of everyone who searched the same thing reads one
+    cached list, and a later fetch of the search doesn't change what the
+    buttons of older messages resolve to. Identical searches started while
+    one is being fetched wait for that fetch instead of running their own.
+    """
+
+    JOIN_TIMEOUT = 60
+
+    def __init__(
+        self,
+        cache: Cache,
+        ttl: Optional[Dict[str, int]] = None,
+        default_ttl: int = 1800,
+        listing_ttl: int = 600,
+        state_ttl: int = 1800,
+    ):
+        """
+        :param cache: Where shared results and message pointers are stored.
+        :param ttl: Seconds a site's search results stay shared, by site name.
+        :param default_ttl: TTL of sites not in `ttl`.
+        :param listing_ttl: TTL of searches without a query (latest uploads).
+        :param state_ttl: How long a message can be paginated.
+        """
+        self.cache = cache
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.listing_ttl = listing_ttl
+        self.state_ttl = state_ttl
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # message id -> shared key that message is fetching
+        self._leaders: Dict[int, str] = {}
+        self._stats = {"searches": 0, "shared_hits": 0, "joined": 0, "fetches": 0}
+
+    @staticmethod
+    def normalize(kueri: Optional[str]) -> str:
+        return " ".join(kueri.casefold().split()) if kueri else ""
+
+    def key(self, site: str, kueri: Optional[str]) -> str:
+        return f"q:{site}:{self.normalize(kueri)}"
+
+    @staticmethod
+    def _state_key(msg_id: int) -> str:
+        return f"m:{msg_id}"
+
+    def _ttl(self, site: str, kueri: Optional[str]) -> int:
+        return self.ttl.get(site, self.default_ttl) if kueri else self.listing_ttl
+
+    def _keep(self, ttl: int) -> int:
+        # A version outlives both its shared pointer and the messages bound to it
+        return max(ttl, self.state_ttl)
+
+    async def _latest(self, key: str) -> Optional[List[Any]]:
+        """``[version key, fetched at, pages]`` of the version `key` points at."""
+        pointer = await self.cache.aget(key)
+        if not pointer:
+            return None
+        pages = await self.cache.aget(pointer[0])
+        return None if pages is None else [*pointer, pages]
+
+    async def get(self, msg_id: int) -> Optional[List[Any]]:
+        """Pagination state of a message as ``[pages, query]``, or None if expired."""
+        state = await self.cache.aget(self._state_key(msg_id))
+        if not state:
+            return None
+        pages = await self.cache.aget(state[0])
+        return None if pages is None else [pages, state[1]]
+
+    async def getitem(self, msg_id: int) -> List[Any]:
+        """Like :meth:`get`, but raises KeyError when the state expired."""
+        if (scraped := await self.get(msg_id)) is None:
+            raise KeyError(msg_id)
+        return scraped
+
+    async def join(self, msg_id: int, site: str, kueri: Optional[str]) -> Optional[List[Any]]:
+        """Return ``[pages, query]`` for the message from its own state, the shared
+        results or an identical search in flight.
+
+        None means the caller has to fetch the site and hand the result to
+        :meth:`publish`. Wrap the caller with :meth:`single_flight` so a failed
+        fetch lets waiting searches go on.
+        """
+        if scraped := await self.get(msg_id):
+            return scraped
+        key = self.key(site, kueri)
+        self._stats["searches"] += 1
+        joined = False
+        while True:
+            if (latest := await self._latest(key)) is not None:
+                self._stats["shared_hits"] += 1
+                version, _, pages = latest
+                # Keep the version for as long as this message can be paginated
+                await self.cache.atouch(version, self._keep(self._ttl(site, kueri)))
+                return await self._bind(msg_id, version, pages, kueri)
+            future = self._inflight.get(key)
+            if future is None:
+                self._inflight[key] = asyncio.get_running_loop().create_future()
+                self._leaders[msg_id] = key
+                self._stats["fetches"] += 1
+                return None
+            if not joined:
+                joined = True
+                self._stats["joined"] += 1
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self.JOIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                # The fetch in flight hangs, don't queue behind it any longer
+                self._stats["fetches"] += 1
+                return None
+
+    async def publish(
+        self, msg_id: int, site: str, kueri: Optional[str], pages: List[Any]
+    ) -> List[Any]:
+        """Share fetched pages, wake up identical searches and return ``[pages, query]``."""
+        key = self.key(site, kueri)
+        version = await self._store(key, pages, self._ttl(site, kueri))
+        self._finish(msg_id, key)
+        return await self._bind(msg_id, version, pages, kueri)
+
+    async def peek(self, site: str, kueri: Optional[str]) -> Optional[List[Any]]:
+        """Shared pages of a search, without binding them to a message."""
+        latest = await self._latest(self.key(site, kueri))
+        return None if latest is None else latest[2]
+
+    async def share(self, site: str, kueri: Optional[str], pages: List[Any]) -> List[Any]:
+        """Share pages fetched outside of :meth:`join`, e.g. by a meta search."""
+        await self._store(self.key(site, kueri), pages, self._ttl(site, kueri))
+        return pages
+
+    async def refreshed(self, site: str, kueri: Optional[str]) -> Optional[float]:
+        """Unix time the shared pages of a search were fetched, None if there are none."""
+        pointer = await self.cache.aget(self.key(site, kueri))
+        return pointer[1] if pointer else None
+
+    async def _store(self, key: str, pages: List[Any], ttl: int) -> str:
+        """Store `pages` as a new version and point `key` at it for `ttl` seconds."""
+        fetched = time.time()
+        version = f"{key}@{fetched:.6f}"
+        await self.cache.aset(version, pages, timeout=self._keep(ttl))
+        await self.cache.aset(key, [version, fetched], timeout=ttl)
+        return version
+
+    async def _bind(self, msg_id: int, version: str, pages: List[Any], kueri) -> List[Any]:
+        await self.cache.aset(self._state_key(msg_id), [version, kueri], timeout=self.state_ttl)
+        return [pages, kueri]
+
+    def _finish(self, msg_id: int, key: str):
+        self._leaders.pop(msg_id, None)
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def release(self, msg_id: int):
+        """Give up a fetch claimed by the message, if it never published."""
+        if (key := self._leaders.pop(msg_id, None)) is not None:
+            self._finish(msg_id, key)
+
+    def single_flight(self, func):
+        """Release the fetch claim of ``func(msg, ...)`` however it returns."""
+
+        @wraps(func)
+        async def wrapper(msg, *args, **kwargs):
+            try:
+                return await func(msg, *args, **kwargs)
+            finally:
+                self.release(msg.id)
+
+        return wrapper
+
+    def stats(self) -> Dict[str, Any]:
+        searches = self._stats["searches"]
+        return {
+            **self._stats,
+            "inflight": len(self._inflight),
+            "hit_ratio": round(self._stats["shared_hits"] / searches, 4)
+            if searches
+            else 0.0,
+        }
+
+
+class DetailPages:
+    """What an extract button pulled out of a detail page, shared by every user.
+
+    Keyed by (extractor, canonical URL). A result is fresh for the
+    extractor's TTL; after that it is still answered right away for
+    `stale_ttl` seconds while one background fetch refreshes it. Presses on
+    a URL that is being fetched wait for that fetch instead of running their
+    own. Failed fetches are not cached.
+    """
+
+    def __init__(
+        self,
+        cache: Cache,
+        ttl: Optional[Dict[str, int]] = None,
+        default_ttl: int = 1800,
+        stale_ttl: int = 12 * 3600,
+    ):
+        """
+        :param cache: Where extracted results are stored.
+        :param ttl: Seconds a result is fresh, by extractor name.
+        :param default_ttl: TTL of extractors not in `ttl`.
+        :param stale_ttl: How long after that a stale result is still answered.
+        """
+        self.cache = cache
+        self.ttl = ttl or {}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "joined": 0, "errors": 0}
+
+    @staticmethod
+    def canonical(url: str) -> str:
+        """`url` without fragment, tracking parameters and trailing slash."""
+        parts = urlsplit(url.strip())
+        query = sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if not k.startswith("utm_")
+        )
+        return urlunsplit(
+            (
+                parts.scheme.lower(),
+                parts.netloc.lower(),
+                parts.path.rstrip("/") or "/",
+                urlencode(query),
+                "",
+            )
+        )
+
+    def key(self, name: str, url: str) -> str:
+        return f"d:{name}:{self.canonical(url)}"
+
+    async def get(self, name: str, url: str, extract: Callable[[str], Awaitable[Any]]) -> Any:
+        """Result of ``await extract(url)``, from cache when there is one."""
+        key = self.key(name, url)
+        entry = await self.cache.aget(key)
+        if entry is not None:
+            value, fetched = entry
+            if time.time() - fetched < self.ttl.get(name, self.default_ttl):
+                self._stats["hits"] += 1
+            else:
+                self._stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._start(key, name, url, extract)
+            return value
+        if (task := self._inflight.get(key)) is None:
+            self._stats["misses"] += 1
+            task = self._start(key, name, url, extract)
+        else:
+            self._stats["joined"] += 1
+        # A press that gives up must not cancel the fetch others wait for
+        return await asyncio.shield(task)
+
+    def _start(self, key: str, name: str, url: str, extract) -> asyncio.Task:
+        task = self._inflight[key] = asyncio.create_task(self._fetch(key, name, url, extract))
+        task.add_done_callback(lambda done: self._done(key, done))
+        return task
+
+    async def _fetch(self, key: str, name: str, url: str, extract) -> Any:
+        value = await extract(url)
+        ttl = self.ttl.get(name, self.default_ttl)
+        await self.cache.aset(key, [value, time.time()], timeout=ttl + self.stale_ttl)
+        return value
+
+    def _done(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        # Also marks the exception of background refreshes as retrieved
+        if not task.cancelled() and task.exception() is not None:
+            self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self._stats[k] for k in ("hits", "stale_hits", "misses", "joined"))
+        return {
+            **self._stats,
+            "inflight": len(self._inflight),
+            "hit_ratio": round((self._stats["hits"] + self._stats["stale_hits"]) / lookups, 4)
+            if lookups
+            else 0.0,
+        }
@@ -1,77 +1,195 @@
+import asyncio
 import os
 import pickle
+import queue
 import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import datetime, timedelta, timezone
-from functools import wraps
+from functools import partial, wraps
 from pathlib import Path
-from threading import local
+from logging import getLogger
+from threading import Lock, Thread, local
+from time import perf_counter, sleep, time
+from weakref import WeakSet
+
+from .cache_codecs import COMPRESSOR_IDS, Compressor, get_codec, get_compressor
 from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
 
 __all__ = ["Cache"]
 
+LOGGER = getLogger("MissKaty")
+
+_MISSING = object()
+
+
+class _L1:
+    """In-process LRU of decoded values in front of SQLite, bounded by entries and
+    by the encoded size of the values. Entries keep the expiry of their row."""
+
+    def __init__(self, max_entries: int = 0, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Any:
+        if not self.max_entries:
+            return _MISSING
+        key = str(key)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] != -1.0 and time() >= entry[1]:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, exp: float, size: int) -> None:
+        if not self.max_entries:
+            return
+        key = str(key)
+        with self._lock:
+            self._remove(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (value, exp, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self.bytes -= self._data.popitem(last=False)[1][2]
+
+    def discard(self, *keys: str) -> None:
+        if not self._data:
+            return
+        with self._lock:
+            for key in keys:
+                self._remove(str(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
 
 class Cache:
     """Simple SQLite Cache."""
 
-    PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
     DEFAULT_TIMEOUT = 300
     DEFAULT_PRAGMA = {
         "mmap_size": 2**26,  # https://www.sqlite.org/pragma.html#pragma_mmap_size
         "cache_size": 8192,  # https://www.sqlite.org/pragma.html#pragma_cache_size
         "wal_autocheckpoint": 1000,  # https://www.sqlite.org/pragma.html#pragma_wal_autocheckpoint
-        "auto_vacuum": "none",  # https://www.sqlite.org/pragma.html#pragma_auto_vacuum
+        "auto_vacuum": "incremental",  # https://www.sqlite.org/pragma.html#pragma_auto_vacuum
         "synchronous": "off",  # https://www.sqlite.org/pragma.html#pragma_synchronous
         "journal_mode": "wal",  # https://www.sqlite.org/pragma.html#pragma_journal_mode
         "temp_store": "file",  # https://www.sqlite.org/pragma.html#pragma_temp_store
     }
 
+    SWEEP_BATCH = 500
+    _instances: "WeakSet[Cache]" = WeakSet()
+    VACUUM_PAGES = 1000
+
     _transaction_sql = "BEGIN EXCLUSIVE TRANSACTION; {} COMMIT TRANSACTION;"
 
-    _create_sql = "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, exp FLOAT);"
+    # Current unix time as a number, so `exp` comparisons can use cache_exp
+    _now = "((julianday('now') - 2440587.5) * 86400.0)"
+
+    _create_sql = (
+        "CREATE TABLE IF NOT EXISTS cache "
+        "(key TEXT PRIMARY KEY, value BLOB, exp FLOAT, atime FLOAT, size INTEGER);"
+    )
     _create_index_sql = "CREATE UNIQUE INDEX IF NOT EXISTS cache_key ON cache(key);"
+    _create_exp_index_sql = "CREATE INDEX IF NOT EXISTS cache_exp ON cache(exp);"
+    _create_atime_index_sql = "CREATE INDEX IF NOT EXISTS cache_atime ON cache(atime);"
     _set_pragma = "PRAGMA {};"
     _set_pragma_equal = "PRAGMA {}={};"
 
     _add_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES (:key, :value, :exp) "
-        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "INSERT INTO cache (key, value, exp, atime, size) "
+        f"VALUES (:key, :value, :exp, {_now}, length(:value)) "
+        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp, "
+        "atime = excluded.atime, size = excluded.size "
+        f"WHERE (exp <> -1.0 AND exp <= {_now});"
     )
     _get_sql = "SELECT value, exp FROM cache WHERE key = :key;"
     _set_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES (:key, :value, :exp) "
-        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp;"
+        "INSERT INTO cache (key, value, exp, atime, size) "
+        f"VALUES (:key, :value, :exp, {_now}, length(:value)) "
+        "ON CONFLICT(key) DO UPDATE SET value = :value, exp = :exp, "
+        "atime = excluded.atime, size = excluded.size;"
     )
     _check_sql = (
         "SELECT value, exp FROM cache WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        f"AND (exp = -1.0 OR exp > {_now});"
     )
     _update_sql = (
-        "UPDATE cache SET value = :value WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        f"UPDATE cache SET value = :value, atime = {_now}, size = length(:value) "
+        f"WHERE key = :key AND (exp = -1.0 OR exp > {_now});"
     )
 
     # TODO: add 'RETURNING COUNT(*)!=0' to these when sqlite3 version >=3.35.0
     _delete_sql = "DELETE FROM cache WHERE key = :key;"
     _touch_sql = (
         "UPDATE cache SET exp = :exp WHERE key = :key "
-        "AND (exp = -1.0 OR DATETIME(exp, 'unixepoch') > DATETIME('now'));"
+        f"AND (exp = -1.0 OR exp > {_now});"
     )
     _clear_sql = "DELETE FROM cache;"
 
+    _many_values = "(:key{n}, :value{n}, :exp{n}, " + _now + ", length(:value{n}))"
     _add_many_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES {}"
-        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp "
-        "WHERE (exp <> -1.0 AND DATETIME(exp, 'unixepoch') <= DATETIME('now'));"
+        "INSERT INTO cache (key, value, exp, atime, size) VALUES {}"
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp, "
+        "atime = excluded.atime, size = excluded.size "
+        f"WHERE (exp <> -1.0 AND exp <= {_now});"
     )
     _get_many_sql = "SELECT key, value, exp FROM cache WHERE key IN ({});"
     _set_many_sql = (
-        "INSERT INTO cache (key, value, exp) VALUES {}"
-        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp;"
+        "INSERT INTO cache (key, value, exp, atime, size) VALUES {}"
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value, exp = excluded.exp, "
+        "atime = excluded.atime, size = excluded.size;"
     )
     _delete_many_sql = "DELETE FROM cache WHERE key IN ({});"
 
+    # Maintenance
+    _sweep_sql = (
+        "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache "
+        f"WHERE exp BETWEEN 0 AND {_now} LIMIT :limit);"
+    )
+    _atime_sql = "UPDATE cache SET atime = :atime WHERE key = :key;"
+    _oldest_sql = "SELECT key, size FROM cache ORDER BY atime LIMIT :limit;"
+    _usage_sql = "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache;"
+    # Rows written by another codec can't be decoded, pickle also keeps the
+    # headerless rows from before codecs existed
+    _purge_codec_sql = (
+        "DELETE FROM cache WHERE substr(value, 1, 1) <> :id "
+        "AND NOT (:legacy AND substr(value, 1, 1) = X'80');"
+    )
+
     def __init__(
         self,
         *,
@@ -79,6 +197,14 @@ class Cache:
         path: str = None,
         in_memory: bool = True,
         timeout: int = 5,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[int] = 60,
+        l1_entries: int = 0,
+        l1_bytes: Optional[int] = None,
+        codec: str = "pickle",
+        compression: Optional[str] = None,
+        compress_min_bytes: int = 1024,
         isolation_level: Optional[
             Literal["DEFERRED", "IMMEDIATE", "EXCLUSIVE"]
         ] = "DEFERRED",
@@ -90,6 +216,18 @@ class Cache:
         :param path: Path string to the wanted db location. If None, use current directory.
         :param in_memory: Create database in-memory only. A file is still created, but nothing is stored in it.
         :param timeout: Cache connection timeout.
+        :param max_entries: Evict least recently used keys above this many rows.
+        :param max_bytes: Evict least recently used keys above this many bytes of values.
+        :param sweep_interval: Seconds between background sweeps of expired rows,
+                               LRU eviction and incremental vacuum. None disables it.
+        :param l1_entries: Keep up to this many decoded values in an in-process LRU in
+                           front of SQLite. Values are shared, not copied, so don't
+                           mutate what the cache returns. 0 disables it.
+        :param l1_bytes: Optional bound of the in-process LRU by encoded value size.
+        :param codec: Value serializer: pickle, json, orjson or msgpack.
+                      Rows stored with another codec are dropped on open.
+        :param compression: Compress values with zlib, zstd or lz4. None disables it.
+        :param compress_min_bytes: Only compress encoded values at least this large.
         :param isolation_level: Controls the transaction handling performed by sqlite3.
                                 If set to None, transactions are never implicitly opened.
                                 https://www.sqlite.org/lang_transaction.html
@@ -102,14 +240,48 @@ class Cache:
         self.pragma = {**kwargs, **self.DEFAULT_PRAGMA}
         self.timeout = timeout
         self.path = path
+        self.filename = filename
+        self.in_memory = in_memory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
         self.isolation_level = isolation_level
         self.local = local()
         self.local.instances = getattr(self.local, "instances", 0) + 1
+        # key -> last read time, flushed to the atime column by the sweeper
+        self._accessed: Dict[str, float] = {}
+        self._counters = {"expired": 0, "evictions": 0, "sweeps": 0}
+        self._l1 = _L1(l1_entries, l1_bytes)
+        self._codec = get_codec(codec)
+        self._compressor = get_compressor(compression) if compression else None
+        self._decompressors: Dict[bytes, Compressor] = {}
+        self.compress_min_bytes = compress_min_bytes
+        self._codec_lock = Lock()
+        self._codec_stats = {
+            "encoded": 0,
+            "decoded": 0,
+            "compressed": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+            "encode_seconds": 0.0,
+            "decode_seconds": 0.0,
+        }
 
         self._con.execute(self._create_sql)
+        self._upgrade_schema()
+        self._con.execute(
+            self._purge_codec_sql,
+            {"id": self._codec.id, "legacy": self._codec.name == "pickle"},
+        )
         self._con.execute(self._create_index_sql)
+        self._con.execute(self._create_exp_index_sql)
+        self._con.execute(self._create_atime_index_sql)
         self._con.commit()
 
+        Cache._instances.add(self)
+        if sweep_interval:
+            Thread(target=self._sweeper, name="cache-sweep", daemon=True).start()
+
     @property
     def _con(self) -> sqlite3.Connection:
         if not os.path.exists(self.path):
@@ -165,6 +337,21 @@ class Cache:
         for key, value in self.pragma.items():
             self._con.execute(self._set_pragma_equal.format(key, value))
 
+    def _upgrade_schema(self) -> None:
+        """Add the atime/size columns to cache files created before they existed."""
+        columns = {row[1] for row in self._con.execute("PRAGMA table_info(cache);")}
+        if "atime" in columns:
+            return
+        self._con.execute("ALTER TABLE cache ADD COLUMN atime FLOAT;")
+        self._con.execute("ALTER TABLE cache ADD COLUMN size INTEGER;")
+        self._con.execute(
+            f"UPDATE cache SET atime = {self._now}, size = length(value);"
+        )
+        self._con.commit()
+        if not self.in_memory:
+            # auto_vacuum only switches to incremental after a full VACUUM
+            self._con.execute("VACUUM;")
+
     @staticmethod
     def _exp_timestamp(timeout: int = DEFAULT_TIMEOUT) -> float:
         if timeout < 0:
@@ -176,10 +363,45 @@ class Cache:
         return None if exp == -1.0 else datetime.utcfromtimestamp(exp)
 
     def _stream(self, value: Any) -> bytes:
-        return pickle.dumps(value, protocol=self.PICKLE_PROTOCOL)
+        start = perf_counter()
+        data = self._codec.dumps(value)
+        raw = len(data)
+        compression = b"-"
+        if self._compressor is not None and raw >= self.compress_min_bytes:
+            packed = self._compressor.compress(data)
+            if len(packed) < raw:
+                data, compression = packed, self._compressor.id
+        blob = self._codec.id + compression + data
+        with self._codec_lock:
+            stats = self._codec_stats
+            stats["encoded"] += 1
+            stats["compressed"] += compression != b"-"
+            stats["raw_bytes"] += raw
+            stats["stored_bytes"] += len(blob)
+            stats["encode_seconds"] += perf_counter() - start
+        return blob
 
     def _unstream(self, value: bytes) -> Any:
-        return pickle.loads(value)  # noqa: S301
+        start = perf_counter()
+        if value[:1] == b"\x80":
+            # Headerless pickle from before codecs, only kept by pickle caches
+            result = pickle.loads(value)  # noqa: S301
+        else:
+            data = value[2:]
+            if (compression := value[1:2]) != b"-":
+                data = self._decompressor(compression).decompress(data)
+            result = self._codec.loads(data)
+        with self._codec_lock:
+            self._codec_stats["decoded"] += 1
+            self._codec_stats["decode_seconds"] += perf_counter() - start
+        return result
+
+    def _decompressor(self, compression: bytes) -> Compressor:
+        if (compressor := self._decompressors.get(compression)) is None:
+            compressor = self._decompressors[compression] = get_compressor(
+                COMPRESSOR_IDS[compression]
+            )
+        return compressor
 
     def add(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Set the value to the cache only if the key is not already in the cache,
@@ -197,6 +419,7 @@ class Cache:
         }
         self._con.execute(self._add_sql, data)
         self._con.commit()
+        self._l1.discard(key)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get the value under some key. Return `default` if key not in the cache or expired.
@@ -204,6 +427,10 @@ class Cache:
         :param key: Cache key.
         :param default: Value to return if key not in the cache.
         """
+        if (value := self._l1.get(key)) is not _MISSING:
+            self._accessed[key] = time()
+            return value
+
         result: Optional[Tuple[bytes, float]] = self._con.execute(
             self._get_sql, {"key": key}
         ).fetchone()
@@ -217,7 +444,10 @@ class Cache:
             self._con.commit()
             return default
 
-        return self._unstream(result[0])
+        self._accessed[key] = time()
+        value = self._unstream(result[0])
+        self._l1.put(key, value, result[1], len(result[0]))
+        return value
 
     def set(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Set a value in cache under some key.
@@ -234,6 +464,7 @@ class Cache:
         }
         self._con.execute(self._set_sql, data)
         self._con.commit()
+        self._l1.put(key, value, data["exp"], len(data["value"]))
 
     def update(self, key: str, value: Any) -> None:
         """Update value in the cache. Does nothing if key not in the cache or expired.
@@ -244,6 +475,7 @@ class Cache:
         data = {"key": key, "value": self._stream(value)}
         self._con.execute(self._update_sql, data)
         self._con.commit()
+        self._l1.discard(key)
 
     def touch(self, key: str, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Extend the lifetime of an object in cache. Does nothing if key is not in the cache or is expired.
@@ -255,6 +487,7 @@ class Cache:
         data = {"exp": self._exp_timestamp(timeout), "key": key}
         self._con.execute(self._touch_sql, data)
         self._con.commit()
+        self._l1.discard(key)
 
     def delete(self, key: str) -> None:
         """Remove the value under the given key from the cache. Does nothing if key is not in the cache.
@@ -263,6 +496,7 @@ class Cache:
         """
         self._con.execute(self._delete_sql, {"key": key})
         self._con.commit()
+        self._l1.discard(key)
 
     def add_many(self, dict_: Dict[str, Any], timeout: int = DEFAULT_TIMEOUT) -> None:
         """For all keys in the given dict, add the value to the cache only if the key is not
@@ -273,7 +507,7 @@ class Cache:
                         Negative numbers will keep the key in cache until manually removed.
         """
         command = self._add_many_sql.format(
-            ", ".join([f"(:key{n}, :value{n}, :exp{n})" for n in range(len(dict_))])
+            ", ".join([self._many_values.format(n=n) for n in range(len(dict_))])
         )
 
         data = {}
@@ -285,29 +519,36 @@ class Cache:
 
         self._con.execute(command, data)
         self._con.commit()
+        self._l1.discard(*dict_)
 
     def get_many(self, keys: List[str]) -> Dict[str, Any]:
         """Get all values that exist and aren't expired from the given cache keys, and return a dict.
 
         :param keys: List of cache keys.
         """
+        results: Dict[str, Any] = self._l1_many(keys)
+        keys = [key for key in keys if str(key) not in results]
+        if not keys:
+            return results
+
         seq = ", ".join([f"'{value}'" for value in keys])
         fetched: List[Tuple[str, Any, float]] = self._con.execute(
             self._get_many_sql.format(seq)
         ).fetchall()
 
         if not fetched:
-            return {}
+            return results
 
-        results: Dict[str, Any] = {}
         to_delete: List[str] = []
-        for key, value, exp in fetched:
-            exp = self._exp_datetime(exp)
+        for key, value, exp_ts in fetched:
+            exp = self._exp_datetime(exp_ts)
             if exp is not None and datetime.utcnow() >= exp:
                 to_delete.append(key)
                 continue
 
             results[key] = self._unstream(value)
+            self._accessed[key] = time()
+            self._l1.put(key, results[key], exp_ts, len(value))
 
         if to_delete:
             self._con.execute(
@@ -327,7 +568,7 @@ class Cache:
                         Negative numbers will keep the key in cache until manually removed.
         """
         command = self._set_many_sql.format(
-            ", ".join([f"(:key{n}, :value{n}, :exp{n})" for n in range(len(dict_))])
+            ", ".join([self._many_values.format(n=n) for n in range(len(dict_))])
         )
 
         data = {}
@@ -339,6 +580,8 @@ class Cache:
 
         self._con.execute(command, data)
         self._con.commit()
+        for i, (key, value) in enumerate(dict_.items()):
+            self._l1.put(key, value, exp, len(data[f"value{i}"]))
 
     def update_many(self, dict_: Dict[str, Any]) -> None:
         """Update values to the cache for all keys in the given dict. Does nothing if key not in cache or expired.
@@ -350,6 +593,7 @@ class Cache:
         ]
         self._con.executemany(self._update_sql, seq)
         self._con.commit()
+        self._l1.discard(*dict_)
 
     def touch_many(self, keys: List[str], timeout: int = DEFAULT_TIMEOUT) -> None:
         """Extend the lifetime for all objects under the given keys in cache.
@@ -363,6 +607,7 @@ class Cache:
         seq = [{"key": key, "exp": exp} for key in keys]
         self._con.executemany(self._touch_sql, seq)
         self._con.commit()
+        self._l1.discard(*keys)
 
     def delete_many(self, keys: List[str]) -> None:
         """Remove all the values under the given keys from the cache.
@@ -373,6 +618,7 @@ class Cache:
             self._delete_many_sql.format(", ".join([f"'{value}'" for value in keys]))
         )
         self._con.commit()
+        self._l1.discard(*keys)
 
     def get_or_set(self, key: str, default: Any, timeout: int = DEFAULT_TIMEOUT) -> Any:
         """Get a value under some key, or set the default if key is not in cache.
@@ -400,6 +646,7 @@ class Cache:
         }
         self._con.execute(self._set_sql, data)
         self._con.commit()
+        self._l1.put(key, default, data["exp"], len(data["value"]))
         return default
 
     def get_all(self) -> Dict[str, Any]:
@@ -411,6 +658,7 @@ class Cache:
         """Clear the cache from all values."""
         self._con.execute(self._clear_sql)
         self._con.commit()
+        self._l1.clear()
 
     def incr(self, key: str, delta: int = 1) -> int:
         """Increment the value in cache by the given delta.
@@ -436,6 +684,7 @@ class Cache:
             self._update_sql, {"key": key, "value": self._stream(new_value)}
         )
         self._con.commit()
+        self._l1.discard(key)
         return new_value
 
     def decr(self, key: str, delta: int = 1) -> int:
@@ -462,6 +711,7 @@ class Cache:
             self._update_sql, {"key": key, "value": self._stream(new_value)}
         )
         self._con.commit()
+        self._l1.discard(key)
         return new_value
 
     def memoize(
@@ -558,3 +808,353 @@ class Cache:
             self._con.commit()
 
         return results
+
+    # ---------------------------------------------------------------- async API
+    # Writes are queued to one writer thread that applies everything pending in
+    # a single transaction (group commit). Reads run on a small dedicated pool,
+    # each thread with its own connection (WAL allows them next to the writer).
+    # Shared in-memory databases lock per table instead, so there reads are
+    # queued to the writer too.
+
+    READ_WORKERS = 4
+    WRITE_BATCH = 256
+
+    def _ensure_async(self) -> None:
+        if getattr(self, "_write_queue", None) is not None:
+            return
+        self._write_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._read_pool = ThreadPoolExecutor(
+            max_workers=self.READ_WORKERS, thread_name_prefix="cache-read"
+        )
+        Thread(target=self._writer, name="cache-write", daemon=True).start()
+
+    def _writer(self) -> None:
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.WRITE_BATCH:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            results = []
+            for op, future in batch:
+                try:
+                    results.append((future, op(self._con), None))
+                except Exception as exc:  # noqa: BLE001
+                    results.append((future, None, exc))
+            try:
+                self._con.commit()
+            except sqlite3.Error as exc:
+                results = [(future, None, exc) for future, _, _ in results]
+            for future, result, exc in results:
+                if future is None:
+                    if exc is not None:
+                        LOGGER.warning(f"Cache maintenance failed: {exc}")
+                    continue
+                loop = future.get_loop()
+                if loop.is_closed():
+                    continue
+                try:
+                    loop.call_soon_threadsafe(_set_future, future, result, exc)
+                except RuntimeError:
+                    # The loop closed meanwhile, nobody waits for the write
+                    continue
+
+    async def _write(self, op: Callable[[sqlite3.Connection], Any]) -> Any:
+        self._ensure_async()
+        future = asyncio.get_running_loop().create_future()
+        self._write_queue.put((op, future))
+        return await future
+
+    async def _read(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        if self.in_memory:
+            return await self._write(lambda _: func(*args, **kwargs))
+        self._ensure_async()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._read_pool, partial(func, *args, **kwargs)
+        )
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """Async :meth:`get`. Expired keys return `default` and are removed by the writer.
+
+        :param key: Cache key.
+        :param default: Value to return if key not in the cache.
+        """
+        if (value := self._l1.get(key)) is not _MISSING:
+            self._accessed[key] = time()
+            return value
+        result = await self._read(self._fetch, key)
+        if result is None:
+            return default
+        exp = self._exp_datetime(result[1])
+        if exp is not None and datetime.utcnow() >= exp:
+            await self.adelete(key)
+            return default
+        self._accessed[key] = time()
+        return result[0]
+
+    async def agetitem(self, key: str) -> Any:
+        """Async ``cache[key]``.
+
+        :param key: Cache key.
+        :raises KeyError: Key not in cache or expired.
+        """
+        value = await self.aget(key)
+        if value is None:
+            raise KeyError("Key not in cache.")
+        return value
+
+    async def acontains(self, key: str) -> bool:
+        """Async ``key in cache``."""
+        return await self._read(self.__contains__, key)
+
+    async def aget_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Async :meth:`get_many`.
+
+        :param keys: List of cache keys.
+        """
+        results = self._l1_many(keys)
+        if missing := [key for key in keys if str(key) not in results]:
+            results.update(await self._read(self._fetch_many, missing))
+        return results
+
+    async def aset(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
+        """Async :meth:`set`.
+
+        :param key: Cache key.
+        :param value: Picklable object to store.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        exp = self._exp_timestamp(timeout)
+        await self._write(lambda con: self._set_row(con, key, value, exp))
+
+    async def aadd(self, key: str, value: Any, timeout: int = DEFAULT_TIMEOUT) -> None:
+        """Async :meth:`add`.
+
+        :param key: Cache key.
+        :param value: Picklable object to store.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        exp = self._exp_timestamp(timeout)
+        await self._write(
+            lambda con: con.execute(
+                self._add_sql, {"key": key, "value": self._stream(value), "exp": exp}
+            )
+        )
+        self._l1.discard(key)
+
+    async def aset_many(
+        self, dict_: Dict[str, Any], timeout: int = DEFAULT_TIMEOUT
+    ) -> None:
+        """Async :meth:`set_many`.
+
+        :param dict_: Cache keys with values to set.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        exp = self._exp_timestamp(timeout)
+        await self._write(
+            lambda con: [
+                self._set_row(con, key, value, exp) for key, value in dict_.items()
+            ]
+        )
+
+    async def atouch(self, key: str, timeout: int = DEFAULT_TIMEOUT) -> None:
+        """Async :meth:`touch`.
+
+        :param key: Cache key.
+        :param timeout: How long the value is valid in the cache.
+                        Negative numbers will keep the key in cache until manually removed.
+        """
+        data = {"exp": self._exp_timestamp(timeout), "key": key}
+        await self._write(lambda con: con.execute(self._touch_sql, data))
+        self._l1.discard(key)
+
+    async def adelete(self, key: str) -> None:
+        """Async :meth:`delete`.
+
+        :param key: Cache key.
+        """
+        await self._write(lambda con: con.execute(self._delete_sql, {"key": key}))
+        self._l1.discard(key)
+
+    async def adelete_many(self, keys: List[str]) -> None:
+        """Async :meth:`delete_many`.
+
+        :param keys: List of cache keys.
+        """
+        await self._write(
+            lambda con: con.executemany(self._delete_sql, [{"key": key} for key in keys])
+        )
+        self._l1.discard(*keys)
+
+    async def aclear(self) -> None:
+        """Async :meth:`clear`."""
+        await self._write(lambda con: con.execute(self._clear_sql))
+        self._l1.clear()
+
+    def _set_row(self, con: sqlite3.Connection, key: str, value: Any, exp: float):
+        blob = self._stream(value)
+        con.execute(self._set_sql, {"key": key, "value": blob, "exp": exp})
+        self._l1.put(key, value, exp, len(blob))
+
+    def _l1_many(self, keys: List[str]) -> Dict[str, Any]:
+        results = {}
+        for key in keys:
+            if (value := self._l1.get(key)) is not _MISSING:
+                results[str(key)] = value
+        return results
+
+    def _fetch(self, key: str) -> Optional[Tuple[Any, float]]:
+        result = self._con.execute(self._get_sql, {"key": key}).fetchone()
+        if result is None:
+            return None
+        value = self._unstream(result[0])
+        exp = self._exp_datetime(result[1])
+        if exp is None or datetime.utcnow() < exp:
+            self._l1.put(key, value, result[1], len(result[0]))
+        return value, result[1]
+
+    def _fetch_many(self, keys: List[str]) -> Dict[str, Any]:
+        fetched = self._con.execute(
+            self._get_many_sql.format(", ".join("?" * len(keys))), keys
+        ).fetchall()
+        now = datetime.utcnow()
+        accessed = time()
+        results = {}
+        for key, blob, exp_ts in fetched:
+            exp = self._exp_datetime(exp_ts)
+            if exp is not None and now >= exp:
+                continue
+            results[key] = self._unstream(blob)
+            self._accessed[key] = accessed
+            self._l1.put(key, results[key], exp_ts, len(blob))
+        return results
+
+    # ------------------------------------------------------------- maintenance
+
+    def _sweeper(self) -> None:
+        while True:
+            sleep(self.sweep_interval)
+            if self.in_memory or getattr(self, "_write_queue", None) is not None:
+                # Let the writer thread run it between batches
+                self._ensure_async()
+                self._write_queue.put((self._sweep, None))
+            else:
+                try:
+                    self._sweep(self._con)
+                    self._con.commit()
+                except sqlite3.Error as exc:
+                    LOGGER.warning(f"Cache maintenance failed: {exc}")
+
+    def _sweep(self, con: sqlite3.Connection) -> None:
+        """Delete expired rows, evict LRU rows above the limits and vacuum a little.
+
+        Every step works in batches of :attr:`SWEEP_BATCH` rows.
+        """
+        accessed, self._accessed = self._accessed, {}
+        if accessed:
+            con.executemany(
+                self._atime_sql,
+                [{"key": key, "atime": atime} for key, atime in accessed.items()],
+            )
+        while True:
+            deleted = con.execute(self._sweep_sql, {"limit": self.SWEEP_BATCH}).rowcount
+            self._counters["expired"] += deleted
+            if deleted < self.SWEEP_BATCH:
+                break
+        if self.max_entries is not None or self.max_bytes is not None:
+            self._evict(con)
+        self._counters["sweeps"] += 1
+        if not self.in_memory:
+            con.commit()
+            con.execute(
+                self._set_pragma.format(f"incremental_vacuum({self.VACUUM_PAGES})")
+            ).fetchall()
+
+    def _evict(self, con: sqlite3.Connection) -> None:
+        count, size = con.execute(self._usage_sql).fetchone()
+        if self.max_entries is not None and count > self.max_entries:
+            excess = count - self.max_entries
+            while excess > 0:
+                limit = min(excess, self.SWEEP_BATCH)
+                keys = [key for key, _ in con.execute(self._oldest_sql, {"limit": limit})]
+                if not keys:
+                    break
+                con.executemany(self._delete_sql, [{"key": key} for key in keys])
+                self._l1.discard(*keys)
+                self._counters["evictions"] += len(keys)
+                excess -= len(keys)
+            count, size = con.execute(self._usage_sql).fetchone()
+        while self.max_bytes is not None and size > self.max_bytes and count:
+            oldest = con.execute(self._oldest_sql, {"limit": self.SWEEP_BATCH}).fetchall()
+            victims = []
+            for key, row_size in oldest:
+                if size <= self.max_bytes:
+                    break
+                victims.append({"key": key})
+                size -= row_size or 0
+            if not victims:
+                break
+            con.executemany(self._delete_sql, victims)
+            self._l1.discard(*(victim["key"] for victim in victims))
+            self._counters["evictions"] += len(victims)
+            count -= len(victims)
+
+    def sweep(self) -> None:
+        """Run one maintenance pass now, on the calling thread."""
+        self._sweep(self._con)
+        self._con.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Row count, stored bytes and maintenance counters of the cache."""
+        count, size = self._con.execute(self._usage_sql).fetchone()
+        page_size = self._con.execute(self._set_pragma.format("page_size")).fetchone()[0]
+        pages = self._con.execute(self._set_pragma.format("page_count")).fetchone()[0]
+        free = self._con.execute(self._set_pragma.format("freelist_count")).fetchone()[0]
+        return {
+            "entries": count,
+            "bytes": size,
+            "file_bytes": page_size * pages,
+            "free_bytes": page_size * free,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            **self._counters,
+            "l1": self._l1.stats(),
+            "codec": self.codec_stats(),
+        }
+
+    def codec_stats(self) -> Dict[str, Any]:
+        """Encoded sizes and encode/decode time of this cache's values."""
+        with self._codec_lock:
+            stats = dict(self._codec_stats)
+        return {
+            "codec": self._codec.name,
+            "compression": self._compressor.name if self._compressor else None,
+            **stats,
+            "ratio": round(stats["stored_bytes"] / stats["raw_bytes"], 4)
+            if stats["raw_bytes"]
+            else 1.0,
+            "encode_avg_us": round(stats["encode_seconds"] / stats["encoded"] * 1e6, 2)
+            if stats["encoded"]
+            else 0.0,
+            "decode_avg_us": round(stats["decode_seconds"] / stats["decoded"] * 1e6, 2)
+            if stats["decoded"]
+            else 0.0,
+        }
+
+    @classmethod
+    def all_stats(cls) -> Dict[str, Dict[str, Any]]:
+        """:meth:`stats` of every live cache, keyed by file name."""
+        return {cache.filename: cache.stats() for cache in list(cls._instances)}
+
+
+def _set_future(future: "asyncio.Future", result: Any, exc: Optional[BaseException]):
+    if future.done():
+        return
+    if exc is None:
+        future.set_result(result)
+    else:
+        future.set_exception(exc)
@@ -0,0 +1,107 @@
+import asyncio
+import re
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from cachetools import TTLCache
+
+__all__ = ["TriggerIndex", "TriggerIndexCache"]
+
+
+class TriggerIndex:
+    """Compiled matcher for a chat's trigger words (filters, blacklist).
+
+    All words are joined into one alternation so a message is scanned once,
+    instead of compiling and running one regex per word. Word boundaries
+    follow the old ``( |^|[^\\w])word( |$|[^\\w])`` pattern.
+    """
+
+    __slots__ = ("payloads", "_pattern")
+
+    def __init__(self, payloads: Dict[str, Any]):
+        self.payloads = payloads
+        # Longest first so "hello world" wins over "hello" at the same position
+        words = sorted(payloads, key=len, reverse=True)
+        self._pattern = (
+            re.compile(
+                r"(?<!\w)(?:" + "|".join(map(re.escape, words)) + r")(?!\w)",
+                flags=re.IGNORECASE,
+            )
+            if words
+            else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def search(self, text: str) -> Optional[Tuple[str, Any]]:
+        """Return ``(word, payload)`` of the first trigger found in text, or None."""
+        return next(self.finditer(text), None)
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, Any]]:
+        """Yield ``(word, payload)`` of every trigger in text, in order."""
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            word = match.group(0).lower()
+            if word not in self.payloads:
+                # Case-insensitive match that doesn't round-trip through lower()
+                word = next(
+                    (w for w in self.payloads if w.lower() == word),
+                    match.group(0),
+                )
+            yield word, self.payloads.get(word)
+
+
+class TriggerIndexCache:
+    """Per-chat :class:`TriggerIndex`, built from ``await load(chat_id)``.
+
+    Concurrent misses of a chat share one load. :meth:`invalidate` bumps
+    the chat's generation, a load that started before it doesn't store what
+    it read and its readers load again.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[int], Awaitable[Dict[str, Any]]],
+        maxsize: int = 2000,
+        ttl: int = 60 * 60,
+    ):
+        self._load = load
+        self._indexes = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._inflight: Dict[int, asyncio.Future] = {}
+        # Only chats invalidated while a load of theirs is in flight
+        self._generations: Dict[int, int] = {}
+
+    async def get(self, chat_id: int) -> TriggerIndex:
+        index = self._indexes.get(chat_id)
+        if index is not None:
+            return index
+        while True:
+            future = self._inflight.get(chat_id)
+            if future is None:
+                future = self._inflight[chat_id] = asyncio.ensure_future(self._fill(chat_id))
+                future.add_done_callback(partial(self._loaded, chat_id))
+            index, stored = await asyncio.shield(future)
+            if stored:
+                return index
+
+    async def _fill(self, chat_id: int) -> Tuple[TriggerIndex, bool]:
+        generation = self._generations.get(chat_id, 0)
+        index = TriggerIndex(await self._load(chat_id))
+        if self._generations.get(chat_id, 0) != generation:
+            return index, False
+        self._indexes[chat_id] = index
+        return index, True
+
+    def _loaded(self, chat_id: int, future: asyncio.Future):
+        if self._inflight.get(chat_id) is future:
+            del self._inflight[chat_id]
+        if chat_id not in self._inflight:
+            self._generations.pop(chat_id, None)
+
+    def invalidate(self, chat_id: int):
+        """Drop the chat's index after its triggers changed."""
+        self._indexes.pop(chat_id, None)
+        if self._inflight.pop(chat_id, None) is not None:
+            self._generations[chat_id] = self._generations.get(chat_id, 0) + 1
@@ -25,14 +25,8 @@ SOFTWARE.
 import asyncio
 import os
 import re
+from datetime import datetime
 from logging import getLogger
-from time import time
-
-from misskaty.database.limit_db import (
-    get_settings,
-    get_usage,
-    increment_usage
-)
 
 from pyrogram import Client, enums, filters
 from pyrogram.errors import (
@@ -43,14 +37,18 @@ from pyrogram.errors import (
 )
 from pyrogram.types import ChatMember, ChatPermissions, ChatPrivileges, Message
 
+from database import dbname
 from database.warn_db import add_warn, get_warn, remove_warns
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
 from misskaty.core.decorator.permissions import (
     admins_in_chat,
+    get_member,
+    invalidate_member,
     list_admins,
     member_permissions,
 )
+from misskaty.core.deletion import deleter
 from misskaty.core.keyboard import ikb
 from misskaty.helper.functions import (
     extract_user,
@@ -102,9 +100,8 @@ __HELP__ = """
 
 # ================== BAN/KICK LIMIT DATABASE ==================
 
-mongo = AsyncIOMotorClient(MONGO_DB_URI)
-limit_db = mongo["MissKaty"]["bk_limit"]
-settings_db = mongo["MissKaty"]["bk_settings"]
+limit_db = dbname["bk_limit"]
+settings_db = dbname["bk_settings"]
 
 
 async def get_settings(chat_id: int):
@@ -172,7 +169,7 @@ async def remove_restrict_right(chat_id: int, admin_id: int):
 
 
 async def check_limit(chat_id: int, admin_id: int):
-    member = await app.get_chat_member(chat_id, admin_id)
+    member = await get_member(chat_id, admin_id)
 
     # Owner exempt
     if member.status == enums.ChatMemberStatus.OWNER:
@@ -194,20 +191,19 @@ async def check_limit(chat_id: int, admin_id: int):
 # Admin cache reload
 @app.on_chat_member_updated(filters.group, group=5)
 async def admin_cache_func(_, cmu):
-    if cmu.old_chat_member and cmu.old_chat_member.promoted_by:
-        try:
-            admins_in_chat[cmu.chat.id] = {
-                "last_updated_at": time(),
-                "data": [
-                    member.user.id
-                    async for member in app.get_chat_members(
-                        cmu.chat.id, filter=enums.ChatMembersFilter.ADMINISTRATORS
-                    )
-                ],
-            }
-            LOGGER.info(f"Updated admin cache for {cmu.chat.id} [{cmu.chat.title}]")
-        except:
-            pass
+    for member in (cmu.old_chat_member, cmu.new_chat_member):
+        if member and member.user:
+            invalidate_member(cmu.chat.id, member.user.id)
+    admin_status = (
+        enums.ChatMemberStatus.ADMINISTRATOR,
+        enums.ChatMemberStatus.OWNER,
+    )
+    if any(
+        member and member.status in admin_status
+        for member in (cmu.old_chat_member, cmu.new_chat_member)
+    ):
+        admins_in_chat.invalidate(cmu.chat.id)
+        LOGGER.info(f"Invalidated admin cache for {cmu.chat.id} [{cmu.chat.title}]")
 
 
 # Purge CMD
@@ -229,33 +225,15 @@ async def purge(_, ctx: Message, strings):
         else:
             purge_to = ctx.id
 
-        chat_id = ctx.chat.id
-        message_ids = []
-        del_total = 0
-
-        for message_id in range(
-            repliedmsg.id,
-            purge_to,
-        ):
-            message_ids.append(message_id)
-
-            # Max message deletion limit is 100
-            if len(message_ids) == 100:
-                await app.delete_messages(
-                    chat_id=chat_id,
-                    message_ids=message_ids,
-                    revoke=True,  # For both sides
-                )
-                del_total += len(message_ids)
-                # To delete more than 100 messages, start again
-                message_ids = []
-
-        # Delete if any messages left
-        if len(message_ids) > 0:
-            await app.delete_messages(
-                chat_id=chat_id,
-                message_ids=message_ids,
-       # Kick members
+        del_total = await deleter.delete_now(
+            app, ctx.chat.id, list(range(repliedmsg.id, purge_to))
+        )
+        await ctx.reply_msg(strings("purge_success").format(del_total=del_total))
+    except Exception as err:
+        await ctx.reply_msg(f"ERROR: {err}")
+
+
+# Kick members
 @app.on_cmd(["kick", "dkick"], self_admin=True, group_only=True)
 @app.adminsOnly("can_restrict_members")
 @use_chat_lang()
@@ -277,7 +255,7 @@ async def kickFunc(client: Client, ctx: Message, strings) -> "Message":
 
     # ================= LIMIT CHECK =================
 
-    member = await app.get_chat_member(ctx.chat.id, ctx.from_user.id)
+    member = await get_member(ctx.chat.id, ctx.from_user.id)
 
     # Owner exempt
     if member.status != enums.ChatMemberStatus.OWNER:
@@ -342,29 +320,10 @@ async def kickFunc(client: Client, ctx: Message, strings) -> "Message":
     except ChatAdminRequired:
         await ctx.reply_msg(strings("no_ban_permission"))
     except Exception as e:
-        await ctx.reply_msg(str(e))         revoke=True,
-            )
-            del_total += len(message_ids)
-        await ctx.reply_msg(strings("purge_success").format(del_total=del_total))
-    except Exception as err:
-        await ctx.reply_msg(f"ERROR: {err}")
-
-
-
-
-
+        await ctx.reply_msg(str(e))
 
 
-# Unban members
-@app.on_cmd("unban", self_admin=True, group_only=True)
-@app.adminsOnly("can_restrict_members")
-@use_chat_lang()
-async def unban_func(_, message, strings):
-    # we don't need reasons for unban, also, we
-    # don't need to get "text_mention" entity, because
-    # normal users won't get text_mention if the user
-    # they want to unban is not in the group.
-    reply# Ban/DBan/TBan User
+# Ban/DBan/TBan User
 @app.on_cmd(["ban", "dban", "tban"], self_admin=True, group_only=True)
 @app.adminsOnly("can_restrict_members")
 @use_chat_lang()
@@ -389,7 +348,7 @@ async def banFunc(client, message, strings):
 
     # ================= LIMIT CHECK =================
 
-    member = await app.get_chat_member(message.chat.id, message.from_user.id)
+    member = await get_member(message.chat.id, message.from_user.id)
 
     # Owner exempt
     if member.status != enums.ChatMemberStatus.OWNER:
@@ -492,7 +451,19 @@ async def banFunc(client, message, strings):
     except ChatAdminRequired:
         await message.reply("Please give me permission to banned members..!!!")
     except Exception as e:
-        await message.reply_msg(str(e)) = message.reply_to_message
+        await message.reply_msg(str(e))
+
+
+# Unban members
+@app.on_cmd("unban", self_admin=True, group_only=True)
+@app.adminsOnly("can_restrict_members")
+@use_chat_lang()
+async def unban_func(_, message, strings):
+    # we don't need reasons for unban, also, we
+    # don't need to get "text_mention" entity, because
+    # normal users won't get text_mention if the user
+    # they want to unban is not in the group.
+    reply = message.reply_to_message
 
     if reply and reply.sender_chat and reply.sender_chat != message.chat.id:
         return await message.reply_text(strings("unban_channel_err"))
@@ -633,7 +604,7 @@ async def promoteFunc(client, message, strings):
         return await message.reply(strings("invalid_id_uname"))
     if not user_id:
         return await message.reply_text(strings("user_not_found"))
-    bot = (await client.get_chat_member(message.chat.id, client.me.id)).privileges
+    bot = (await get_member(message.chat.id, client.me.id, client)).privileges
     if user_id == client.me.id:
         return await message.reply_msg(strings("promote_self_err"))
     if not bot:
@@ -16,7 +16,14 @@ import time
 from pyrogram import Client, enums, filters
 from pyrogram.types import Message
 
-from database.afk_db import add_afk, cleanmode_off, cleanmode_on, is_afk, remove_afk
+from database.afk_db import (
+    add_afk,
+    any_afk,
+    cleanmode_off,
+    cleanmode_on,
+    is_afk,
+    remove_afk,
+)
 from misskaty import app
 from misskaty.core.decorator.permissions import adminsOnly
 from misskaty.helper import get_readable_time2
@@ -234,7 +241,7 @@ async def afk_state(_, ctx: Message, strings):
 )
 @use_chat_lang()
 async def afk_watcher_func(self: Client, ctx: Message, strings):
-    if ctx.sender_chat:
+    if ctx.sender_chat or not any_afk():
         return
     userid = ctx.from_user.id
     user_name = ctx.from_user.mention
@@ -22,7 +22,6 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import re
 from datetime import datetime, timedelta
 
 from pyrogram import filters
@@ -31,6 +30,7 @@ from pyrogram.types import ChatPermissions
 
 from database.blacklist_db import (
     delete_blacklist_filter,
+    get_blacklist_index,
     get_blacklisted_words,
     save_blacklist_filter,
 )
@@ -100,28 +100,28 @@ async def blacklist_filters_re(self, message):
         return
     if user.id in SUDO or user.id == OWNER_ID:
         return
-    list_of_filters = await get_blacklisted_words(chat_id)
-    for word in list_of_filters:
-        pattern = r"( |^|[^\w])" + re.escape(word) + r"( |$|[^\w])"
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            if user.id in await list_admins(chat_id):
-                return
-            try:
-                await message.delete_msg()
-                await message.chat.restrict_member(
-                    user.id,
-                    ChatPermissions(all_perms=False),
-                    until_date=datetime.now() + timedelta(hours=1),
-                )
-            except ChatAdminRequired:
-                return await message.reply(
-                    "Please give me admin permissions to blacklist user", quote=False
-                )
-            except Exception as err:
-                self.log.info(f"ERROR Blacklist Chat: ID = {chat_id}, ERR = {err}")
-                return
-            await app.send_message(
-                chat_id,
-                f"Muted {user.mention} [`{user.id}`] for 1 hour "
-                + f"due to a blacklist match on {word}.",
-            )
+    found = (await get_blacklist_index(chat_id)).search(text)
+    if not found:
+        return
+    word, _ = found
+    if user.id in await list_admins(chat_id):
+        return
+    try:
+        await message.delete_msg()
+        await message.chat.restrict_member(
+            user.id,
+            ChatPermissions(all_perms=False),
+            until_date=datetime.now() + timedelta(hours=1),
+        )
+    except ChatAdminRequired:
+        return await message.reply(
+            "Please give me admin permissions to blacklist user", quote=False
+        )
+    except Exception as err:
+        self.log.info(f"ERROR Blacklist Chat: ID = {chat_id}, ERR = {err}")
+        return
+    await app.send_message(
+        chat_id,
+        f"Muted {user.mention} [`{user.id}`] for 1 hour "
+        + f"due to a blacklist match on {word}.",
+    )
@@ -2,18 +2,17 @@ import asyncio
 import datetime
 import time
 
-from async_pymongo import AsyncClient
 from pyrogram import filters
 from pyrogram.types import Message
 
-from misskaty import DATABASE_URI, app
+from database import mongo
+from misskaty import app
 from misskaty.vars import OWNER_ID
 from utils import broadcast_messages
 
 
 @app.on_message(filters.command("broadcast") & filters.user(OWNER_ID) & filters.reply)
 async def broadcast(_, ctx: Message):
-    mongo = AsyncClient(DATABASE_URI)
     userdb = mongo["MissKatyBot"]["peers"]
     b_msg = ctx.reply_to_message
     sts = await ctx.reply_msg("Broadcasting your messages...")
@@ -56,6 +56,7 @@ from database.gban_db import add_gban_user, is_gbanned_user, remove_gban_user
 from database.users_chats_db import db
 from misskaty import BOT_NAME, app, botStartTime, misskaty_version, user
 from misskaty.core.decorator import new_task
+from misskaty.core.watchdog import watchdog
 from misskaty.helper.eval_helper import format_exception, meval
 from misskaty.helper.functions import extract_user, extract_user_and_reason
 from misskaty.helper.http import fetch
@@ -78,6 +79,7 @@ __HELP__ = """
 /gban - To Ban A User Globally.
 /ungban - To remove ban user globbaly.
 /restart - update and restart bot.
+/loopstats [reset] - Show code that blocks the event loop.
 
 **For Public Use**
 /stats - Check statistic bot
@@ -225,6 +227,26 @@ async def payment(client: Client, message: Message):
         msg = await message.reply_photo(qr_photo, caption=capt+payment_guide, reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(text="Payment Web", web_app=WebAppInfo(url=res["data"]["checkout_url_v2"]))]]), quote=True)
     await autopay_update(msg.id, res["data"]["note"], id_, res['data']['amount'], res['data']['status'], res['data']['unique_code'], res['data']['created_at'])
 
+@app.on_message(filters.command(["loopstats"], COMMAND_HANDLER) & filters.user(OWNER_ID))
+async def loop_stats(_, ctx: Message):
+    if len(ctx.command) > 1 and ctx.command[1] == "reset":
+        watchdog.reset()
+        return await ctx.reply_msg("Loop stall stats have been reset.")
+    stats = watchdog.summary()
+    msg = (
+        f"<b>Event Loop</b>\n"
+        f"Lag avg/max: <code>{stats['lag_avg_ms']}ms / {stats['lag_max_ms']}ms</code>\n"
+        f"Stalls over {stats['threshold_ms']}ms: <code>{stats['stalls']}</code>\n"
+    )
+    for site, entry in watchdog.top(10):
+        msg += (
+            f"\n<b>{html.escape(site)}</b>\n"
+            f"{entry.count}x, total {round(entry.total * 1000)}ms, max {round(entry.max * 1000)}ms\n"
+            f"<pre>{html.escape(entry.stack)}</pre>"
+        )
+    await ctx.reply_or_send_as_file(msg)
+
+
 @app.on_message(filters.command(["donate"], COMMAND_HANDLER))
 async def donate(self: Client, ctx: Message):
     try:
@@ -18,7 +18,7 @@ from misskaty.helper.time_gap import check_time_gap
 from utils import temp
 
 from .pypi_search import PYPI_DICT
-from .web_scraper import SCRAP_DICT, data_kuso
+from .web_scraper import DETAIL_DICT, SCRAP_DICT
 from .ytdl_plugins import YT_DB
 
 chat = [-1001128045651, -1001255283935, -1001455886928]
@@ -136,12 +136,12 @@ async def request_user(client, message):
 
 # To reduce cache and disk
 async def clear_reqdict():
-    SCRAP_DICT.clear()
-    data_kuso.clear()
+    await SCRAP_DICT.aclear()
+    await DETAIL_DICT.aclear()
     REQUEST_DB.clear()
     PYPI_DICT.clear()
     YT_DB.clear()
-    admins_in_chat.clear()
+    await admins_in_chat.clear()
     temp.MELCOW.clear()
     shutil.rmtree("downloads", ignore_errors=True)
     shutil.rmtree("GensSS", ignore_errors=True)
@@ -30,7 +30,7 @@ from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from database.filters_db import (
     delete_filter,
     deleteall_filters,
-    get_filter,
+    get_filters_index,
     get_filters_names,
     save_filter,
 )
@@ -183,90 +183,94 @@ async def filters_re(self, message):
     ):
         return
     chat_id = message.chat.id
-    list_of_filters = await get_filters_names(chat_id)
-    for word in list_of_filters:
-        pattern = r"( |^|[^\w])" + re.escape(word) + r"( |$|[^\w])"
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            _filter = await get_filter(chat_id, word)
-            data_type = _filter["type"]
-            data = _filter.get("data")
-            file_id = _filter.get("file_id")
-            keyb = None
-            if data:
-                if "{chat}" in data:
-                    data = data.replace(
-                        "{chat}", message.chat.title
-                    )
-                if "{name}" in data:
-                    data = data.replace(
-                        "{name}", (from_user.mention if message.from_user else from_user.title)
-                    )
-                if re.findall(r"\[.+\,.+\]", data):
-                    keyboard = extract_text_and_keyb(ikb, data)
-                    if keyboard:
-                        data, keyb = keyboard
-            replied_message = message.reply_to_message
-            if replied_message:
-                replied_user = replied_message.from_user if replied_message.from_user else replied_message.sender_chat
-                if text.startswith("~"):
-                    await message.delete()
-                if replied_user.id != from_user.id:
-                    message = replied_message
+    index = await get_filters_index(chat_id)
+    # Media filters without a file_id can't be sent, try the next trigger
+    found = next(
+        (
+            (word, _filter)
+            for word, _filter in index.finditer(text)
+            if _filter["type"] == "text" or _filter.get("file_id")
+        ),
+        None,
+    )
+    if not found:
+        return
+    _, _filter = found
+    data_type = _filter["type"]
+    data = _filter.get("data")
+    file_id = _filter.get("file_id")
+    keyb = None
+    if data:
+        if "{chat}" in data:
+            data = data.replace(
+                "{chat}", message.chat.title
+            )
+        if "{name}" in data:
+            data = data.replace(
+                "{name}", (from_user.mention if message.from_user else from_user.title)
+            )
+        if re.findall(r"\[.+\,.+\]", data):
+            keyboard = extract_text_and_keyb(ikb, data)
+            if keyboard:
+                data, keyb = keyboard
+    replied_message = message.reply_to_message
+    if replied_message:
+        replied_user = replied_message.from_user if replied_message.from_user else replied_message.sender_chat
+        if text.startswith("~"):
+            await message.delete()
+        if replied_user.id != from_user.id:
+            message = replied_message
 
-            if data_type == "text":
-                await message.reply_msg(
-                    text=data,
-                    reply_markup=keyb,
-                    disable_web_page_preview=True,
-                )
-            else:
-                if not file_id:
-                    continue
-            if data_type == "sticker":
-                await message.reply_sticker(
-                    sticker=file_id,
-                )
-            if data_type == "animation":
-                await message.reply_animation(
-                    animation=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            if data_type == "photo":
-                await message.reply_photo(
-                    photo=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            if data_type == "document":
-                await message.reply_document(
-                    document=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            if data_type == "video":
-                await message.reply_video(
-                    video=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            if data_type == "video_note":
-                await message.reply_video_note(
-                    video_note=file_id,
-                )
-            if data_type == "audio":
-                await message.reply_audio(
-                    audio=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            if data_type == "voice":
-                await message.reply_voice(
-                    voice=file_id,
-                    caption=data,
-                    reply_markup=keyb,
-                )
-            return
+    if data_type == "text":
+        await message.reply_msg(
+            text=data,
+            reply_markup=keyb,
+            disable_web_page_preview=True,
+        )
+    if data_type == "sticker":
+        await message.reply_sticker(
+            sticker=file_id,
+        )
+    if data_type == "animation":
+        await message.reply_animation(
+            animation=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
+    if data_type == "photo":
+        await message.reply_photo(
+            photo=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
+    if data_type == "document":
+        await message.reply_document(
+            document=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
+    if data_type == "video":
+        await message.reply_video(
+            video=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
+    if data_type == "video_note":
+        await message.reply_video_note(
+            video_note=file_id,
+        )
+    if data_type == "audio":
+        await message.reply_audio(
+            audio=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
+    if data_type == "voice":
+        await message.reply_voice(
+            voice=file_id,
+            caption=data,
+            reply_markup=keyb,
+        )
 
 
 @app.on_message(filters.command("stopall", COMMAND_HANDLER) & ~filters.private)
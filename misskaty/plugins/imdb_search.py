@@ -4,7 +4,6 @@
 # * Copyright ©YasirPedia All rights reserved
 import contextlib
 import html
-import json
 import logging
 import re
 import sys
@@ -12,7 +11,6 @@ from typing import Optional
 from urllib.parse import quote_plus
 
 import httpx
-from bs4 import BeautifulSoup
 from pykeyboard import InlineButton, InlineKeyboard
 from pyrogram import Client, enums
 from pyrogram.errors import (
@@ -52,10 +50,19 @@ from database.imdb_db import (
 )
 from misskaty import app
 from misskaty.helper import GENRES_EMOJI, Cache, fetch, gtranslate, get_random_string, search_jw
+from misskaty.helper.html_parser import parse_html
+from misskaty.helper.page_parsers import parse_imdb_title
+from misskaty.vars import CACHE_MAX_BYTES
 from utils import demoji
 
 LOGGER = logging.getLogger("MissKaty")
-LIST_CARI = Cache(filename="imdb_cache.db", path="cache", in_memory=False)
+LIST_CARI = Cache(
+    filename="imdb_cache.db",
+    path="cache",
+    in_memory=False,
+    max_bytes=CACHE_MAX_BYTES,
+    codec="json",
+)
 
 
 class _ImdbTemplateDefaults(dict):
@@ -245,7 +252,7 @@ async def imdb_choose(_, ctx: Message):
             return await imdb_search_id(kuery, ctx)
     buttons = InlineKeyboard()
     ranval = get_random_string(4)
-    LIST_CARI.add(ranval, kuery, timeout=15)
+    await LIST_CARI.aadd(ranval, kuery, timeout=15)
     buttons.row(
         InlineButton("🇺🇸 English", f"imdbcari#eng#{ranval}#{ctx.from_user.id}"),
         InlineButton("🇮🇩 Indonesia", f"imdbcari#ind#{ranval}#{ctx.from_user.id}"),
@@ -700,8 +707,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Akses Ditolak!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI.agetitem(msg)
+            await LIST_CARI.adelete(msg)
         except KeyError:
             return await query.message.edit_msg("⚠️ Callback Query Sudah Expired!")
         with contextlib.suppress(MessageIdInvalid, MessageNotModified):
@@ -762,8 +769,8 @@ async def imdbcari(_, query: CallbackQuery):
         if query.from_user.id != int(uid):
             return await query.answer("⚠️ Access Denied!", True)
         try:
-            kueri = LIST_CARI.get(msg)
-            del LIST_CARI[msg]
+            kueri = await LIST_CARI.agetitem(msg)
+            await LIST_CARI.adelete(msg)
         except KeyError:
             return await query.message.edit_msg("⚠️ Callback Query Expired!")
         await query.message.edit_msg("<i>🔎 Looking in the IMDB Database..</i>")
@@ -832,10 +839,8 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
             imdb_url = f"https://m.imdb.com/title/tt{movie}/"
             resp = await fetch.get(imdb_url)
             resp.raise_for_status()
-            sop = BeautifulSoup(resp, "lxml")
-            r_json = json.loads(
-                sop.find("script", attrs={"type": "application/ld+json"}).contents[0]
-            )
+            page = await parse_html(parse_imdb_title, resp.content)
+            r_json = page["ld_json"]
             ott = await search_jw(
                 r_json.get("alternateName") or r_json.get("name"), "ID"
             )
@@ -862,8 +867,8 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
             rilis_url = ""
             summary = ""
             tahun = (
-                re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)[0]
-                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)
+                re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])[0]
+                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])
                 else "N/A"
             )
             res_str += f"<b>📹 Judul:</b> <a href=\"{imdb_url}\">{r_json.get('name')} [{tahun}]</a> (<code>{typee}</code>)\n"
@@ -871,12 +876,7 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
                 res_str += f"<b>📢 AKA:</b> <code>{aka}</code>\n\n"
             else:
                 res_str += "\n"
-            if durasi := sop.select('li[data-testid="title-techspec_runtime"]'):
-                durasi = (
-                    durasi[0]
-                    .find(class_="ipc-metadata-list-item__content-container")
-                    .text
-                )
+            if durasi := page["runtime"]:
                 duration_raw = durasi
                 duration_text = (await gtranslate(durasi, "auto", "id")).text
                 res_str += f"<b>Durasi:</b> <code>{duration_text}</code>\n"
@@ -889,17 +889,9 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
                 rating_value = rating.get("ratingValue", "-")
                 rating_count = rating.get("ratingCount", "-")
                 res_str += f"<b>Peringkat:</b> <code>{rating_value}⭐️ dari {rating_count} pengguna</code>\n"
-            if release := sop.select('li[data-testid="title-details-releasedate"]'):
-                rilis = (
-                    release[0]
-                    .find(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
-                    .text
-                )
-                rilis_url = release[0].find(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )["href"]
+            if release := page["release"]:
+                rilis = release["text"]
+                rilis_url = release["href"]
                 release_date_text = rilis or "-"
                 res_str += f"<b>Rilis:</b> <a href=\"https://www.imdb.com{rilis_url}\">{rilis}</a>\n"
             genre_list = []
@@ -916,30 +908,20 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
                 genre_text = "-"
             else:
                 genre_text = genre_text[:-2]
-            country_list = []
-            if negara := sop.select('li[data-testid="title-details-origin"]'):
-                country_items = negara[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                country_list = [country.text for country in country_items]
+            if country_list := page["origins"]:
                 country_text = "".join(
-                    f"{demoji(country.text)} #{country.text.replace(' ', '_').replace('-', '_')}, "
-                    for country in country_items
+                    f"{demoji(country)} #{country.replace(' ', '_').replace('-', '_')}, "
+                    for country in country_list
                 )
                 res_str += f"<b>Negara:</b> {country_text[:-2]}\n"
             if country_text == "-":
                 country_text = "-"
             else:
                 country_text = country_text[:-2]
-            language_list = []
-            if bahasa := sop.select('li[data-testid="title-details-languages"]'):
-                language_items = bahasa[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                language_list = [lang.text for lang in language_items]
+            if language_list := page["languages"]:
                 language_text = "".join(
-                    f"#{lang.text.replace(' ', '_').replace('-', '_')}, "
-                    for lang in language_items
+                    f"#{lang.replace(' ', '_').replace('-', '_')}, "
+                    for lang in language_list
                 )
                 res_str += f"<b>Bahasa:</b> {language_text[:-2]}\n"
             if language_text == "-":
@@ -996,12 +978,7 @@ async def imdb_id_callback(self: Client, query: CallbackQuery):
                 )
             if keyword_text != "-":
                 keyword_text = keyword_text[:-2]
-            if award := sop.select('li[data-testid="award_information"]'):
-                awards = (
-                    award[0]
-                    .find(class_="ipc-metadata-list-item__list-content-item")
-                    .text
-                )
+            if awards := page["awards"]:
                 awards_text = (await gtranslate(awards, "auto", "id")).text or "-"
                 res_str += f"<b>🏆 Penghargaan:</b>\n<blockquote expandable><code>{awards_text}</code></blockquote>\n"
             else:
@@ -1247,10 +1224,8 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
             imdb_url = f"https://m.imdb.com/title/tt{movie}/"
             resp = await fetch.get(imdb_url)
             resp.raise_for_status()
-            sop = BeautifulSoup(resp, "lxml")
-            r_json = json.loads(
-                sop.find("script", attrs={"type": "application/ld+json"}).contents[0]
-            )
+            page = await parse_html(parse_imdb_title, resp.content)
+            r_json = page["ld_json"]
             ott = await search_jw(
                 r_json.get("alternateName") or r_json.get("name"), "US"
             )
@@ -1275,8 +1250,8 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
             rilis_url = ""
             summary = ""
             tahun = (
-                re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)[0]
-                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)
+                re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])[0]
+                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])
                 else "N/A"
             )
             res_str += f"<b>📹 Judul:</b> <a href=\"{imdb_url}\">{r_json.get('name')} [{tahun}]</a> (<code>{typee}</code>)\n"
@@ -1284,12 +1259,7 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
                 res_str += f"<b>📢 AKA:</b> <code>{aka}</code>\n\n"
             else:
                 res_str += "\n"
-            if durasi := sop.select('li[data-testid="title-techspec_runtime"]'):
-                durasi = (
-                    durasi[0]
-                    .find(class_="ipc-metadata-list-item__content-container")
-                    .text
-                )
+            if durasi := page["runtime"]:
                 duration_raw = durasi
                 duration_text = durasi
                 res_str += f"<b>Duration:</b> <code>{durasi}</code>\n"
@@ -1302,17 +1272,9 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
                 rating_value = rating.get("ratingValue", "-")
                 rating_count = rating.get("ratingCount", "-")
                 res_str += f"<b>Rating:</b> <code>{rating_value}⭐️ from {rating_count} users</code>\n"
-            if release := sop.select('li[data-testid="title-details-releasedate"]'):
-                rilis = (
-                    release[0]
-                    .find(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
-                    .text
-                )
-                rilis_url = release[0].find(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )["href"]
+            if release := page["release"]:
+                rilis = release["text"]
+                rilis_url = release["href"]
                 release_date_text = rilis or "-"
                 res_str += f"<b>Rilis:</b> <a href=\"https://www.imdb.com{rilis_url}\">{rilis}</a>\n"
             genre_list = []
@@ -1329,30 +1291,20 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
                 genre_text = "-"
             else:
                 genre_text = genre_text[:-2]
-            country_list = []
-            if negara := sop.select('li[data-testid="title-details-origin"]'):
-                country_items = negara[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                country_list = [country.text for country in country_items]
+            if country_list := page["origins"]:
                 country_text = "".join(
-                    f"{demoji(country.text)} #{country.text.replace(' ', '_').replace('-', '_')}, "
-                    for country in country_items
+                    f"{demoji(country)} #{country.replace(' ', '_').replace('-', '_')}, "
+                    for country in country_list
                 )
                 res_str += f"<b>Country:</b> {country_text[:-2]}\n"
             if country_text == "-":
                 country_text = "-"
             else:
                 country_text = country_text[:-2]
-            language_list = []
-            if bahasa := sop.select('li[data-testid="title-details-languages"]'):
-                language_items = bahasa[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                language_list = [lang.text for lang in language_items]
+            if language_list := page["languages"]:
                 language_text = "".join(
-                    f"#{lang.text.replace(' ', '_').replace('-', '_')}, "
-                    for lang in language_items
+                    f"#{lang.replace(' ', '_').replace('-', '_')}, "
+                    for lang in language_list
                 )
                 res_str += f"<b>Language:</b> {language_text[:-2]}\n"
             if language_text == "-":
@@ -1410,12 +1362,7 @@ async def imdb_en_callback(self: Client, query: CallbackQuery):
                 )
             if keyword_text != "-":
                 keyword_text = keyword_text[:-2]
-            if award := sop.select('li[data-testid="award_information"]'):
-                awards = (
-                    award[0]
-                    .find(class_="ipc-metadata-list-item__list-content-item")
-                    .text
-                )
+            if awards := page["awards"]:
                 awards_text = awards or "-"
                 res_str += f"<b>🏆 Awards:</b>\n<blockquote expandable><code>{awards}</code></blockquote>\n"
             else:
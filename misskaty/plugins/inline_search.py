@@ -10,7 +10,6 @@ from logging import getLogger
 from sys import platform
 from sys import version as pyver
 
-from bs4 import BeautifulSoup
 from pykeyboard import InlineButton, InlineKeyboard
 from pyrogram import __version__ as pyrover
 from pyrogram import enums, filters
@@ -27,8 +26,11 @@ from pyrogram.types import (
 from database.imdb_db import get_imdb_by, get_imdb_layout_fields, get_imdb_template
 from misskaty import BOT_USERNAME, app, user
 from misskaty.helper import GENRES_EMOJI, fetch, gtranslate, post_to_telegraph, search_jw
+from misskaty.helper.html_parser import parse_html
+from misskaty.helper.page_parsers import parse_google_search, parse_imdb_title
 from misskaty.plugins.dev import shell_exec
 from misskaty.plugins.misc_tools import calc_btn
+from misskaty.plugins.web_scraper import META_INLINE_TIMEOUT, META_LIMIT, meta_search
 from misskaty.vars import USER_SESSION
 from utils import demoji
 
@@ -39,10 +41,11 @@ To use this feature, just type bot username with following args below.
 ~ pypi [query] - Search package from Pypi.
 ~ git [query] - Search in Git.
 ~ google [query] - Search in Google.
+~ meta [query] - Search every scraper site at once.
 ~ info [user id/username] - Check info about a user.
 """
 
-keywords_list = ["imdb", "pypi", "git", "google", "secretmsg", "info", "botapi"]
+keywords_list = ["imdb", "pypi", "git", "google", "meta", "secretmsg", "info", "botapi"]
 
 PRVT_MSGS = {}
 LOGGER = getLogger("MissKaty")
@@ -327,17 +330,9 @@ async def inline_menu(self, inline_query: InlineQuery):
         search_results = await fetch.get(
             f"https://www.google.com/search?q={judul}&num=20"
         )
-        soup = BeautifulSoup(search_results.text, "lxml")
         data = []
-        for result in soup.select(".tF2Cxc"):
-            link = result.select_one(".yuRUbf a")["href"]
-            title = result.select_one(".DKV0Md").text
-            if snippet := result.find(class_="VwiC3b yXK7lf lVm3ye r025kc hJNv6b"):
-                snippet = snippet.get_text()
-            elif snippet := result.find(class_="VwiC3b yXK7lf lVm3ye r025kc hJNv6b Hdw6tb"):
-                snippet = snippet.get_text()
-            else:
-                snippet = "-"
+        for result in await parse_html(parse_google_search, search_results.content):
+            link, title, snippet = result["link"], result["title"], result["snippet"]
             message_text = f"<a href='{link}'>{html.escape(title)}</a>\n"
             message_text += f"Deskription: {html.escape(snippet)}\n\nGoogleSearch by @{self.me.username}"
             data.append(
@@ -364,6 +359,50 @@ async def inline_menu(self, inline_query: InlineQuery):
             switch_pm_text=f"Found {len(data)} results",
             switch_pm_parameter="google",
         )
+    elif inline_query.query.strip().lower().split()[0] == "meta":
+        if len(inline_query.query.strip().lower().split()) < 2:
+            return await inline_query.answer(
+                results=[],
+                switch_pm_text="Meta Search | meta [QUERY]",
+                switch_pm_parameter="inline",
+            )
+        judul = inline_query.query.split(None, 1)[1].strip()
+        # Inline queries expire in a few seconds, answer with what came in time
+        merged = await meta_search(judul, timeout=META_INLINE_TIMEOUT)
+        data = []
+        for entry in merged.top(META_LIMIT):
+            sites = ", ".join(entry["links"])
+            message_text = f"<b>{html.escape(entry['title'])}</b>\n"
+            message_text += "\n".join(
+                f"- <a href='{link}'>{site}</a>" for site, link in entry["links"].items()
+            )
+            message_text += f"\n\nMetaSearch by @{self.me.username}"
+            data.append(
+                InlineQueryResultArticle(
+                    title=entry["title"],
+                    input_message_content=InputTextMessageContent(
+                        message_text=message_text,
+                        parse_mode=enums.ParseMode.HTML,
+                        disable_web_page_preview=True,
+                    ),
+                    url=next(iter(entry["links"].values())),
+                    description=f"Found on {sites}",
+                    reply_markup=InlineKeyboardMarkup(
+                        [
+                            [InlineKeyboardButton(text=site, url=link)]
+                            for site, link in list(entry["links"].items())[:5]
+                        ]
+                    ),
+                )
+            )
+        await inline_query.answer(
+            results=data,
+            is_gallery=False,
+            is_personal=False,
+            next_offset="",
+            switch_pm_text=f"Found {len(data)} results",
+            switch_pm_parameter="meta",
+        )
     elif inline_query.query.strip().lower().split()[0] == "info":
         if len(inline_query.query.strip().lower().split()) < 2:
             return await inline_query.answer(
@@ -757,10 +796,8 @@ async def imdb_inl(_, query):
                 )
             url = f"https://m.imdb.com/title/{movie}/"
             resp = await fetch.get(url)
-            sop = BeautifulSoup(resp, "lxml")
-            r_json = json.loads(
-                sop.find("script", attrs={"type": "application/ld+json"}).contents[0]
-            )
+            page = await parse_html(parse_imdb_title, resp.content)
+            r_json = page["ld_json"]
             ott = await search_jw(r_json.get("alternateName") or r_json["name"], "ID")
             template = await get_imdb_template(query.from_user.id)
             imdb_by = await get_imdb_by(query.from_user.id) or f"@{app.me.username}"
@@ -783,8 +820,8 @@ async def imdb_inl(_, query):
             rilis_url = ""
             summary = ""
             tahun = (
-                re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)[0]
-                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", sop.title.text)
+                re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])[0]
+                if re.findall(r"\d{4}\W\d{4}|\d{4}-?", page["title"])
                 else "N/A"
             )
             res_str += f"<b>📹 Judul:</b> <a href=\"{url}\">{r_json['name']} [{tahun}]</a> (<code>{typee}</code>)\n"
@@ -794,12 +831,7 @@ async def imdb_inl(_, query):
                 )
             else:
                 res_str += "\n"
-            if durasi := sop.select('li[data-testid="title-techspec_runtime"]'):
-                durasi = (
-                    durasi[0]
-                    .find(class_="ipc-metadata-list-item__content-container")
-                    .text
-                )
+            if durasi := page["runtime"]:
                 duration_raw = durasi
                 duration_text = (await gtranslate(durasi, "auto", "id")).text
                 res_str += f"<b>Durasi:</b> <code>{duration_text}</code>\n"
@@ -808,17 +840,9 @@ async def imdb_inl(_, query):
                 res_str += f"<b>Kategori:</b> <code>{r_json['contentRating']}</code> \n"
             if r_json.get("aggregateRating"):
                 res_str += f"<b>Peringkat:</b> <code>{r_json['aggregateRating']['ratingValue']}⭐️ dari {r_json['aggregateRating']['ratingCount']} pengguna</code> \n"
-            if release := sop.select('li[data-testid="title-details-releasedate"]'):
-                rilis = (
-                    release[0]
-                    .find(
-                        class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                    )
-                    .text
-                )
-                rilis_url = release[0].find(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )["href"]
+            if release := page["release"]:
+                rilis = release["text"]
+                rilis_url = release["href"]
                 release_date_text = rilis or "-"
                 res_str += f"<b>Rilis:</b> <a href=\"https://www.imdb.com{rilis_url}\">{rilis}</a>\n"
             genre_list = []
@@ -839,30 +863,20 @@ async def imdb_inl(_, query):
                 genre_text = "-"
             else:
                 genre_text = genre_text[:-2]
-            country_list = []
-            if negara := sop.select('li[data-testid="title-details-origin"]'):
-                country_items = negara[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                country_list = [country.text for country in country_items]
+            if country_list := page["origins"]:
                 country_text = "".join(
-                    f"{demoji(country.text)} #{country.text.replace(' ', '_').replace('-', '_')}, "
-                    for country in country_items
+                    f"{demoji(country)} #{country.replace(' ', '_').replace('-', '_')}, "
+                    for country in country_list
                 )
                 res_str += f"<b>Negara:</b> {country_text[:-2]}\n"
             if country_text == "-":
                 country_text = "-"
             else:
                 country_text = country_text[:-2]
-            language_list = []
-            if bahasa := sop.select('li[data-testid="title-details-languages"]'):
-                language_items = bahasa[0].findAll(
-                    class_="ipc-metadata-list-item__list-content-item ipc-metadata-list-item__list-content-item--link"
-                )
-                language_list = [lang.text for lang in language_items]
+            if language_list := page["languages"]:
                 language_text = "".join(
-                    f"#{lang.text.replace(' ', '_').replace('-', '_')}, "
-                    for lang in language_items
+                    f"#{lang.replace(' ', '_').replace('-', '_')}, "
+                    for lang in language_list
                 )
                 res_str += f"<b>Bahasa:</b> {language_text[:-2]}\n"
             if language_text == "-":
@@ -915,12 +929,7 @@ async def imdb_inl(_, query):
                 )
             if keyword_text != "-":
                 keyword_text = keyword_text[:-2]
-            if award := sop.select('li[data-testid="award_information"]'):
-                awards = (
-                    award[0]
-                    .find(class_="ipc-metadata-list-item__list-content-item")
-                    .text
-                )
+            if awards := page["awards"]:
                 awards_text = (await gtranslate(awards, "auto", "id")).text or "-"
                 res_str += f"<b>🏆 Penghargaan:</b>\n<blockquote expandable><code>{awards_text}</code></blockquote>\n"
             else:
@@ -5,10 +5,10 @@ from pyrogram import filters
 from database.karma_db import (
     get_karma,
     get_karmas,
+    inc_karma,
     is_karma_on,
     karma_off,
     karma_on,
-    update_karma,
 )
 from misskaty import app
 from misskaty.core.decorator.errors import capture_err
@@ -87,14 +87,7 @@ async def upvote(_, message):
     chat_id = message.chat.id
     user_id = message.reply_to_message.from_user.id
     user_mention = message.reply_to_message.from_user.mention
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma + 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    karma = await inc_karma(chat_id, await int_to_alpha(user_id), 1)
     await message.reply_msg(
         f"Incremented Karma of {user_mention} By 1 \nTotal Points: {karma}"
     )
@@ -125,24 +118,10 @@ async def downvote(_, message):
 
     chat_id = message.chat.id
     user_id = message.from_user.id
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma - 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    karma = await inc_karma(chat_id, await int_to_alpha(user_id), -1)
     user_id = message.reply_to_message.from_user.id
     user_mention = message.reply_to_message.from_user.mention
-    current_karma = await get_karma(chat_id, await int_to_alpha(user_id))
-    if current_karma:
-        current_karma = current_karma["karma"]
-        karma = current_karma - 1
-    else:
-        karma = 1
-    new_karma = {"karma": karma}
-    await update_karma(chat_id, await int_to_alpha(user_id), new_karma)
+    karma = await inc_karma(chat_id, await int_to_alpha(user_id), -1)
     await message.reply_msg(
         f"Decremented Karma of {user_mention} By 1 \nTotal Points: {karma}"
     )
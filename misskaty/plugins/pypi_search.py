@@ -13,9 +13,16 @@ from pyrogram.types import CallbackQuery, Message
 from misskaty import app
 from misskaty.helper import Cache, fetch, post_to_telegraph
 from misskaty.plugins.web_scraper import split_arr
-from misskaty.vars import COMMAND_HANDLER
+from misskaty.vars import CACHE_MAX_BYTES, COMMAND_HANDLER
 
-PYPI_DICT = Cache(filename="pypi_cache.db", path="cache", in_memory=False)
+PYPI_DICT = Cache(
+    filename="pypi_cache.db",
+    path="cache",
+    in_memory=False,
+    max_bytes=CACHE_MAX_BYTES,
+    codec="json",
+    compression="zlib",
+)
 
 
 async def getDataPypi(msg, kueri, CurrentPage, user):
@@ -7,9 +7,10 @@ from pyrogram.types import Message
 
 from database.sangmata_db import (
     add_userdata,
-    cek_userdata,
     get_userdata,
+    is_identity_unchanged,
     is_sangmata_on,
+    remember_identity,
     sangmata_off,
     sangmata_on,
 )
@@ -34,57 +35,38 @@ This feature inspired from SangMata Bot. I'm created simple detection to check u
 async def cek_mataa(_, ctx: Message, strings):
     if ctx.sender_chat or not await is_sangmata_on(ctx.chat.id):
         return
-    if not await cek_userdata(ctx.from_user.id):
-        return await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
-    usernamebefore, first_name, lastname_before = await get_userdata(ctx.from_user.id)
+    user = ctx.from_user
+    if is_identity_unchanged(user.id, user.username, user.first_name, user.last_name):
+        return
+    previous = await get_userdata(user.id)
+    if previous == (user.username, user.first_name, user.last_name):
+        # Stored already, only unknown to the tracker (e.g. after a restart)
+        return remember_identity(user.id, *previous)
+    await add_userdata(user.id, user.username, user.first_name, user.last_name)
+    if not previous:
+        return
+    usernamebefore, first_name, lastname_before = previous
     msg = ""
     if (
-        usernamebefore != ctx.from_user.username
-        or first_name != ctx.from_user.first_name
-        or lastname_before != ctx.from_user.last_name
+        usernamebefore != user.username
+        or first_name != user.first_name
+        or lastname_before != user.last_name
     ):
-        msg += f"👀 <b>Mata MissKaty</b>\n\n🌞 User: {ctx.from_user.mention} [<code>{ctx.from_user.id}</code>]\n"
-    if usernamebefore != ctx.from_user.username:
+        msg += f"👀 <b>Mata MissKaty</b>\n\n🌞 User: {user.mention} [<code>{user.id}</code>]\n"
+    if usernamebefore != user.username:
         usernamebefore = f"@{usernamebefore}" if usernamebefore else strings("no_uname")
-        usernameafter = (
-            f"@{ctx.from_user.username}"
-            if ctx.from_user.username
-            else strings("no_uname")
-        )
+        usernameafter = f"@{user.username}" if user.username else strings("no_uname")
         msg += strings("uname_change_msg").format(bef=usernamebefore, aft=usernameafter)
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
-    if first_name != ctx.from_user.first_name:
+    if first_name != user.first_name:
         msg += strings("firstname_change_msg").format(
-            bef=first_name, aft=ctx.from_user.first_name
-        )
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
+            bef=first_name, aft=user.first_name
         )
-    if lastname_before != ctx.from_user.last_name:
+    if lastname_before != user.last_name:
         lastname_before = lastname_before or strings("no_last_name")
-        lastname_after = ctx.from_user.last_name or strings("no_last_name")
+        lastname_after = user.last_name or strings("no_last_name")
         msg += strings("lastname_change_msg").format(
             bef=lastname_before, aft=lastname_after
         )
-        await add_userdata(
-            ctx.from_user.id,
-            ctx.from_user.username,
-            ctx.from_user.first_name,
-            ctx.from_user.last_name,
-        )
     if msg != "":
         await ctx.reply_msg(msg, quote=False)
 
@@ -5,25 +5,50 @@
 * Copyright @YasirPedia All rights reserved
 """
 
+import asyncio
 import contextlib
 import logging
-import re
 import sys
+import time
 import traceback
+from datetime import datetime, timedelta, timezone
 
 import cloudscraper
 import httpx
-from bs4 import BeautifulSoup
-from cachetools import TTLCache
 from pykeyboard import InlineButton, InlineKeyboard
 from pyrogram import filters
 from pyrogram.errors import QueryIdInvalid
-from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Message
+from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from database import dbname
-from misskaty import app
-from misskaty.helper import Cache, Kusonime, fetch, post_to_telegraph, use_chat_lang
-from misskaty.vars import OWNER_ID
+from misskaty import app, scheduler
+from misskaty.helper import (
+    Cache,
+    Kusonime,
+    fetch,
+    get_readable_time,
+    post_to_telegraph,
+    use_chat_lang,
+)
+from misskaty.helper.host_health import CircuitOpen, host_of
+from misskaty.helper.html_parser import parse_html
+from misskaty.helper.http import host_health
+from misskaty.helper.meta_search import MetaResults
+from misskaty.helper.page_parsers import (
+    parse_dutamovie,
+    parse_gomov,
+    parse_lendrive,
+    parse_listing,
+    parse_melong,
+    parse_movieku,
+    parse_nodrakor,
+    parse_nunadrama,
+    parse_pusatfilm,
+    parse_savefilm21,
+)
+from misskaty.helper.scraper_sites import SITES, SiteSpec
+from misskaty.helper.search_cache import DetailPages, SearchResults
+from misskaty.vars import CACHE_MAX_BYTES, OWNER_ID, PREFETCH_INTERVAL
 
 __MODULE__ = "WebScraper"
 __HELP__ = """
@@ -41,13 +66,42 @@ __HELP__ = """
 /nunadrama [query <optional>] - Scrape website data from NunaDrama
 /dutamovie [query <optional>] - Scrape website data from DutaMovie
 /pusatfilm [query <optional>] - Scrape website data from Pusatfilm21
+/metasearch [query] - Search every site above at once and merge the results.
 /webdomain - Edit scraper domains via interactive buttons (OWNER only).
 """
 
 LOGGER = logging.getLogger("MissKaty")
-SCRAP_DICT = Cache(filename="scraper_cache.db", path="cache", in_memory=False)
-data_kuso = Cache(filename="kuso_cache.db", path="cache", in_memory=False)
-savedict = TTLCache(maxsize=1000, ttl=3600)
+# Pagination callbacks read the same result list on every page flip, keep
+# the hot ones decoded in memory
+SCRAP_DICT = Cache(
+    filename="scraper_cache.db",
+    path="cache",
+    in_memory=False,
+    max_bytes=CACHE_MAX_BYTES,
+    l1_entries=512,
+    l1_bytes=32 * 1024 * 1024,
+    codec="json",
+    compression="zlib",
+)
+# Download links pulled out of detail pages by the extract buttons
+DETAIL_DICT = Cache(
+    filename="detail_cache.db",
+    path="cache",
+    in_memory=False,
+    max_bytes=CACHE_MAX_BYTES,
+    codec="json",
+    compression="zlib",
+)
+# Results are shared between users by (site, query), listing pages of sites
+# that post several times a day expire sooner
+SCRAP_RESULTS = SearchResults(
+    SCRAP_DICT,
+    ttl={"lk21": 900, "terbit21": 900, "pahe": 900, "kuso": 3600},
+    # Prefetched listings outlive two refreshes
+    listing_ttl=max(600, PREFETCH_INTERVAL * 120),
+)
+# Kusonime results are Telegraph posts, don't post the same page every hour
+SCRAP_DETAILS = DetailPages(DETAIL_DICT, ttl={"kuso": 86400}, default_ttl=3600)
 webdb = dbname["web"]
 
 DEFAULT_WEB = {
@@ -98,6 +152,28 @@ async def save_web_config():
     )
 
 
+def domain_health(key: str) -> str:
+    health = host_health.snapshot(host_of(web[key]))
+    if health["state"] == "open":
+        return "🔴 down, skipped for now"
+    if health["state"] == "half-open":
+        return "🟠 probing"
+    if not health["requests"]:
+        return "⚪ no requests yet"
+    icon = "🟢" if health["success_rate"] >= 0.9 else "🟡"
+    latency = f", {health['latency_ms']} ms" if health["latency_ms"] is not None else ""
+    return f"{icon} {health['success_rate']:.0%} OK of {health['requests']}{latency}"
+
+
+def web_domain_text() -> str:
+    lines = "\n".join(f"<code>{key}</code>: {domain_health(key)}" for key in sorted(web))
+    return (
+        "<b>Web Domain Editor</b>\n"
+        f"{lines}\n\n"
+        "Pilih domain yang ingin kamu ubah."
+    )
+
+
 def build_web_buttons(uid: int):
     rows = []
     row = []
@@ -138,7 +214,7 @@ async def webdomain_cmd(_, message, strings):
     if message.from_user.id != OWNER_ID:
         return await message.reply_msg("⚠️ Access Denied!", del_in=5)
     await ensure_web_config()
-    text = "<b>Web Domain Editor</b>\nPilih domain yang ingin kamu ubah."
+    text = web_domain_text()
     keyboard = build_web_buttons(message.from_user.id)
     await message.reply_msg(text, reply_markup=keyboard)
 
@@ -159,7 +235,8 @@ async def webdomain_edit(_, query, strings):
     text = (
         "<b>Web Domain Editor</b>\n"
         f"<b>Nama:</b> <code>{key}</code>\n"
-        f"<b>Saat ini:</b> <code>{web[key]}</code>\n\n"
+        f"<b>Saat ini:</b> <code>{web[key]}</code>\n"
+        f"<b>Status:</b> {domain_health(key)}\n\n"
         "Pilih aksi di bawah."
     )
     await query.message.edit_msg(
@@ -245,7 +322,7 @@ async def webdomain_back(_, query, strings):
     if query.from_user.id != OWNER_ID:
         return await query.answer("⚠️ Access Denied!", True)
     await ensure_web_config()
-    text = "<b>Web Domain Editor</b>\nPilih domain yang ingin kamu ubah."
+    text = web_domain_text()
     keyboard = build_web_buttons(query.from_user.id)
     await query.message.edit_msg(text, reply_markup=keyboard)
 
@@ -260,2183 +337,513 @@ def split_arr(arr, size: 5):
     return arrs
 
 
-# Terbit21 GetData
-async def getDataTerbit21(msg, kueri, CurrentPage, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    terbitjson = await fetch.get(
-                        f"{web['yasirapi']}/terbit21?q={kueri}"
-                    )
-                else:
-                    terbitjson = await fetch.get(f"{web['yasirapi']}/terbit21")
-                terbitjson.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = terbitjson.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    if kueri:
-        TerbitRes = strings("header_with_query").format(web="Terbit21", kueri=kueri)
-    else:
-        TerbitRes = strings("header_no_query").format(web="Terbit21", cmd="terbit21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        TerbitRes += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
-        TerbitRes += (
-            "\n"
-            if re.search(r"Complete|Ongoing", i["kategori"])
-            else f"<b><a href='{i['dl']}'>{strings('dl_text')}</a></b>\n\n"
-        )
-    return TerbitRes, PageLen
-
-
-# LK21 GetData
-async def getDatalk21(msg, kueri, CurrentPage, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    lk21json = await fetch.get(f"{web['yasirapi']}/lk21?q={kueri}")
-                else:
-                    lk21json = await fetch.get(f"{web['yasirapi']}/lk21")
-                lk21json.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = lk21json.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    if kueri:
-        lkResult = strings("header_with_query").format(web="Layarkaca21", kueri=kueri)
-    else:
-        lkResult = strings("header_no_query").format(web="Layarkaca21", cmd="lk21")
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        lkResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('cat_text')}:</b> <code>{i['kategori']}</code>\n"
-        lkResult += (
-            "\n"
-            if re.search(r"Complete|Ongoing", i["kategori"])
-            else f"<b><a href='{i['dl']}'>{strings('dl_text')}</a></b>\n\n"
-        )
-    return lkResult, PageLen
+class _Labels:
+    """Localized labels for the `t` field of a site's result template."""
 
+    __slots__ = ("strings",)
 
-# Pahe GetData
-async def getDataPahe(msg, kueri, CurrentPage, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    pahejson = await fetch.get(
-                        f"{web['yasirapi']}/pahe?q={kueri}&domain={web['pahe']}"
-                    )
-                else:
-                    pahejson = await fetch.get(
-                        f"{web['yasirapi']}/pahe?domain={web['pahe']}"
-                    )
-                pahejson.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, None
-        res = pahejson.json()
-        if not res.get("result"):
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, None
-        SCRAP_DICT.add(msg.id, [split_arr(res["result"], 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    paheResult = (
-        strings("header_with_query").format(web="Pahe", kueri=kueri)
-        if kueri
-        else strings("header_no_query").format(web="Pahe", cmd="pahe")
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        paheResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n\n"
-    return paheResult, PageLen
+    def __init__(self, strings):
+        self.strings = strings
 
+    def __getitem__(self, key):
+        return self.strings(key)
 
-# Kusonime GetData
-async def getDataKuso(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        kusodata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['kusonime']}/?s={kueri}", follow_redirects=True
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None, None
-        res = BeautifulSoup(data, "lxml").find_all("h2", {"class": "episodeye"})
-        for i in res:
-            ress = i.find_all("a")[0]
-            title = ress.text
-            link = ress["href"]
-            kusodata.append({"title": title, "link": link})
-        if not kusodata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, 0, None, None
-        SCRAP_DICT.add(msg.id, [split_arr(kusodata, 10), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn1 = []
-    extractbtn2 = []
-
-    kusoResult = (
-        strings("header_no_query").format(web="Kusonime", cmd="kusonime")
-        if kueri == ""
-        else strings("header_with_query").format(web="Kusonime", kueri=kueri)
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        kusoResult += f"<b>{index*6+c}</b>. {i['title']}\n{i['link']}\n\n"
-        if c < 6:
-            extractbtn1.append(
-                InlineButton(
-                    index * 6 + c, f"kusoextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
-            )
-        else:
-            extractbtn2.append(
-                InlineButton(
-                    index * 6 + c, f"kusoextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
-            )
-    return kusoResult, PageLen, extractbtn1, extractbtn2
 
+class SiteError(Exception):
+    """A site answered with an error status outside of httpx."""
 
-# Movieku GetData
-async def getDataMovieku(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        moviekudata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['movieku']}/?s={kueri}", follow_redirects=True
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>"
-                )
-                return None, 0, None
-        r = BeautifulSoup(data, "lxml")
-        res = r.find_all(class_="bx")
-        for i in res:
-            judul = i.find_all("a")[0]["title"]
-            link = i.find_all("a")[0]["href"]
-            typ = i.find(class_="overlay").text
-            typee = typ.strip() if typ.strip() != "" else "~"
-            moviekudata.append({"judul": judul, "link": link, "type": typee})
-        if not moviekudata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(moviekudata, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
 
-    moviekuResult = (
-        strings("header_no_query").format(web="Movieku", cmd="movieku")
-        if kueri == ""
-        else strings("header_with_query").format(web="Movieku", kueri=kueri)
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        moviekuResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}/Status:</b> {i['type']}\n\n"
-        extractbtn.append(
-            InlineButton(
-                index * 6 + c, f"moviekuextract#{CurrentPage}#{c}#{user}#{msg.id}"
-            )
+async def scrape_site(spec: SiteSpec, kueri):
+    """Fetch and parse the search results of a site, [] when there are none."""
+    url = spec.listing if spec.listing and not kueri else spec.search
+    url = url.format(web=web, kueri=kueri or "")
+    if spec.client == "cloudscraper":
+        try:
+            async with host_health.track(host_of(url), timeout=20) as call:
+                page = await asyncio.to_thread(cloudscraper.create_scraper().get, url)
+                call.ok = page.status_code < 500
+        except CircuitOpen as exc:
+            raise SiteError(exc) from None
+        except asyncio.TimeoutError:
+            raise SiteError(f"no free request slot for {host_of(url)}") from None
+        if page.status_code != 200:
+            raise SiteError(page.status_code)
+    else:
+        page = await fetch.get(url, follow_redirects=True)
+        page.raise_for_status()
+    if spec.item is None:
+        return page.json().get("result") or []
+    return (
+        await parse_html(
+            parse_listing, page.content, spec.item, spec.fields, spec.not_found
         )
-    return moviekuResult, PageLen, extractbtn
-
-
-# NoDrakor GetData
-async def getDataNodrakor(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        nodrakordata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['nodrakor']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(data, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
-            return None, 0, None
-        for i in entry:
-            genre = i.find(class_="gmr-movie-on")
-            genre = f"{genre.text}" if genre else "N/A"
-            judul = i.find(class_="entry-title").find("a").text
-            link = i.find(class_="entry-title").find("a").get("href")
-            nodrakordata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(nodrakordata, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
-    nodrakorResult = (
-        strings("header_no_query").format(web="NoDrakor", cmd="nodrakor")
-        if kueri == ""
-        else strings("header_with_query").format(web="NoDrakor", kueri=kueri)
+        or []
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        nodrakorResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
-        extractbtn.append(
-            InlineButton(
-                index * 6 + c, f"nodrakorextract#{CurrentPage}#{c}#{user}#{msg.id}"
-            )
-        )
-    return nodrakorResult, PageLen, extractbtn
 
 
-# Savefilm21 GetData
-async def getDataSavefilm21(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        sfdata = []
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['savefilm21']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(data, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if "Tidak Ditemukan" in entry[0].text:
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
-            return None, 0, None
-        for i in entry:
-            genre = i.find(class_="gmr-movie-on").text
-            genre = f"{genre}" if genre != "" else "N/A"
-            judul = i.find(class_="entry-title").find("a").text
-            link = i.find(class_="entry-title").find("a").get("href")
-            sfdata.append({"judul": judul, "link": link, "genre": genre})
-        SCRAP_DICT.add(msg.id, [split_arr(sfdata, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
-    sfResult = (
-        strings("header_no_query").format(web="Savefilm21", cmd="savefilm21")
-        if kueri == ""
-        else strings("header_with_query").format(web="Savefilm21", kueri=kueri)
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        sfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> {i['genre']}\n\n"
-        extractbtn.append(
-            InlineButton(
-                index * 6 + c, f"sf21extract#{CurrentPage}#{c}#{user}#{msg.id}"
-            )
-        )
-    return sfResult, PageLen, extractbtn
+async def fetch_results(msg, spec: SiteSpec, kueri, strings):
+    """Search results of a site, None after telling the user why there are none."""
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            results = await scrape_site(spec, kueri)
+        except httpx.HTTPError as exc:
+            await msg.edit_msg(
+                f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
+                disable_web_page_preview=True,
+            )
+            return None
+        except SiteError as exc:
+            await msg.edit_msg(strings("err_getweb").format(err=exc))
+            return None
+    if not results:
+        if not kueri:
+            await msg.edit_msg(strings("no_result"), del_in=5)
+        else:
+            await msg.edit_msg(strings("no_result_w_query").format(kueri=kueri), del_in=5)
+        return None
+    return results
 
 
-# NunaDrama GetData
-async def getDataNunaDrama(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['nunadrama']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
+# Shared GetData of every site in SITES
+@SCRAP_RESULTS.single_flight
+async def getData(msg, spec: SiteSpec, kueri, CurrentPage, user, strings):
+    await ensure_web_config()
+    if not (scraped := await SCRAP_RESULTS.join(msg.id, spec.name, kueri)):
+        if not (results := await fetch_results(msg, spec, kueri, strings)):
             return None, 0, None
-        else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
+        scraped = await SCRAP_RESULTS.publish(
+            msg.id, spec.name, kueri, split_arr(results, spec.per_page)
+        )
     index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
+    PageLen = len(scraped[0])
+    labels = _Labels(strings)
     extractbtn = []
-
-    nunaResult = (
-        strings("header_with_query").format(web="NunaDrama", kueri=kueri)
+    result = (
+        strings("header_with_query").format(web=spec.title, kueri=kueri)
         if kueri
-        else strings("header_no_query").format(web="NunaDrama", cmd="nunadrama")
+        else strings("header_no_query").format(web=spec.title, cmd=spec.commands[0])
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        nunaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
-        if not re.search(r"Series", i["genre"]):
+    if not kueri and (refreshed := await SCRAP_RESULTS.refreshed(spec.name, kueri)):
+        result += strings("last_refreshed").format(
+            ago=get_readable_time(time.time() - refreshed).strip()
+        )
+    for c, i in enumerate(scraped[0][index], start=1):
+        n = index * spec.per_page + c
+        result += (
+            spec.line(n, i, labels)
+            if callable(spec.line)
+            else spec.line.format(n=n, t=labels, **i)
+        )
+        if spec.extract and (spec.extract_if is None or spec.extract_if(i)):
             extractbtn.append(
-                InlineButton(
-                    index * 6 + c, f"nunaextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
+                InlineButton(n, f"{spec.extract}#{CurrentPage}#{c}#{user}#{msg.id}")
             )
-    nunaResult += strings("unsupport_dl_btn")
-    return nunaResult, PageLen, extractbtn
+    if spec.footer:
+        result += strings(spec.footer)
+    return result, PageLen, extractbtn
 
 
-# PusatFilm21 GetData
-async def getDataPusatFilm(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['pusatfilm']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
-            return None, 0, None
-        else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
+def result_keyboard(spec: SiteSpec, strings, PageLen, CurrentPage, msg_id, user, btn, bot_id):
+    keyboard = InlineKeyboard()
+    keyboard.paginate(PageLen, CurrentPage, f"page_{spec.page}#{{number}}#{msg_id}#{user}")
+    if btn:
+        keyboard.row(InlineButton(strings("ex_data"), user_id=bot_id))
+        for i in range(0, len(btn), 6):
+            keyboard.row(*btn[i : i + 6])
+    keyboard.row(InlineButton(strings("cl_btn"), f"close#{user}"))
+    return keyboard
 
-    pfResult = (
-        strings("header_with_query").format(web="PusatFilm21", kueri=kueri)
-        if kueri
-        else strings("header_no_query").format(web="PusatFilm21", cmd="pusatfilm")
+
+# Search CMD of every site in SITES
+async def site_search(self, message, strings, spec: SiteSpec):
+    kueri = " ".join(message.command[1:])
+    pesan = await message.reply_msg(strings("get_data"), quote=True)
+    CurrentPage = 1
+    res, PageLen, btn = await getData(
+        pesan, spec, kueri, CurrentPage, message.from_user.id, strings
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        pfResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
-        if not re.search(r"Series", i["genre"]):
-            extractbtn.append(
-                InlineButton(
-                    index * 6 + c, f"pfextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
-            )
-    pfResult += strings("unsupport_dl_btn")
-    return pfResult, PageLen, extractbtn
+    if not res:
+        return
+    keyboard = result_keyboard(
+        spec, strings, PageLen, CurrentPage, pesan.id, message.from_user.id, btn, self.me.id
+    )
+    await pesan.edit_msg(res, disable_web_page_preview=True, reply_markup=keyboard)
 
 
-# DutaMovie GetData
-async def getDataDutaMovie(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                nunafetch = await fetch.get(
-                    f"{web['dutamovie']}/?s={kueri}", follow_redirects=True
-                )
-                nunafetch.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(nunafetch, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
-            return None, 0, None
-        else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
+# Page Callback of every site in SITES
+async def site_page(self, callback_query, strings, spec: SiteSpec):
+    try:
+        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
+            return await callback_query.answer(strings("unauth"), True)
+        message_id = int(callback_query.data.split("#")[2])
+        CurrentPage = int(callback_query.data.split("#")[1])
+        kueri = (await SCRAP_RESULTS.getitem(message_id))[1]
+    except (IndexError, ValueError):
+        return
+    except KeyError:
+        return await callback_query.message.edit_msg(strings("invalid_cb"))
+    except QueryIdInvalid:
+        return
 
-    dutaResult = (
-        strings("header_with_query").format(web="DutaMovie", kueri=kueri)
-        if kueri
-        else strings("header_no_query").format(web="DutaMovie", cmd="dutamovie")
+    res, PageLen, btn = await getData(
+        callback_query.message,
+        spec,
+        kueri,
+        CurrentPage,
+        callback_query.from_user.id,
+        strings,
+    )
+    if not res:
+        return
+    keyboard = result_keyboard(
+        spec,
+        strings,
+        PageLen,
+        CurrentPage,
+        message_id,
+        callback_query.from_user.id,
+        btn,
+        self.me.id,
+    )
+    await callback_query.message.edit_msg(
+        res, disable_web_page_preview=True, reply_markup=keyboard
     )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        dutaResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
-        if not re.search(r"Series", i["genre"]):
-            extractbtn.append(
-                InlineButton(
-                    index * 6 + c, f"dutaextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
-            )
-    dutaResult += strings("unsupport_dl_btn")
-    return dutaResult, PageLen, extractbtn
-
 
-# Lendrive GetData
-async def getDataLendrive(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                if kueri:
-                    data = await fetch.get(
-                        f"{web['lendrive']}/?s={kueri}",
-                        follow_redirects=True,
-                    )
-                else:
-                    data = await fetch.get(web["lendrive"], follow_redirects=True)
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        res = BeautifulSoup(data, "lxml")
-        lenddata = []
-        for o in res.find_all(class_="bsx"):
-            title = o.find("a")["title"]
-            link = o.find("a")["href"]
-            status = (
-                o.find(class_="epx").text
-                if o.find(class_="epx")
-                else "Not Provided by BOT"
-            )
-            kualitas = (
-                o.find(class_="typez TV").text
-                if o.find(class_="typez TV")
-                else o.find(class_="typez BD")
-            )
-            lenddata.append(
-                {
-                    "judul": title,
-                    "link": link,
-                    "quality": kualitas or "N/A",
-                    "status": status,
-                }
-            )
-        if not lenddata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, 0, None
-        savedict[msg.id] = [split_arr(lenddata, 6), kueri]
-    index = int(CurrentPage - 1)
-    PageLen = len(savedict[msg.id][0])
-    extractbtn = []
 
-    lenddataResult = (
-        strings("header_no_query").format(web="Lendrive", cmd="lendrive")
-        if kueri == ""
-        else strings("header_with_query").format(web="Lendrive", kueri=kueri)
-    )
-    for c, i in enumerate(savedict[msg.id][0][index], start=1):
-        lenddataResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}:</b> {i['quality']}\n<b>Status:</b> {i['status']}\n\n"
-        extractbtn.append(
-            InlineButton(
-                index * 6 + c, f"lendriveextract#{CurrentPage}#{c}#{user}#{msg.id}"
-            )
-        )
-    return lenddataResult, PageLen, extractbtn
+def register_site(spec: SiteSpec):
+    async def search(self, message, strings):
+        return await site_search(self, message, strings, spec)
 
+    async def page(self, callback_query, strings):
+        return await site_page(self, callback_query, strings, spec)
 
-# MelongMovie GetData
-async def getDataMelong(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                data = await fetch.get(
-                    f"{web['melongmovie']}/?s={kueri}",
-                    follow_redirects=True,
-                )
-                data.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        bs4 = BeautifulSoup(data, "lxml")
-        melongdata = []
-        for res in bs4.select(".box"):
-            dd = res.select("a")
-            url = dd[0]["href"]
-            title = dd[0]["title"]
-            try:
-                quality = dd[0].find(class_="quality").text
-            except:
-                quality = "N/A"
-            melongdata.append({"judul": title, "link": url, "quality": quality})
-        if not melongdata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, 0, None
-        SCRAP_DICT.add(msg.id, [split_arr(melongdata, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
+    # Metrics label handlers by function name
+    search.__name__ = search.__qualname__ = f"{spec.name}_search"
+    page.__name__ = page.__qualname__ = f"{spec.name}_page"
+    app.on_cmd(list(spec.commands), no_channel=True)(use_chat_lang()(search))
+    app.on_cb(f"page_{spec.page}#")(use_chat_lang()(page))
 
-    melongResult = (
-        strings("header_no_query").format(web="Melongmovie", cmd="melongmovie")
-        if kueri == ""
-        else strings("header_with_query").format(web="Melongmovie", kueri=kueri)
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        melongResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>{strings('quality')}:</b> {i['quality']}\n\n"
-        extractbtn.append(
-            InlineButton(
-                index * 6 + c, f"melongextract#{CurrentPage}#{c}#{user}#{msg.id}"
-            )
-        )
-    return melongResult, PageLen, extractbtn
 
+for _spec in SITES.values():
+    register_site(_spec)
 
-# GoMov GetData
-async def getDataGomov(msg, kueri, CurrentPage, user, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        with contextlib.redirect_stdout(sys.stderr):
-            try:
-                gomovv = await fetch.get(
-                    f"{web['gomov']}/?s={kueri}", follow_redirects=True
-                )
-                gomovv.raise_for_status()
-            except httpx.HTTPError as exc:
-                await msg.edit_msg(
-                    f"ERROR: Failed to fetch data from {exc.request.url} - <code>{exc}</code>",
-                    disable_web_page_preview=True,
-                )
-                return None, 0, None
-        text = BeautifulSoup(gomovv, "lxml")
-        entry = text.find_all(class_="entry-header")
-        if entry[0].text.strip() == "Nothing Found":
-            if not kueri:
-                await msg.edit_msg(strings("no_result"), del_in=5)
-            else:
-                await msg.edit_msg(
-                    strings("no_result_w_query").format(kueri=kueri), del_in=5
-                )
-            return None, 0, None
-        else:
-            data = []
-            for i in entry:
-                genre = i.find(class_="gmr-movie-on")
-                genre = f"{genre.text}" if genre else "N/A"
-                judul = i.find(class_="entry-title").find("a").text
-                link = i.find(class_="entry-title").find("a").get("href")
-                data.append({"judul": judul, "link": link, "genre": genre})
-            SCRAP_DICT.add(msg.id, [split_arr(data, 6), kueri], timeout=1800)
-    index = int(CurrentPage - 1)
-    PageLen = len(SCRAP_DICT[msg.id][0])
-    extractbtn = []
 
-    gomovResult = (
-        strings("header_with_query").format(web="GoMov", kueri=kueri)
-        if kueri
-        else strings("header_no_query").format(web="GoMov", cmd="gomov")
-    )
-    for c, i in enumerate(SCRAP_DICT[msg.id][0][index], start=1):
-        gomovResult += f"<b>{index*6+c}. <a href='{i['link']}'>{i['judul']}</a></b>\n<b>Genre:</b> <code>{i['genre']}</code>\n\n"
-        if not re.search(r"Series", i["genre"]):
-            extractbtn.append(
-                InlineButton(
-                    index * 6 + c, f"gomovextract#{CurrentPage}#{c}#{user}#{msg.id}"
-                )
-            )
-    gomovResult += strings("unsupport_dl_btn")
-    return gomovResult, PageLen, extractbtn
+async def prefetch_listing(name: str):
+    """Refresh the latest uploads of a site for its command without a query."""
+    spec = SITES[name]
+    await ensure_web_config()
+    try:
+        results = await scrape_site(spec, None)
+    except Exception as exc:
+        LOGGER.info("Prefetching %s failed: %r", name, exc)
+        return
+    if results:
+        await SCRAP_RESULTS.share(spec.name, None, split_arr(results, spec.per_page))
 
 
-# getData samehada
-async def getSame(msg, query, current_page, strings):
-    await ensure_web_config()
-    if not SCRAP_DICT.get(msg.id):
-        cfse = cloudscraper.create_scraper()
-        if query:
-            data = cfse.get(f"{web['samehadaku']}/?s={query}")
-        else:
-            data = cfse.get(web["samehadaku"])
-        if data.status_code != 200:
-            await msg.edit_msg(strings("err_getweb").format(err=data.status_code))
-            return None, None
-        res = BeautifulSoup(data.text, "lxml").find_all(class_="animposx")
-        sdata = []
-        for i in res:
-            url = i.find("a")["href"]
-            title = i.find("a")["title"]
-            sta = (
-                i.find(class_="type TV").text if i.find(class_="type TV") else "Ongoing"
-            )
-            rate = i.find(class_="score")
-            sdata.append({"url": url, "title": title, "sta": sta, "rate": rate})
-        if not sdata:
-            await msg.edit_msg(strings("no_result"), del_in=5)
-            return None, None
-        savedict[msg.id] = [split_arr(sdata, 10), query]
-    index = int(current_page - 1)
-    PageLen = len(savedict[msg.id][0])
-    sameresult = "".join(
-        f"<b>{index * 6 + c}. <a href='{i['url']}'>{i['title']}</a>\n<b>Status:</b> {i['sta']}\n</b>Rating:</b> {i['rate']}\n\n"
-        for c, i in enumerate(savedict[msg.id][0][index], start=1)
-    )
-    return sameresult, PageLen
+if PREFETCH_INTERVAL > 0:
+    # First runs are spread over the minute after the bot had 30 s to start
+    _first_run = datetime.now(timezone.utc) + timedelta(seconds=30)
+    _stagger = 60 / len(SITES)
+    for _index, _spec in enumerate(SITES.values()):
+        scheduler.add_job(
+            prefetch_listing,
+            "interval",
+            [_spec.name],
+            id=f"prefetch_{_spec.name}",
+            jobstore="memory",
+            minutes=PREFETCH_INTERVAL,
+            next_run_time=_first_run + timedelta(seconds=_index * _stagger),
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True,
+        )
 
 
-# SameHada CMD
-@app.on_cmd("samehadaku", no_channel=True)
-@use_chat_lang()
-async def same_search(_, msg, strings):
-    query = msg.text.split(maxsplit=1)[1] if len(msg.command) > 1 else None
-    bmsg = await msg.reply_msg(strings("get_data"), quote=True)
-    sameres, PageLen = await getSame(bmsg, query, 1, strings)
-    if not sameres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen, 1, "page_same#{number}" + f"#{bmsg.id}#{msg.from_user.id}"
+# Meta search, one query over every site in SITES
+META_SITE_TIMEOUT = 15
+META_INLINE_TIMEOUT = 7
+# Answer once this many sites found something, the rest go on in background
+META_FASTEST = 6
+# Seconds between progress edits of the result message
+META_EDIT_INTERVAL = 2
+META_LIMIT = 20
+_meta_tasks = set()
+
+
+async def search_site(spec: SiteSpec, kueri):
+    """All search results of a site, shared with the site's own command."""
+    if (pages := await SCRAP_RESULTS.peek(spec.name, kueri)) is not None:
+        return [item for page in pages for item in page]
+    results = await scrape_site(spec, kueri)
+    if results:
+        await SCRAP_RESULTS.share(spec.name, kueri, split_arr(results, spec.per_page))
+    return results
+
+
+async def _search_within(spec: SiteSpec, kueri, timeout):
+    try:
+        return spec, await asyncio.wait_for(search_site(spec, kueri), timeout)
+    except Exception as exc:
+        LOGGER.debug("Meta search on %s failed: %r", spec.name, exc)
+        return spec, None
+
+
+async def meta_search(
+    kueri, on_update=None, fastest=META_FASTEST, timeout=META_SITE_TIMEOUT
+):
+    """Search every site at once and merge the results as they come in.
+
+    ``on_update(merged)`` is awaited after each site answers. Returns once
+    `fastest` sites found something or every site answered; the searches
+    still running keep filling the shared results for later searches.
+    """
+    await ensure_web_config()
+    merged = MetaResults(len(SITES))
+    tasks = [
+        asyncio.create_task(_search_within(spec, kueri, timeout))
+        for spec in SITES.values()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            spec, results = await next_done
+            merged.add(spec.title, results)
+            if on_update:
+                await on_update(merged)
+            if merged.hits >= fastest:
+                break
+    finally:
+        for task in tasks:
+            if not task.done():
+                _meta_tasks.add(task)
+                task.add_done_callback(_meta_tasks.discard)
+    return merged
+
+
+def render_meta(merged: MetaResults, kueri, strings, final=False):
+    result = strings("header_with_query").format(web="MetaSearch", kueri=kueri)
+    footer = (
+        strings("meta_footer").format(
+            found=len(merged.entries),
+            sites=len(merged.answered),
+            failed=len(merged.failed),
+            total=merged.total,
+        )
+        if final
+        else strings("meta_progress").format(done=merged.done, total=merged.total)
     )
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{msg.from_user.id}"))
-    await bmsg.edit_msg(sameres, disable_web_page_preview=True, reply_markup=keyboard)
+    for n, entry in enumerate(merged.top(META_LIMIT), start=1):
+        links = " | ".join(
+            f"<a href='{link}'>{site}</a>" for site, link in entry["links"].items()
+        )
+        line = f"<b>{n}. {entry['title']}</b>\n{links}\n\n"
+        # Stay under Telegram's 4096 characters per message
+        if len(result) + len(line) + len(footer) > 3800:
+            break
+        result += line
+    return result + footer
 
 
-# Terbit21 CMD
-@app.on_cmd("terbit21", no_channel=True)
+@app.on_cmd(["metasearch", "msearch"], no_channel=True)
 @use_chat_lang()
-async def terbit21_s(_, message, strings):
+async def meta_search_cmd(_, message, strings):
+    if len(message.command) < 2:
+        return await message.reply_msg(strings("meta_usage"), del_in=6)
     kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = None
     pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    terbitres, PageLen = await getDataTerbit21(pesan, kueri, CurrentPage, strings)
-    if not terbitres:
-        return
+    last_edit = 0
+
+    async def progress(merged):
+        nonlocal last_edit
+        now = asyncio.get_running_loop().time()
+        if not merged.entries or now - last_edit < META_EDIT_INTERVAL:
+            return
+        last_edit = now
+        await pesan.edit_msg(
+            render_meta(merged, kueri, strings), disable_web_page_preview=True
+        )
+
+    merged = await meta_search(kueri, progress)
+    if not merged.entries:
+        return await pesan.edit_msg(
+            strings("no_result_w_query").format(kueri=kueri), del_in=5
+        )
     keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_terbit21#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
     keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
     await pesan.edit_msg(
-        terbitres, disable_web_page_preview=True, reply_markup=keyboard
+        render_meta(merged, kueri, strings, final=True),
+        disable_web_page_preview=True,
+        reply_markup=keyboard,
     )
 
 
-# LK21 CMD
-@app.on_cmd("lk21", no_channel=True)
-@use_chat_lang()
-async def lk21_s(_, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = None
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    lkres, PageLen = await getDatalk21(pesan, kueri, CurrentPage, strings)
-    if not lkres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_lk21#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(lkres, disable_web_page_preview=True, reply_markup=keyboard)
+### Scrape DDL Link From Web ###
+async def send_extract(callback_query, strings, keyboard, name: str, link: str, extract):
+    """Edit the result message with what `extract` pulled out of the detail page."""
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            kl = await SCRAP_DETAILS.get(name, link, extract)
+            await callback_query.message.edit_msg(
+                strings("res_scrape").format(link=link, kl=kl), reply_markup=keyboard
+            )
+        except httpx.HTTPError as exc:
+            await callback_query.message.edit_msg(
+                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
+                reply_markup=keyboard,
+            )
+        except Exception as err:
+            await callback_query.message.edit_msg(
+                f"ERROR: {err}", reply_markup=keyboard
+            )
 
 
-# Pahe CMD
-@app.on_cmd("pahe", no_channel=True)
-@use_chat_lang()
-async def pahe_s(_, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    paheres, PageLen = await getDataPahe(pesan, kueri, CurrentPage, strings)
-    if not paheres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_pahe#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(paheres, disable_web_page_preview=True, reply_markup=keyboard)
+async def extract_page(link: str, parser, *args):
+    """Fetch a detail page and run ``parser(html, *args)`` on it in the parse pool."""
+    html = await fetch.get(link)
+    html.raise_for_status()
+    return await parse_html(parser, html.content, *args)
 
 
-# Gomov CMD
-@app.on_cmd(["gomov", "klikxxi"], no_channel=True)
-@use_chat_lang()
-async def gomov_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    gomovres, PageLen, btn = await getDataGomov(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not gomovres:
-        return
+async def extract_target(callback_query, strings, spec: SiteSpec):
+    """``(link, back/close keyboard)`` of the result an extract button points at.
+
+    None after answering the press when it is someone else's button or the
+    results behind it expired.
+    """
+    try:
+        data = callback_query.data.split("#")
+        if callback_query.from_user.id != int(data[3]):
+            await callback_query.answer(strings("unauth"), True)
+            return None
+        CurrentPage, idlink, message_id = int(data[1]), int(data[2]), int(data[4])
+        link = (await SCRAP_RESULTS.getitem(message_id))[0][CurrentPage - 1][idlink - 1].get("link")
+    except QueryIdInvalid:
+        return None
+    except (IndexError, KeyError, ValueError):
+        await callback_query.message.edit_msg(strings("invalid_cb"))
+        return None
     keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_gomov#{number}" + f"#{pesan.id}#{message.from_user.id}",
+    keyboard.row(
+        InlineButton(
+            strings("back_btn"),
+            f"page_{spec.page}#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
+        ),
+        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
     )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(gomovres, disable_web_page_preview=True, reply_markup=keyboard)
+    return link, keyboard
 
 
-# MelongMovie CMD
-@app.on_cmd("melongmovie", no_channel=True)
+# Kusonime DDL
+@app.on_cb("kusoextract#")
 @use_chat_lang()
-async def melong_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    melongres, PageLen, btn = await getDataMelong(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not melongres:
+async def kusonime_scrap(client, callback_query, strings):
+    if not (target := await extract_target(callback_query, strings, SITES["kuso"])):
         return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_melong#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
+    link, keyboard = target
+    kuso = Kusonime()
     try:
-        await pesan.edit_msg(
-            melongres, disable_web_page_preview=True, reply_markup=keyboard
-        )
-    except Exception as err:
-        await pesan.edit_msg(
-            f"<b>ERROR:</b> {err}", disable_web_page_preview=True, reply_markup=keyboard
+        tgh = await SCRAP_DETAILS.get(
+            "kuso", link, lambda url: kuso.telegraph(url, client.me.username)
         )
+        return await callback_query.message.edit_msg(tgh, reply_markup=keyboard)
+    except Exception as e:
+        LOGGER.error(f"clases: {e.__class__}, moduleName: {e.__class__.__name__}")
+        if str(e).startswith("ERROR"):
+            return await callback_query.message.edit_msg(e, reply_markup=keyboard)
 
 
-# NunaDrama CMD
-@app.on_cmd("nunadrama", no_channel=True)
-@use_chat_lang()
-async def nunadrama_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    nunares, PageLen, btn = await getDataNunaDrama(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not nunares:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nuna#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(
-        nunares, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# PusatFilm21 CMD
-@app.on_cmd("pusatfilm", no_channel=True)
-@use_chat_lang()
-async def pusatfilm_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    pfres, PageLen, btn = await getDataPusatFilm(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not pfres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_pf#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(
-        pfres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# DutaMovie CMD
-@app.on_cmd("dutamovie", no_channel=True)
-@use_chat_lang()
-async def dutamovie_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    dutares, PageLen, btn = await getDataDutaMovie(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not dutares:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nuna#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(
-        dutares, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Savefilm21 CMD
-@app.on_cmd("savefilm21", no_channel=True)
-@use_chat_lang()
-async def savefilm_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    savefilmres, PageLen, btn = await getDataSavefilm21(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not savefilmres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_sf21#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(
-        savefilmres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# NoDrakor CMD
-@app.on_cmd("nodrakor", no_channel=True)
-@use_chat_lang()
-async def nodrakor_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    nodrakorres, PageLen, btn = await getDataNodrakor(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not nodrakorres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nodrakor#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(
-        nodrakorres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Kusonime CMD
-@app.on_cmd("kusonime", no_channel=True)
-@use_chat_lang()
-async def kusonime_s(self, message, strings):
-    kueri = " ".join(message.command[1:])
-    if not kueri:
-        kueri = ""
-    pesan = await message.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    kusores, PageLen, btn1, btn2 = await getDataKuso(
-        pesan, kueri, CurrentPage, message.from_user.id, strings
-    )
-    if not kusores:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_kuso#{number}" + f"#{pesan.id}#{message.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn1)
-    if btn2:
-        keyboard.row(*btn2)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{message.from_user.id}"))
-    await pesan.edit_msg(kusores, disable_web_page_preview=True, reply_markup=keyboard)
-
-
-# Lendrive CMD
-@app.on_cmd("lendrive", no_channel=True)
-@use_chat_lang()
-async def lendrive_s(self, ctx: Message, strings):
-    kueri = ctx.input
-    if not kueri:
-        kueri = ""
-    pesan = await ctx.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    lendres, PageLen, btn = await getDataLendrive(
-        pesan, kueri, CurrentPage, ctx.from_user.id, strings
-    )
-    if not lendres:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_lendrive#{number}" + f"#{pesan.id}#{ctx.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{ctx.from_user.id}"))
-    await pesan.edit_msg(lendres, disable_web_page_preview=True, reply_markup=keyboard)
-
-
-# Movieku CMD
-@app.on_cmd("movieku", no_channel=True)
-@use_chat_lang()
-async def movieku_s(self, ctx: Message, strings):
-    kueri = ctx.input
-    if not kueri:
-        kueri = ""
-    pesan = await ctx.reply_msg(strings("get_data"), quote=True)
-    CurrentPage = 1
-    moviekures, PageLen, btn = await getDataMovieku(pesan, kueri, CurrentPage, ctx.from_user.id, strings)
-    if not moviekures:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_movieku#{number}" + f"#{pesan.id}#{ctx.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{ctx.from_user.id}"))
-    await pesan.edit_msg(
-        moviekures, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Savefillm21 Page Callback
-@app.on_cb("page_sf21#")
-@use_chat_lang()
-async def sf21page_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):  # Gatau napa err ini
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        savefilmres, PageLen, btn = await getDataSavefilm21(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_sf21#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        savefilmres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# NunaDrama Page Callback
-@app.on_cb("page_nuna#")
-@use_chat_lang()
-async def sf21page_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):  # Gatau napa err ini
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        nunares, PageLen, btn = await getDataNunaDrama(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nuna#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        nunares, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# DutaMovie Page Callback
-@app.on_cb("page_duta#")
-@use_chat_lang()
-async def sf21page_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        dutares, PageLen, btn = await getDataDutaMovie(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_duta#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        dutares, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-# NunaDrama Page Callback
-@app.on_cb("page_nuna#")
-@use_chat_lang()
-async def sf21page_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):  # Gatau napa err ini
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        nunares, PageLen, btn = await getDataNunaDrama(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nuna#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        nunares, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# PusatFilm Page Callback
-@app.on_cb("page_pf#")
-@use_chat_lang()
-async def pfpage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        pfres, PageLen, btn = await getDataDutaMovie(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_pf#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        pfres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# NoDrakor Page Callback
-@app.on_cb("page_nodrakor#")
-@use_chat_lang()
-async def nodrakorpage_cb(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except (IndexError, ValueError):
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-    except QueryIdInvalid:
-        return
-
-    try:
-        nodrakorres, PageLen, btn = await getDataNodrakor(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_nodrakor#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        nodrakorres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Kuso Page Callback
-@app.on_cb("page_kuso#")
-@use_chat_lang()
-async def kusopage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        kusores, PageLen, btn1, btn2 = await getDataKuso(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_kuso#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn1)
-    if btn2:
-        keyboard.row(*btn2)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        kusores, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Lendrive Page Callback
-@app.on_cb("page_lendrive#")
-@use_chat_lang()
-async def lendrivepage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = savedict[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        lendres, PageLen, btn = await getDataLendrive(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_lendrive#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        lendres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Movieku Page Callback
-@app.on_cb("page_movieku#")
-@use_chat_lang()
-async def moviekupage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"), True)
-
-    try:
-        moviekures, PageLen, btn = await getDataMovieku(
-            callback_query.message, kueri, CurrentPage, callback_query.from_user.id, strings
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_movieku#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        moviekures, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Samehada Page Callback
-@app.on_cb("page_same#")
-@use_chat_lang()
-async def samepg(_, query, strings):
-    try:
-        _, current_page, _id, user_id = query.data.split("#")
-        if int(user_id) != query.from_user.id:
-            return await query.answer(strings("unauth"), True)
-        lquery = savedict[int(_id)][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await query.message.edit_msg(strings("invalid_cb"))
-    try:
-        sameres, PageLen = await getSame(
-            query.message, lquery, int(current_page), strings
-        )
-    except TypeError:
-        return
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        int(current_page),
-        "page_same#{number}" + f"#{_id}#{query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("cl_btn"), f"close#{query.from_user.id}"))
-    await query.message.edit_msg(
-        sameres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Terbit21 Page Callback
-@app.on_cb("page_terbit21#")
-@use_chat_lang()
-async def terbit21page_callback(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        terbitres, PageLen = await getDataTerbit21(
-            callback_query.message, kueri, CurrentPage, strings
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_terbit21#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        terbitres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Page Callback Melong
-@app.on_cb("page_melong#")
-@use_chat_lang()
-async def melongpage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        terbitres, PageLen, btn = await getDataMelong(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_melong#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        terbitres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Lk21 Page Callback
-@app.on_cb("page_lk21#")
-@use_chat_lang()
-async def lk21page_callback(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        lkres, PageLen = await getDatalk21(
-            callback_query.message, kueri, CurrentPage, strings
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_lk21#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        lkres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Pahe Page Callback
-@app.on_cb("page_pahe#")
-@use_chat_lang()
-async def pahepage_callback(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        lkres, PageLen = await getDataPahe(
-            callback_query.message, kueri, CurrentPage, strings
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_pahe#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        lkres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-# Gomov Page Callback
-@app.on_cb("page_gomov#")
-@use_chat_lang()
-async def gomovpage_callback(self, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        message_id = int(callback_query.data.split("#")[2])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        kueri = SCRAP_DICT[message_id][1]
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    try:
-        gomovres, PageLen, btn = await getDataGomov(
-            callback_query.message,
-            kueri,
-            CurrentPage,
-            callback_query.from_user.id,
-            strings,
-        )
-    except TypeError:
-        return
-
-    keyboard = InlineKeyboard()
-    keyboard.paginate(
-        PageLen,
-        CurrentPage,
-        "page_gomov#{number}" + f"#{message_id}#{callback_query.from_user.id}",
-    )
-    keyboard.row(InlineButton(strings("ex_data"), user_id=self.me.id))
-    keyboard.row(*btn)
-    keyboard.row(
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}")
-    )
-    await callback_query.message.edit_msg(
-        gomovres, disable_web_page_preview=True, reply_markup=keyboard
-    )
-
-
-### Scrape DDL Link From Web ###
-# Kusonime DDL
-@app.on_cb("kusoextract#")
-@use_chat_lang()
-async def kusonime_scrap(client, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    kuso = Kusonime()
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_kuso#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    try:
-        if init_url := data_kuso.get(link, False):
-            await callback_query.message.edit_msg(
-                init_url.get("ph_url"), reply_markup=keyboard
-            )
-        tgh = await kuso.telegraph(link, client.me.username)
-        data_kuso[link] = {"ph_url": tgh}
-        return await callback_query.message.edit_msg(tgh, reply_markup=keyboard)
-    except Exception as e:
-        LOGGER.error(f"clases: {e.__class__}, moduleName: {e.__class__.__name__}")
-        if str(e).startswith("ERROR"):
-            return await callback_query.message.edit_msg(e, reply_markup=keyboard)
-
-
-# Savefilm21 DDL
-@app.on_cb("sf21extract#")
-@use_chat_lang()
-async def savefilm21_scrap(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_sf21#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            res = soup.find_all(class_="button button-shadow")
-            res = "".join(f"{i.text}\n{i['href']}\n\n" for i in res)
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=res), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+# Savefilm21 DDL
+async def savefilm21_links(link: str) -> str:
+    return await extract_page(link, parse_savefilm21)
 
 
 # NunaDrama DDL
-@app.on_cb("nunaextract#")
-@use_chat_lang()
-async def nunadrama_ddl(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_sf21#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            download_section = soup.find("div", class_="dzdesu")
-            title = download_section.find("h2").text.strip()
-            links = download_section.find_all("a", href=True)
-            download_links = {link.text.strip(): link['href'] for link in links}
-            res = f"<b>Judul</b>: {title}\n\n<b>Link Download:</b>\n"
-            for label, link in download_links.items():
-                res += f"{label}: <a href='{link}'>{link}</a>\n"
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=res), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+async def nunadrama_links(link: str) -> str:
+    return await extract_page(link, parse_nunadrama)
 
 
 # PusatFilm21 DDL
-@app.on_cb("pfextract#")
-@use_chat_lang()
-async def pusatfilm_ddl(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_pf#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            ddl = soup.find("li", {"pull-right"}).find("a").get("href")
-            res = f"<b>Link Download:</b> {ddl}"
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=res), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+async def pusatfilm_links(link: str) -> str:
+    return await extract_page(link, parse_pusatfilm)
 
 
 # DutaMovie DDL
-@app.on_cb("dutaextract#")
-@use_chat_lang()
-async def dutamovie_ddl(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_duta#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            download_section = soup.find("div", id="gmr-id-download")
-            title = download_section.find("h3", class_="title-download").text.strip()
-            links = download_section.find_all("a", href=True)
-            download_links = {link['title']: link['href'] for link in links}
-            res = f"<b>Judul</b>: {title}\n\n<b>Link Download:</b>\n"
-            for label, link in download_links.items():
-                res += f"{label}: {link}\n\n"
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=res), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+async def dutamovie_links(link: str) -> str:
+    return await extract_page(link, parse_dutamovie)
 
 
 # NoDrakor DDL
-@app.on_cb("nodrakorextract#")
-@use_chat_lang()
-async def nodrakorddl_scrap(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
-
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_nodrakor#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            if "/tv/" in link:
-                result = soup.find(
-                    "div", {"entry-content entry-content-single"}
-                ).find_all("p")
-                msg = "".join(str(f"{i}\n") for i in result)
-                link = await post_to_telegraph(False, "MissKaty NoDrakor", msg)
-                return await callback_query.message.edit_msg(
-                    strings("res_scrape").format(link=link, kl=link),
-                    reply_markup=keyboard,
-                )
-            res = soup.find_all(class_="button button-shadow")
-            res = "".join(f"{i.text}\n{i['href']}\n\n" for i in res)
-            if len(res) > 3500:
-                link = await post_to_telegraph(False, "MissKaty NoDrakor", res)
-                return await callback_query.message.edit_msg(
-                    strings("res_scrape").format(link=link, kl=link),
-                    reply_markup=keyboard,
-                )
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=res), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+async def nodrakor_links(link: str) -> str:
+    series = "/tv/" in link
+    res = await extract_page(link, parse_nodrakor, series)
+    if series or len(res) > 3500:
+        return await post_to_telegraph(False, "MissKaty NoDrakor", res)
+    return res
+
+
+# Scrape DDL Link Movieku
+async def movieku_text(link: str, sections) -> str:
+    """Render what parse_movieku found, on Telegraph when it has too many links."""
+    output = []
+    for title, resolutions in sections.items():
+        output.append(title)
+        output.extend(resolutions)
+        output.append("")
+    if sum(len(resolutions) for resolutions in sections.values()) > 70:
+        url = await post_to_telegraph(False, link, "<br>".join(output))
+        return f"Your result is too long, i have pasted your result on Telegraph:\n{url}"
+    return "\n".join(output)
+
+
+async def movieku_links(link: str) -> str:
+    res = await movieku_text(link, await extract_page(link, parse_movieku))
+    if res == "":
+        return "\nOpen link in browser, click on episode page and use /movieku_scrap [page link] commands for extract download link"
+    return res
 
 
 # Scrape DDL Link Melongmovie
-@app.on_cb("moviekuextract#")
-@use_chat_lang()
-async def movieku_scrap(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
+async def melong_links(link: str) -> str:
+    return await extract_page(link, parse_melong)
 
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_movieku#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            data = {}
-            output = []
-            total_links = 0
-            valid_resolutions = {'1080p', '720p', '480p', '360p'}
-            current_title = None
-
-            for element in soup.find_all(['h3', 'p']):
-                if element.name == 'h3' and 'smokettl' in element.get('class', []):
-                    current_title = element.text.strip()
-                    if current_title not in data:
-                        data[current_title] = []
-                elif element.name == 'p' and current_title:
-                    strong_tag = element.find('strong')
-                    if strong_tag:
-                        resolution = strong_tag.text.strip()
-                        if resolution in valid_resolutions:
-                            total_links += 1
-                            links = ', '.join([f'<a href="{a["href"]}">{a.text.strip()}</a>' for a in element.find_all('a')])
-                            data[current_title].append(f"{resolution} {links}")
-
-            for title, resolutions in data.items():
-                output.append(title)
-                output.extend(resolutions)
-                output.append('')
-            if total_links > 70:
-                url = await post_to_telegraph(False, link, "<br>".join(output))
-                return await callback_query.message.edit_msg(strings("res_scrape").format(link=link, kl=f"Your result is too long, i have pasted your result on Telegraph:\n{url}"), reply_markup=keyboard)
-            if "\n".join(output) == "":
-                output = "\nOpen link in browser, click on episode page and use /movieku_scrap [page link] commands for extract download link"
-                return await callback_query.message.edit_msg(strings("res_scrape").format(link=link, kl=output), reply_markup=keyboard)
-            await callback_query.message.edit_msg(strings("res_scrape").format(link=link, kl="\n".join(output)), reply_markup=keyboard)
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
 
+# Scrape DDL Link Gomov
+async def gomov_links(link: str) -> str:
+    return await extract_page(link, parse_gomov)
 
-# Scrape DDL Link Melongmovie
-@app.on_cb("melongextract#")
-@use_chat_lang()
-async def melong_scrap(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
 
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_melong#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            rep = ""
-            for ep in soup.findAll(text=re.compile(r"(?i)episode\s+\d+|LINK DOWNLOAD")):
-                hardsub = ep.findPrevious("div")
-                softsub = ep.findNext("div")
-                rep += f"{hardsub}\n{softsub}"
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=rep), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
+# Lendrive DDL
+async def lendrive_links(link: str) -> str:
+    return await extract_page(link, parse_lendrive)
 
 
-# Scrape DDL Link Gomov
-@app.on_cb("gomovextract#")
-@use_chat_lang()
-async def gomov_dl(_, callback_query, strings):
-    try:
-        if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-            return await callback_query.answer(strings("unauth"), True)
-        idlink = int(callback_query.data.split("#")[2])
-        message_id = int(callback_query.data.split("#")[4])
-        CurrentPage = int(callback_query.data.split("#")[1])
-        link = SCRAP_DICT[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except QueryIdInvalid:
-        return
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
+# Detail page extractor of every site with extract buttons, by site name
+EXTRACTORS = {
+    "savefilm21": savefilm21_links,
+    "nunadrama": nunadrama_links,
+    "pusatfilm": pusatfilm_links,
+    "dutamovie": dutamovie_links,
+    "nodrakor": nodrakor_links,
+    "movieku": movieku_links,
+    "melong": melong_links,
+    "gomov": gomov_links,
+    "lendrive": lendrive_links,
+}
 
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_gomov#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            entry = soup.find(class_="gmr-download-wrap clearfix")
-            hasil = soup.find(class_="title-download").text
-            for i in entry.find(class_="list-inline gmr-download-list clearfix"):
-                title = i.find("a").text
-                ddl = i.find("a")["href"]
-                hasil += f"\n{title}\n{ddl}\n"
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=hasil), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
 
+def register_extract(spec: SiteSpec, extract):
+    async def extract_cb(_, callback_query, strings):
+        if target := await extract_target(callback_query, strings, spec):
+            link, keyboard = target
+            await send_extract(callback_query, strings, keyboard, spec.page, link, extract)
 
-@app.on_cb("lendriveextract#")
-@use_chat_lang()
-async def lendrive_dl(_, callback_query, strings):
-    if callback_query.from_user.id != int(callback_query.data.split("#")[3]):
-        return await callback_query.answer(strings("unauth"), True)
-    idlink = int(callback_query.data.split("#")[2])
-    message_id = int(callback_query.data.split("#")[4])
-    CurrentPage = int(callback_query.data.split("#")[1])
-    try:
-        link = savedict[message_id][0][CurrentPage - 1][idlink - 1].get("link")
-    except KeyError:
-        return await callback_query.message.edit_msg(strings("invalid_cb"))
+    extract_cb.__name__ = extract_cb.__qualname__ = f"{spec.name}_extract"
+    app.on_cb(f"{spec.extract}#")(use_chat_lang()(extract_cb))
+
+
+for _name, _extract in EXTRACTORS.items():
+    register_extract(SITES[_name], _extract)
 
-    keyboard = InlineKeyboard()
-    keyboard.row(
-        InlineButton(
-            strings("back_btn"),
-            f"page_lendrive#{CurrentPage}#{message_id}#{callback_query.from_user.id}",
-        ),
-        InlineButton(strings("cl_btn"), f"close#{callback_query.from_user.id}"),
-    )
-    with contextlib.redirect_stdout(sys.stderr):
-        try:
-            hmm = await fetch.get(link)
-            hmm.raise_for_status()
-            q = BeautifulSoup(hmm.text, "lxml")
-            j = q.findAll("div", class_="soraurlx")
-            kl = ""
-            for i in j:
-                if not i.find("a"):
-                    continue
-                kl += f"{i.find('strong')}:\n"
-                kl += "".join(
-                    f"[ <a href='{a.get('href')}'>{a.text}</a> ]\n"
-                    for a in i.findAll("a")
-                )
-            await callback_query.message.edit_msg(
-                strings("res_scrape").format(link=link, kl=kl), reply_markup=keyboard
-            )
-        except httpx.HTTPError as exc:
-            await callback_query.message.edit_msg(
-                f"HTTP Exception for {exc.request.url} - <code>{exc}</code>",
-                reply_markup=keyboard,
-            )
-        except Exception as err:
-            await callback_query.message.edit_msg(
-                f"ERROR: {err}", reply_markup=keyboard
-            )
 
 # Manual Scrape DDL Movieku.CC incase cannot auto scrape from button
 @app.on_cmd("movieku_scrap")
@@ -2445,40 +852,10 @@ async def muviku_scrap(_, message, strings):
     with contextlib.redirect_stdout(sys.stderr):
         try:
             link = message.text.split(maxsplit=1)[1]
-            html = await fetch.get(link)
-            html.raise_for_status()
-            soup = BeautifulSoup(html.text, "lxml")
-            data = {}
-            output = []
-            total_links = 0
-            valid_resolutions = {'1080p', '720p', '480p', '360p'}
-            current_title = None
-
-            for element in soup.find_all(['h3', 'p']):
-                if element.name == 'h3' and 'smokettl' in element.get('class', []):
-                    current_title = element.text.strip()
-                    if current_title not in data:
-                        data[current_title] = []
-                elif element.name == 'p' and current_title:
-                    strong_tag = element.find('strong')
-                    if strong_tag:
-                        resolution = strong_tag.text.strip()
-                        if resolution in valid_resolutions:
-                            links = ', '.join([f'<a href="{a["href"]}">{a.text.strip()}</a>' for a in element.find_all('a')])
-                            data[current_title].append(f"{resolution} {links}")
-
-            for title, resolutions in data.items():
-                output.append(title)
-                output.extend(resolutions)
-                output.append('')
-                for res in resolutions:
-                    total_links += res.count('<a href=')
-            if not data:
+            sections = await extract_page(link, parse_movieku)
+            if not sections:
                 return await message.reply(strings("no_result"))
-            if total_links > 70:
-                url = await post_to_telegraph(False, link, "<br>".join(output))
-                return await message.reply_msg(f"Your result is too long, i have pasted your result on Telegraph:\n{url}")
-            await message.reply_msg("\n".join(output))
+            await message.reply_msg(await movieku_text(link, sections))
         except IndexError:
             return await message.reply(
                 strings("invalid_cmd_scrape").format(cmd=message.command[0])
@@ -2491,6 +868,3 @@ async def muviku_scrap(_, message, strings):
             await message.reply(f"ERROR: {str(e)}")
 
 
-
-
-
@@ -25,8 +25,8 @@ from pyrogram.types import (
 )
 
 from misskaty import app
-from misskaty.core import pyro_cooldown
 from misskaty.core.decorator import capture_err, new_task
+from misskaty.core.ratelimit import throttle
 from misskaty.helper import fetch, isValidURL, use_chat_lang
 from misskaty.vars import COMMAND_HANDLER, LOG_CHANNEL, SUDO, OWNER_ID
 
@@ -83,11 +83,10 @@ async def ytsearch(_, ctx: Message, strings):
 
 
 @app.on_message(
-    filters.command(["ytdown"], COMMAND_HANDLER)
-    | filters.regex(YT_REGEX)
+    (filters.command(["ytdown"], COMMAND_HANDLER) | filters.regex(YT_REGEX))
     & ~filters.channel
     & ~filters.via_bot
-    & pyro_cooldown.wait(60)
+    & throttle(command="ytdown")
 )
 @capture_err
 @use_chat_lang()
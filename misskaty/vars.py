@@ -49,6 +49,30 @@ else:
 LOG_GROUP_ID = environ.get("LOG_GROUP_ID")
 USER_SESSION = environ.get("USER_SESSION")
 DATABASE_NAME = environ.get("DATABASE_NAME", "MissKatyDB")
+INDEX_DIAGNOSTICS = environ.get("INDEX_DIAGNOSTICS", False)
+# Shared Mongo connection pool
+MONGO_MAX_POOL_SIZE = int(environ.get("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(environ.get("MONGO_MIN_POOL_SIZE", 0))
+MONGO_MAX_IDLE_TIME_MS = int(environ.get("MONGO_MAX_IDLE_TIME_MS", 300000))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 0))
+MONGO_CONNECT_TIMEOUT_MS = int(environ.get("MONGO_CONNECT_TIMEOUT_MS", 20000))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(
+    environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 30000)
+)
+MONGO_COMPRESSORS = environ.get("MONGO_COMPRESSORS", "zlib")
+MONGO_READ_PREFERENCE = environ.get("MONGO_READ_PREFERENCE", "primary")
+# Event loop callbacks running longer than this are reported as stalls
+LOOP_STALL_MS = int(environ.get("LOOP_STALL_MS", 250))
+# Size limit of each SQLite cache file under cache/, least recently used keys are evicted
+CACHE_MAX_BYTES = int(environ.get("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Scraped pages are parsed in this many worker processes, 0 parses in a thread
+PARSE_WORKERS = int(environ.get("PARSE_WORKERS", 2))
+# HTML backend of the page parsers: bs4, lxml or selectolax
+HTML_PARSER = environ.get("HTML_PARSER", "bs4")
+# Concurrent outbound HTTP requests per host through the shared client
+HOST_MAX_CONNECTIONS = int(environ.get("HOST_MAX_CONNECTIONS", 8))
+# Minutes between refreshes of the scraper sites' latest uploads, 0 fetches on demand
+PREFETCH_INTERVAL = int(environ.get("PREFETCH_INTERVAL", 5))
 TZ = environ.get("TZ", "Asia/Jakarta")
 PORT = environ.get("PORT", 80)
 COMMAND_HANDLER = environ.get("COMMAND_HANDLER", "! /").split()
@@ -1,6 +1,5 @@
 import asyncio
 import os
-from datetime import datetime, timedelta
 from logging import getLogger
 from typing import Union
 
@@ -15,7 +14,8 @@ from pyrogram.types import Message
 
 from database.afk_db import is_cleanmode_on
 from database.users_chats_db import db
-from misskaty import app, cleanmode
+from misskaty import app
+from misskaty.core.deletion import deleter
 
 LOGGER = getLogger("MissKaty")
 BANNED = {}
@@ -24,33 +24,8 @@ loop = asyncio.get_event_loop()
 
 
 async def put_cleanmode(chat_id, message_id):
-    if chat_id not in cleanmode:
-        cleanmode[chat_id] = []
-    time_now = datetime.now()
-    put = {
-        "msg_id": message_id,
-        "timer_after": time_now + timedelta(minutes=1),
-    }
-    cleanmode[chat_id].append(put)
-
-
-async def auto_clean():
-    while not await asyncio.sleep(30):
-        try:
-            for chat_id in cleanmode:
-                if not await is_cleanmode_on(chat_id):
-                    continue
-                for x in cleanmode[chat_id]:
-                    if datetime.now() <= x["timer_after"]:
-                        continue
-                    try:
-                        await app.delete_messages(chat_id, x["msg_id"])
-                    except FloodWait as e:
-                        await asyncio.sleep(e.value)
-                    except:
-                        continue
-        except:
-            continue
+    if await is_cleanmode_on(chat_id):
+        await deleter.schedule(app, chat_id, [message_id], 60)
 
 
 # temp db for banned
@@ -4,7 +4,7 @@ from time import time
 from datetime import datetime, timedelta
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from starlette.exceptions import HTTPException
 from psutil import boot_time, disk_usage, net_io_counters
 from contextlib import suppress
@@ -67,7 +67,15 @@ async def autopay(request: Request):
 
 @api.get("/status")
 async def status():
+    from database.afk_db import afk_stats, afk_users
+    from database.chat_config import chat_config_stats
+    from misskaty.core.decorator.permissions import admins_in_chat
+    from misskaty.core.ratelimit import throttle_stats
+    from misskaty.core.watchdog import watchdog
+    from misskaty.helper import Cache
+    from misskaty.helper.http import host_health
     from misskaty.helper.human_read import get_readable_file_size, get_readable_time
+    from misskaty.plugins.web_scraper import SCRAP_DETAILS, SCRAP_RESULTS
     bot_uptime = get_readable_time(time() - botStartTime)
     uptime = get_readable_time(time() - boot_time())
     sent = get_readable_file_size(net_io_counters().bytes_sent)
@@ -86,9 +94,37 @@ async def status():
             "sent": sent,
             "recv": recv,
         },
+        "caches": {
+            "chat_config": chat_config_stats(),
+            "afk": {"resident": len(afk_users), **afk_stats},
+            "admins": {"chats": len(admins_in_chat), **admins_in_chat.stats},
+            "search_results": SCRAP_RESULTS.stats(),
+            "detail_pages": SCRAP_DETAILS.stats(),
+        },
+        "sqlite": await to_thread(Cache.all_stats),
+        "ratelimit": throttle_stats(),
+        "hosts": host_health.stats(),
+        "loop": watchdog.summary(),
     }
 
 
+@api.get("/pool")
+async def pool():
+    from database import pool_stats
+    from misskaty.vars import MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE
+    return {
+        "max_pool_size": MONGO_MAX_POOL_SIZE,
+        "min_pool_size": MONGO_MIN_POOL_SIZE,
+        **pool_stats.snapshot(),
+    }
+
+
+@api.get("/metrics")
+async def metrics():
+    from misskaty.core.metrics import render
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
 @api.api_route("/")
 async def homepage():
     return "Hello World"